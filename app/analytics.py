@@ -0,0 +1,205 @@
+"""
+Análises estatísticas das métricas dos jogadores (percentis, z-scores e histogramas)
+
+As colunas numéricas de `PlayerStats` são carregadas em uma matriz NumPy
+(jogadores x métricas) uma vez por versão dos dados; percentis, z-scores,
+quantis e histogramas de todas as métricas são calculados de forma vetorizada
+sobre a matriz e reaproveitados até o scraper gravar novos dados.
+"""
+
+import asyncio
+import os
+import warnings
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app import models
+from app.data_version import data_version
+
+# Métricas numéricas de PlayerStats incluídas nas análises
+ANALYTICS_METRICS = (
+    "age", "total_kills", "total_deaths", "headshot_percentage", "kd_ratio", "damage_per_round",
+    "grenade_damage_per_round", "maps_played", "rounds_played", "kills_per_round", "assists_per_round",
+    "deaths_per_round", "saved_by_teammate_per_round", "saved_teammates_per_round", "rating",
+)
+
+# Quantidade de faixas dos histogramas de /stats/distributions
+HISTOGRAM_BINS = int(os.getenv("HISTOGRAM_BINS", "20"))
+
+QUANTILES = (10, 25, 50, 75, 90)
+
+
+def _to_number(value) -> Optional[float]:
+    """Converte escalares NumPy para float do Python (NaN vira None)"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+class StatsSnapshot:
+    """
+    Matriz de estatísticas de uma versão dos dados e tudo que é derivado dela.
+
+    Linhas são jogadores e colunas são as métricas de `ANALYTICS_METRICS`;
+    valores ausentes são NaN e ficam fora dos cálculos da métrica.
+    """
+
+    def __init__(self, player_ids, matrix, metrics=ANALYTICS_METRICS, bins: int = HISTOGRAM_BINS, players=None):
+        self.metrics = tuple(metrics)
+        self.player_ids = np.asarray(player_ids, dtype=np.int64)
+        self.matrix = np.asarray(matrix, dtype=np.float64).reshape(len(self.player_ids), len(self.metrics))
+        self._rows = {int(player_id): row for row, player_id in enumerate(self.player_ids)}
+
+        # Atributos dos jogadores (nickname, role, team_id, country), alinhados às linhas da matriz
+        self.players = {name: np.asarray(values, dtype=object) for name, values in (players or {}).items()}
+
+        # Estruturas derivadas da mesma versão dos dados (ex: matriz de similaridade)
+        self.derived = {}
+
+        with warnings.catch_warnings():
+            # Métricas sem nenhum valor geram avisos de "mean of empty slice"; o resultado é NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self.counts = np.sum(~np.isnan(self.matrix), axis=0)
+            self.mean = np.nanmean(self.matrix, axis=0)
+            self.std = np.nanstd(self.matrix, axis=0)
+            if len(self.player_ids):
+                self.minimum = np.nanmin(self.matrix, axis=0)
+                self.maximum = np.nanmax(self.matrix, axis=0)
+                self.quantiles = np.nanpercentile(self.matrix, QUANTILES, axis=0)
+            else:
+                self.minimum = self.maximum = np.full(len(self.metrics), np.nan)
+                self.quantiles = np.full((len(QUANTILES), len(self.metrics)), np.nan)
+
+        self.zscores = np.divide(
+            self.matrix - self.mean, self.std,
+            out=np.full_like(self.matrix, np.nan),
+            where=self.std > 0,
+        )
+        self.percentiles = self._percentile_ranks()
+        self.histograms = self._histograms(bins)
+
+    def _percentile_ranks(self) -> np.ndarray:
+        """
+        Percentil de cada valor: fração dos jogadores com valor menor, contando
+        empates pela metade (0 = pior, 100 = melhor em métricas onde maior é melhor).
+        """
+        percentiles = np.full_like(self.matrix, np.nan)
+        for column in range(len(self.metrics)):
+            values = self.matrix[:, column]
+            valid = ~np.isnan(values)
+            if not valid.any():
+                continue
+            ordered = np.sort(values[valid])
+            below = np.searchsorted(ordered, values[valid], side="left")
+            up_to = np.searchsorted(ordered, values[valid], side="right")
+            percentiles[valid, column] = (below + up_to) / 2 / len(ordered) * 100
+        return percentiles
+
+    def _histograms(self, bins: int) -> list:
+        histograms = []
+        for column in range(len(self.metrics)):
+            values = self.matrix[:, column]
+            values = values[~np.isnan(values)]
+            histograms.append(np.histogram(values, bins=bins) if len(values) else None)
+        return histograms
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def row_of(self, player_id: int) -> Optional[int]:
+        return self._rows.get(player_id)
+
+    def player_percentiles(self, player_id: int) -> Optional[dict]:
+        row = self.row_of(player_id)
+        if row is None:
+            return None
+
+        return {
+            "player_id": player_id,
+            "players_compared": len(self),
+            "metrics": {
+                metric: {
+                    "value": _to_number(self.matrix[row, column]),
+                    "percentile": _to_number(self.percentiles[row, column]),
+                    "z_score": _to_number(self.zscores[row, column]),
+                }
+                for column, metric in enumerate(self.metrics)
+            },
+        }
+
+    def distributions(self, metrics: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        selected = self.metrics if metrics is None else tuple(metrics)
+        result = {}
+        for metric in selected:
+            column = self.metrics.index(metric)
+            histogram = self.histograms[column]
+            result[metric] = {
+                "count": int(self.counts[column]),
+                "mean": _to_number(self.mean[column]),
+                "std": _to_number(self.std[column]),
+                "min": _to_number(self.minimum[column]),
+                "max": _to_number(self.maximum[column]),
+                "quantiles": {
+                    f"p{quantile}": _to_number(self.quantiles[index, column])
+                    for index, quantile in enumerate(QUANTILES)
+                },
+                "histogram": {
+                    "edges": [round(edge, 4) for edge in histogram[1].tolist()],
+                    "counts": histogram[0].tolist(),
+                } if histogram is not None else None,
+            }
+        return result
+
+
+PLAYER_ATTRIBUTES = ("nickname", "role", "team_id", "country")
+
+
+async def load_snapshot(db) -> StatsSnapshot:
+    """Carrega as métricas de todos os jogadores e monta o snapshot fora do event loop"""
+    columns = [getattr(models.PlayerStats, metric) for metric in ANALYTICS_METRICS]
+    rows = (await db.execute(
+        select(
+            models.PlayerStats.player_id,
+            models.Player.nickname,
+            models.Player.role,
+            models.Player.team_id,
+            models.PlayerStats.country,
+            *columns,
+        )
+        .outerjoin(models.Player, models.Player.id == models.PlayerStats.player_id)
+        .order_by(models.PlayerStats.player_id)
+    )).all()
+
+    player_ids = [row[0] for row in rows]
+    offset = 1 + len(PLAYER_ATTRIBUTES)
+    players = {
+        name: [row[index] for row in rows]
+        for index, name in enumerate(PLAYER_ATTRIBUTES, start=1)
+    }
+    # None vira NaN na conversão para float
+    matrix = np.array([row[offset:] for row in rows], dtype=np.float64)
+    return await asyncio.to_thread(StatsSnapshot, player_ids, matrix, players=players)
+
+
+class AnalyticsCache:
+    """Snapshot das estatísticas, recalculado a cada nova versão dos dados"""
+
+    def __init__(self):
+        self._snapshot = None
+        self._version = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db) -> StatsSnapshot:
+        stamp = data_version.peek() or await data_version.get()
+        if stamp is None:
+            return await load_snapshot(db)
+
+        async with self._lock:
+            if self._snapshot is None or stamp.version != self._version:
+                self._snapshot = await load_snapshot(db)
+                self._version = stamp.version
+            return self._snapshot
+
+
+stats_snapshot = AnalyticsCache()
@@ -0,0 +1,121 @@
+"""
+Benchmark de throughput: rotas síncronas (threadpool) x assíncronas (asyncpg)
+
+Monta uma aplicação mínima com a mesma consulta nas duas versões e dispara
+clientes concorrentes contra cada uma, reportando requisições por segundo e
+percentis de latência. A latência de rede do banco pode ser simulada com
+`--db-latency-ms` (usa `pg_sleep`, apenas Postgres). As duas versões usam
+pools do mesmo tamanho (`DB_POOL_SIZE` + `DB_MAX_OVERFLOW`), então a diferença
+medida é do modelo de execução e não da quantidade de conexões.
+
+Uso:
+    python -m app.benchmarks.async_throughput --concurrency 50 200 1000 --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import banco, models
+from app.metrics import percentile
+
+
+def pool_options(url: str) -> dict:
+    """Mesmo pool do engine assíncrono da API (`banco.get_async_engine`); o SQLite usa o pool padrão"""
+    if url.startswith("sqlite"):
+        return {}
+    return {"pool_size": banco.DB_POOL_SIZE, "max_overflow": banco.DB_MAX_OVERFLOW, "pool_pre_ping": True}
+
+
+def build_app(db_latency_ms: float, sync_sessions) -> FastAPI:
+    bench_app = FastAPI()
+    sleep_sql = text("SELECT pg_sleep(:seconds)") if db_latency_ms else None
+    params = {"seconds": db_latency_ms / 1000}
+    query = select(models.Team.id, models.Team.name, models.Team.ranking).order_by(models.Team.ranking).limit(20)
+
+    @bench_app.get("/sync/teams")
+    def sync_teams():
+        with sync_sessions() as db:
+            if sleep_sql is not None:
+                db.execute(sleep_sql, params)
+            return [dict(row._mapping) for row in db.execute(query)]
+
+    @bench_app.get("/async/teams")
+    async def async_teams():
+        async with banco.AsyncSessionLocal() as db:
+            if sleep_sql is not None:
+                await db.execute(sleep_sql, params)
+            return [dict(row._mapping) for row in await db.execute(query)]
+
+    return bench_app
+
+
+async def run_load(bench_app: FastAPI, path: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    transport = httpx.ASGITransport(app=bench_app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "errors": errors,
+    }
+
+
+async def main(concurrency_levels, duration, db_latency_ms):
+    sync_engine = create_engine(banco.DATABASE_URL, **pool_options(banco.DATABASE_URL))
+    bench_app = build_app(db_latency_ms, sessionmaker(bind=sync_engine, autoflush=False))
+
+    if pool_options(banco.DATABASE_URL):
+        print(f"pool por modo: pool_size={banco.DB_POOL_SIZE} max_overflow={banco.DB_MAX_OVERFLOW}")
+    else:
+        print("pool por modo: padrão do SQLite")
+    print(f"{'modo':<6} {'clientes':>8} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'erros':>6}")
+    for concurrency in concurrency_levels:
+        for mode in ("sync", "async"):
+            result = await run_load(bench_app, f"/{mode}/teams", concurrency, duration)
+            print(
+                f"{mode:<6} {concurrency:>8} {result['rps']:>10.1f} {result['p50_ms']:>10.2f} "
+                f"{result['p95_ms']:>10.2f} {result['p99_ms']:>10.2f} {result['errors']:>6}"
+            )
+
+    sync_engine.dispose()
+    if banco.async_engine is not None:
+        await banco.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara throughput das rotas síncronas e assíncronas")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por cenário")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Latência simulada do banco (Postgres)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency, args.duration, args.db_latency_ms))
@@ -0,0 +1,66 @@
+"""
+Benchmark do autocomplete: índice de prefixos em memória com tabelas crescentes
+
+Gera nicknames e nomes sintéticos (sem banco), monta o `PrefixIndex` e mede o
+tempo de construção e os percentis de latência das buscas por prefixo.
+
+Uso:
+    python -m app.benchmarks.autocomplete --sizes 10000 100000 1000000 --queries 2000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from app.metrics import percentile
+from app.search import PrefixIndex, prefix_keys
+
+
+def random_word(rng: random.Random, size: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase + string.digits, k=size))
+
+
+def build_entries(count: int, rng: random.Random) -> tuple:
+    """Entradas dos nicknames e, à parte, das palavras do nome real"""
+    entries, secondary = [], []
+    for player_id in range(1, count + 1):
+        nickname = random_word(rng, rng.randint(3, 10))
+        real_name = f"{random_word(rng, 6).title()} {random_word(rng, 8).title()}"
+        entries.extend((key, player_id, nickname) for key in prefix_keys(nickname))
+        secondary.extend((key, player_id, nickname) for key in prefix_keys(real_name))
+    return entries, secondary
+
+
+def main(sizes, queries, seed):
+    rng = random.Random(seed)
+    print(f"{'jogadores':>10} {'construção s':>13} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for size in sizes:
+        entries, secondary = build_entries(size, rng)
+
+        start = time.perf_counter()
+        index = PrefixIndex(entries, secondary)
+        build_seconds = time.perf_counter() - start
+
+        timings = []
+        for _ in range(queries):
+            prefix = random_word(rng, rng.randint(1, 4))
+            start = time.perf_counter()
+            index.search(prefix, 10)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        print(
+            f"{size:>10} {build_seconds:>13.2f} {percentile(timings, 50):>9.4f} "
+            f"{percentile(timings, 95):>9.4f} {percentile(timings, 99):>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a latência do índice de prefixos do autocomplete")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=2000, help="Buscas por tamanho")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    main(args.sizes, args.queries, args.seed)
@@ -0,0 +1,232 @@
+"""
+Teste de carga da API: misturas de tráfego realistas contra `app.main:app`
+
+Dispara clientes concorrentes que sorteiam requisições de uma mistura
+(listagens, detalhes, busca, conquistas) e reporta throughput, percentis de
+latência e taxa de erros por cenário. Por padrão a aplicação roda no mesmo
+processo (ASGI, banco de `DATABASE_URL`); com `--url` o alvo é um servidor já
+em execução. Os ids e nicknames usados nas requisições são lidos do próprio
+banco pelas rotas `/export`, então basta um banco populado (ex: `app.synthetic`).
+
+Os resultados podem ser gravados como baseline e comparados em execuções
+seguintes; regressões acima da tolerância encerram com código 1.
+
+Uso:
+    python -m app.synthetic --teams 1000 --truncate
+    python -m app.benchmarks.load_test --mix mixed --concurrency 10 50 --duration 20 --save-baseline baseline.json
+    python -m app.benchmarks.load_test --mix mixed --concurrency 10 50 --duration 20 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from app.metrics import percentile
+
+# Quantidade máxima de ids/nicknames lidos do banco para montar as requisições
+TARGET_LIMIT = 5000
+
+ACHIEVEMENT_YEARS = range(2012, 2026)
+
+
+# Cenário -> função que monta o caminho da requisição
+SCENARIOS = {
+    "teams_list": lambda rng, targets: f"/teams/?limit=20&skip={rng.randrange(0, 100, 20)}",
+    "players_list": lambda rng, targets: f"/players/?limit=50&skip={rng.randrange(0, 500, 50)}",
+    "stats_list": lambda rng, targets: "/stats/players?limit=20",
+    "team_detail": lambda rng, targets: f"/teams/{rng.choice(targets['team_ids'])}",
+    "player_detail": lambda rng, targets: f"/players/{rng.choice(targets['player_ids'])}",
+    "team_players": lambda rng, targets: f"/teams/{rng.choice(targets['team_ids'])}/players",
+    "player_search": lambda rng, targets: f"/players/search?nickname={rng.choice(targets['nicknames'])[:4]}",
+    "player_autocomplete": lambda rng, targets: f"/players/autocomplete?q={rng.choice(targets['nicknames'])[:2]}",
+    "achievements_feed": lambda rng, targets: f"/achievements/?year={rng.choice(ACHIEVEMENT_YEARS)}",
+    "player_achievements": lambda rng, targets: f"/players/{rng.choice(targets['player_ids'])}/achievements",
+    "leaderboard": lambda rng, targets: f"/leaderboards/{rng.choice(('rating', 'kd', 'adr', 'headshots'))}",
+}
+
+# Mistura -> peso de cada cenário
+MIXES = {
+    "list": {"teams_list": 4, "players_list": 3, "stats_list": 2, "leaderboard": 1},
+    "detail": {"team_detail": 4, "player_detail": 4, "team_players": 2},
+    "search": {"player_search": 3, "player_autocomplete": 7},
+    "achievements": {"achievements_feed": 5, "player_achievements": 5},
+    "mixed": {
+        "teams_list": 3, "players_list": 2, "stats_list": 1, "team_detail": 3, "player_detail": 4,
+        "team_players": 1, "player_search": 1, "player_autocomplete": 3, "achievements_feed": 1,
+        "player_achievements": 1, "leaderboard": 1,
+    },
+}
+
+
+async def read_export(client: httpx.AsyncClient, entity: str, limit: int = TARGET_LIMIT) -> List[dict]:
+    rows = []
+    async with client.stream("GET", f"/export/{entity}") as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line:
+                rows.append(json.loads(line))
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+async def load_targets(client: httpx.AsyncClient) -> Dict[str, list]:
+    """Ids e nicknames existentes no banco, lidos pela própria API"""
+    teams = await read_export(client, "teams")
+    players = await read_export(client, "players")
+    if not teams or not players:
+        raise SystemExit("❌ Banco sem times ou jogadores; popule-o antes (ex: python -m app.synthetic)")
+    return {
+        "team_ids": [team["id"] for team in teams],
+        "player_ids": [player["id"] for player in players],
+        "nicknames": [player["nickname"] for player in players if player["nickname"]],
+    }
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+    }
+
+
+async def run_mix(client: httpx.AsyncClient, mix: str, targets: Dict[str, list], concurrency: int,
+                  duration: float, seed: int = 42, headers=None) -> dict:
+    """Executa a mistura por `duration` segundos com `concurrency` clientes"""
+    labels = list(MIXES[mix])
+    weights = [MIXES[mix][label] for label in labels]
+    latencies = {label: [] for label in labels}
+    errors = {label: 0 for label in labels}
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(f"{seed}:{index}")
+        while time.perf_counter() < deadline:
+            label = rng.choices(labels, weights)[0]
+            path = SCENARIOS[label](rng, targets)
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    errors[label] += 1
+            except Exception:
+                errors[label] += 1
+            latencies[label].append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mix": mix,
+        "concurrency": concurrency,
+        "total": summarize(
+            [latency for values in latencies.values() for latency in values], sum(errors.values()), elapsed
+        ),
+        "scenarios": {label: summarize(latencies[label], errors[label], elapsed) for label in labels},
+    }
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Regressões em relação à baseline: p95 maior ou throughput menor que a
+    tolerância (fração) permite, ou taxa de erros maior.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        current, previous = current["total"], previous["total"]
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {previous['rps']:.1f} -> {current['rps']:.1f} req/s")
+        if current["error_rate"] > previous["error_rate"]:
+            regressions.append(f"{key}: erros {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
+
+
+def build_client(url, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0)
+
+    from app.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=30.0)
+
+
+async def main(args) -> int:
+    headers = {"Cache-Control": "no-cache"} if args.no_cache else None
+    results = {}
+
+    async with build_client(args.url, max(args.concurrency)) as client:
+        targets = await load_targets(client)
+
+        print(f"{'mistura':<13} {'clientes':>8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>7}")
+        for mix in args.mix:
+            for concurrency in args.concurrency:
+                result = await run_mix(client, mix, targets, concurrency, args.duration, args.seed, headers)
+                results[f"{mix}@{concurrency}"] = result
+                total = result["total"]
+                print(
+                    f"{mix:<13} {concurrency:>8} {total['rps']:>10.1f} {total['p50_ms']:>9.2f} "
+                    f"{total['p95_ms']:>9.2f} {total['p99_ms']:>9.2f} {total['error_rate']:>7.2%}"
+                )
+                if args.verbose:
+                    for label, summary in result["scenarios"].items():
+                        print(
+                            f"  {label:<22} {summary['rps']:>10.1f} {summary['p50_ms']:>9.2f} "
+                            f"{summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} {summary['error_rate']:>7.2%}"
+                        )
+
+    if not args.url:
+        from app import banco
+
+        if banco.async_engine is not None:
+            await banco.async_engine.dispose()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nBaseline gravada em {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare_to_baseline(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressões em relação à baseline:")
+            for regression in regressions:
+                print(f"  ✗ {regression}")
+            return 1
+        print("\n✓ Sem regressões em relação à baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga da API com misturas de tráfego")
+    parser.add_argument("--mix", nargs="+", choices=list(MIXES), default=["mixed"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por cenário")
+    parser.add_argument("--url", help="Servidor já em execução (padrão: app.main:app no mesmo processo)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignora o cache de respostas (Cache-Control: no-cache)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", help="Grava os resultados em JSON")
+    parser.add_argument("--compare", help="Compara com uma baseline gravada e falha se houver regressão")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Variação aceita na comparação (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os resultados por cenário")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,297 @@
+"""
+Microbenchmark dos parsers do scraper (`app.parsers`) sobre um corpus de HTML
+
+Roda cada parser sobre as páginas salvas de cada tipo (ranking, página do time,
+perfil e stats do jogador) e reporta, por parser e backend do BeautifulSoup,
+os percentis de tempo por página e o pico de memória alocada (tracemalloc).
+A linha `soup` de cada tipo mede só a construção da árvore, separando o custo
+do backend do custo da extração. Também indica se o resultado de cada backend
+difere do primeiro (backends toleram HTML malformado de formas diferentes).
+
+O corpus é um diretório `<tipo>/*.html`, gravado pelo próprio scraper com
+HTML_CORPUS_DIR. Sem `--corpus`, usa páginas sintéticas com a estrutura do HLTV.
+
+Uso:
+    HTML_CORPUS_DIR=corpus python -m app.scraper
+    python -m app.benchmarks.parsers --corpus corpus --backends lxml html.parser --rounds 20
+    python -m app.benchmarks.parsers --pages 10 --write-corpus corpus-sintetico
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from app.metrics import percentile
+from app.parsers import (
+    parse_player_page, parse_player_stats, parse_ranking, parse_team, parse_team_lineup, parse_team_page,
+)
+
+PAGE_TYPES = ("ranking", "team", "player", "player_stats")
+
+BACKENDS = ("lxml", "html.parser", "html5lib")
+
+# Parser -> (tipo de página, função)
+PARSERS = {
+    "ranking": ("ranking", parse_ranking),
+    "team_page": ("team", parse_team_page),
+    "team_lineup": ("team", parse_team_lineup),
+    # Página e elenco com uma árvore só, como no scraper
+    "team": ("team", parse_team),
+    "player_page": ("player", parse_player_page),
+    "player_stats": ("player_stats", parse_player_stats),
+}
+
+MAPS = ("Mirage", "Inferno", "Nuke", "Ancient", "Anubis", "Dust2", "Vertigo")
+EVENTS = ("IEM Katowice", "BLAST Premier World Final", "ESL Pro League", "PGL Major Copenhagen", "DreamHack Open")
+PLAYER_STATS = (
+    ("Total kills", "{:d}"), ("Headshot %", "{:.1f}%"), ("Total deaths", "{:d}"), ("K/D Ratio", "{:.2f}"),
+    ("Damage / Round", "{:.1f}"), ("Grenade dmg / Round", "{:.1f}"), ("Maps played", "{:d}"),
+    ("Rounds played", "{:d}"), ("Kills / round", "{:.2f}"), ("Assists / round", "{:.2f}"),
+    ("Deaths / round", "{:.2f}"), ("Saved by teammate / round", "{:.2f}"), ("Saved teammates / round", "{:.2f}"),
+    ("Rating 2.1", "{:.2f}"),
+)
+
+
+def filler(rng: random.Random, rows: int) -> str:
+    """Marcação sem dados úteis (partidas, notícias), que pesa no parsing como nas páginas reais"""
+    return "".join(
+        f'<div class="result-con"><a class="a-reset" href="/matches/{rng.randrange(10 ** 6)}/match">'
+        f'<table class="result"><tr><td class="team-cell"><div class="team">Team {rng.randrange(500)}</div></td>'
+        f'<td class="result-score"><span class="score-won">{rng.randrange(17)}</span> - '
+        f'<span class="score-lost">{rng.randrange(17)}</span></td>'
+        f'<td class="event"><span class="event-name">{rng.choice(EVENTS)}</span></td></tr></table></a></div>'
+        for _ in range(rows)
+    )
+
+
+def page(body: str, title: str) -> str:
+    return f"<!DOCTYPE html><html><head><title>{title}</title></head><body><div class=\"contentCol\">{body}</div></body></html>"
+
+
+def trophies(rng: random.Random, count: int, player: bool = False) -> str:
+    items = []
+    for index in range(count):
+        title = f"{rng.choice(EVENTS)} {rng.randrange(2015, 2026)}"
+        major = " majorTrophy" if "Major" in title else ""
+        award = f'<span class="award-year">\'{rng.randrange(15, 26)}</span>' if player and index % 4 == 0 else ""
+        items.append(
+            f'<a class="trophy" href="/events/{rng.randrange(10 ** 4)}/event">'
+            f'<img class="trophyIcon" src="/img/static/event/logo/{index}.png">'
+            f'<span class="trophyDescription{major}" title="{title}"></span>{award}</a>'
+        )
+    return f'<div class="trophyRow">{"".join(items)}</div>'
+
+
+def ranking_page(rng: random.Random, teams: int = 30) -> str:
+    ranked = []
+    for rank in range(1, teams + 1):
+        lineup = "".join(
+            f'<td class="player-holder"><a href="/player/{rank * 10 + slot}/p{rank}-{slot}">'
+            f'<img class="playerPicture" src="/img/p.png"><div class="nick">p{rank}-{slot}</div></a></td>'
+            for slot in range(5)
+        )
+        ranked.append(
+            f'<div class="ranked-team standard-box"><div class="ranking-header">'
+            f'<span class="position">#{rank}</span>'
+            f'<span class="team-logo"><img src="https://img-cdn.hltv.org/teamlogo/{rank}.svg"></span>'
+            f'<div class="relative"><span class="name">Team {rank}</span>'
+            f'<span class="points">({1000 - rank * 25} points)</span></div></div>'
+            f'<div class="lineup-con"><table class="lineup"><tr>{lineup}</tr></table></div>'
+            f'<div class="more"><a href="/team/{rank}/team-{rank}" class="moreLink">Team profile</a></div></div>'
+        )
+    return page(f'<div class="ranking">{"".join(ranked)}</div>{filler(rng, 50)}', "CS2 Ranking")
+
+
+def team_page(rng: random.Random, team_id: int) -> str:
+    lineup = "".join(
+        f'<a href="/player/{team_id * 10 + slot}/p{team_id}-{slot}" class="col-custom">'
+        f'<span class="text-ellipsis bold">p{team_id}-{slot}</span></a>'
+        for slot in range(5)
+    ) + f'<a href="/coach/{team_id * 10 + 9}/coach{team_id}" class="col-custom">coach{team_id}</a>'
+    maps = "".join(
+        f'<div class="map-statistics-container"><div class="map-statistics-row">'
+        f'<div class="map-statistics-row-map-mapname">{name}</div>'
+        f'<div class="map-statistics-row-win-percentage">{rng.uniform(30, 80):.1f}%</div></div>'
+        f'<div class="map-statistics-extended"><div class="map-statistics-extended-wdl">'
+        f'<div><div class="stat">{rng.randrange(60)}</div>Wins</div>'
+        f'<div><div class="stat">{rng.randrange(3)}</div>Draws</div>'
+        f'<div><div class="stat">{rng.randrange(40)}</div>Losses</div></div>'
+        f'<div class="map-statistics-extended-general-stat"><div>Round win % after first kill</div>'
+        f'<div>{rng.uniform(60, 85):.1f}%</div></div>'
+        f'<div class="map-statistics-extended-general-stat"><div>Round win % after first death</div>'
+        f'<div>{rng.uniform(20, 40):.1f}%</div></div>'
+        f'<div class="map-statistics-extended-highlight-veto-container">'
+        f'<div class="map-statistics-extended-highlight-veto"><div>Picks</div><div>{rng.uniform(0, 40):.1f}% of picks</div></div>'
+        f'<div class="map-statistics-extended-highlight-veto"><div>Bans</div><div>{rng.uniform(0, 40):.1f}% of bans</div></div>'
+        f'</div></div></div>'
+        for name in MAPS
+    )
+    body = (
+        f'<div class="team-country"><img class="flag" title="Brazil"> Brazil</div>'
+        f'<div class="bodyshot-team g-grid">{lineup}</div>{trophies(rng, 12)}'
+        f'<div id="matchesBox"><div class="highlighted-stat"><div class="stat">#{team_id}</div></div>'
+        f'<div class="highlighted-stat"><div class="stat">{rng.uniform(40, 75):.1f}%</div></div></div>'
+        f'<div id="statsBox"></div><div class="map-statistics">{maps}</div>{filler(rng, 120)}'
+    )
+    return page(body, f"Team {team_id}")
+
+
+def player_page(rng: random.Random, player_id: int) -> str:
+    body = (
+        f'<img class="bodyshot-img" src="https://img-cdn.hltv.org/playerbodyshot/{player_id}.png">'
+        f'<div class="playerRealname"><img class="flag" title="Brazil"> Jogador {player_id}</div>'
+        f'<div class="playerAge"><span class="listRight">{rng.randrange(17, 35)} years</span></div>'
+        f'{trophies(rng, 8, player=True)}{filler(rng, 80)}'
+    )
+    return page(body, f"Player {player_id}")
+
+
+def player_stats_page(rng: random.Random, player_id: int) -> str:
+    rows = "".join(
+        f'<div class="stats-row"><span>{label}</span>'
+        f'<span>{fmt.format(rng.randrange(100, 40000) if "d" in fmt else rng.uniform(0.1, 90))}</span></div>'
+        for label, fmt in PLAYER_STATS
+    )
+    return page(f'<div class="standard-box">{rows}</div>{filler(rng, 60)}', f"Stats {player_id}")
+
+
+def synthetic_corpus(pages: int = 10, seed: int = 42) -> Dict[str, List[str]]:
+    """Páginas com os seletores usados por `app.parsers`, `pages` por tipo (1 de ranking)"""
+    rng = random.Random(seed)
+    return {
+        "ranking": [ranking_page(rng)],
+        "team": [team_page(rng, team_id) for team_id in range(1, pages + 1)],
+        "player": [player_page(rng, player_id) for player_id in range(1, pages + 1)],
+        "player_stats": [player_stats_page(rng, player_id) for player_id in range(1, pages + 1)],
+    }
+
+
+def load_corpus(directory: str) -> Dict[str, List[str]]:
+    root = Path(directory)
+    return {
+        page_type: [path.read_text(encoding="utf-8") for path in sorted((root / page_type).glob("*.html"))]
+        for page_type in PAGE_TYPES
+    }
+
+
+def write_corpus(corpus: Dict[str, List[str]], directory: str):
+    for page_type, pages in corpus.items():
+        target = Path(directory) / page_type
+        target.mkdir(parents=True, exist_ok=True)
+        for index, html in enumerate(pages):
+            (target / f"{index:04d}.html").write_text(html, encoding="utf-8")
+
+
+def available_backends(requested) -> List[str]:
+    backends = [backend for backend in requested if builder_registry.lookup(backend) is not None]
+    for backend in requested:
+        if backend not in backends:
+            print(f"⚠️ Backend {backend} não instalado, ignorado")
+    return backends
+
+
+def measure(function: Callable, pages: List[str], backend: str, rounds: int) -> dict:
+    """Tempo por página (ms) em `rounds` passadas e pico de memória por página (tracemalloc)"""
+    for html in pages:  # aquecimento
+        function(html, backend)
+
+    timings = []
+    for _ in range(rounds):
+        for html in pages:
+            start = time.perf_counter()
+            function(html, backend)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    # Passada separada: o tracemalloc deixa o código bem mais lento
+    peaks, results = [], []
+    tracemalloc.start()
+    try:
+        for html in pages:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            results.append(function(html, backend))
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "pages": len(pages),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "peak_kib": round(max(peaks) / 1024, 1),
+        "results": results,
+    }
+
+
+def run(corpus: Dict[str, List[str]], backends: List[str], rounds: int, parsers=None) -> List[dict]:
+    """Uma linha por (tipo de página, parser, backend); `soup` mede só a construção da árvore"""
+    benchmarks = [(page_type, "soup", BeautifulSoup) for page_type in PAGE_TYPES]
+    benchmarks += [(page_type, name, function) for name, (page_type, function) in PARSERS.items()]
+    if parsers:
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark[1] == "soup" or benchmark[1] in parsers]
+
+    rows = []
+    for page_type, name, function in benchmarks:
+        pages = corpus.get(page_type)
+        if not pages:
+            continue
+        reference = None
+        for backend in backends:
+            result = measure(function, pages, backend, rounds)
+            results = result.pop("results")
+            if name == "soup":
+                result["matches"] = None
+            elif reference is None:
+                reference, result["matches"] = results, True
+            else:
+                result["matches"] = results == reference
+            rows.append({"page_type": page_type, "parser": name, "backend": backend, **result})
+    return rows
+
+
+def main(args):
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = synthetic_corpus(args.pages, args.seed)
+        print(f"Corpus sintético: {args.pages} páginas por tipo (use --corpus para páginas reais)")
+
+    if args.write_corpus:
+        write_corpus(corpus, args.write_corpus)
+        print(f"Corpus gravado em {args.write_corpus}")
+
+    sizes = ", ".join(
+        f"{page_type}: {len(pages)} ({sum(map(len, pages)) / max(len(pages), 1) / 1024:.0f} KiB/pág.)"
+        for page_type, pages in corpus.items()
+    )
+    print(f"Páginas -> {sizes}\n")
+
+    rows = run(corpus, available_backends(args.backends), args.rounds, args.parsers)
+
+    print(f"{'tipo':<13} {'parser':<13} {'backend':<12} {'p50 ms':>9} {'p95 ms':>9} {'média ms':>9} {'pico KiB':>9} {'igual':>6}")
+    for row in rows:
+        matches = "-" if row["matches"] is None else "✓" if row["matches"] else "✗"
+        print(
+            f"{row['page_type']:<13} {row['parser']:<13} {row['backend']:<12} {row['p50_ms']:>9.3f} "
+            f"{row['p95_ms']:>9.3f} {row['mean_ms']:>9.3f} {row['peak_kib']:>9.1f} {matches:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark dos parsers de HTML do scraper")
+    parser.add_argument("--corpus", help="Diretório <tipo>/*.html (padrão: corpus sintético)")
+    parser.add_argument("--pages", type=int, default=10, help="Páginas sintéticas por tipo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--write-corpus", help="Grava o corpus usado no diretório informado")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["lxml", "html.parser"])
+    parser.add_argument("--parsers", nargs="+", choices=list(PARSERS), help="Restringe os parsers medidos")
+    parser.add_argument("--rounds", type=int, default=10, help="Passadas sobre o corpus por parser")
+    main(parser.parse_args())
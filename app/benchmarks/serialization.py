@@ -0,0 +1,126 @@
+"""
+Microbenchmark de serialização: dicionários montados à mão + `jsonable_encoder`
+x mapeadores pré-compilados + `FastJSONResponse` (orjson)
+
+Gera objetos transientes dos modelos (sem banco) para páginas de 20, 100 e 1000
+jogadores e mede o tempo para produzir o corpo da resposta de `/players/`.
+
+Uso:
+    python -m app.benchmarks.serialization --sizes 20 100 1000 --repeat 200
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import models, serializers
+from app.metrics import percentile
+from app.serializers import FastJSONResponse
+
+
+def build_players(count: int) -> list:
+    team = models.Team(id=1, name="Team", url="https://www.hltv.org/team/1/team", ranking=1, points=1000)
+    players = []
+    for index in range(count):
+        player = models.Player(
+            id=index + 1,
+            nickname=f"player{index}",
+            real_name=f"Jogador {index}",
+            url=f"https://www.hltv.org/player/{index + 1}/player{index}",
+            role="Rifler",
+            team_id=team.id,
+        )
+        player.team = team
+        player.stats = models.PlayerStats(
+            player_id=player.id, picture="https://img.hltv.org/x.png", country="Brazil", age=24,
+            rating=1.05 + index % 10 / 100, kd_ratio=1.1, headshot_percentage=48.5, damage_per_round=80.2,
+            maps_played=500 + index, last_updated=datetime(2024, 1, 1),
+        )
+        player.achievements = [
+            models.PlayerAchievement(
+                id=index * 3 + offset, player_id=player.id, title="MVP", event_name="Major", year=2023,
+                placement="1st", prize_money="$500,000", event_tier="S", mvp_award=offset == 0,
+            )
+            for offset in range(3)
+        ]
+        players.append(player)
+    return players
+
+
+def legacy_render(players: list) -> bytes:
+    """Formato anterior: dicionários montados por rota e `jsonable_encoder`"""
+    content = [
+        {
+            "id": player.id,
+            "nickname": player.nickname,
+            "real_name": player.real_name,
+            "url": player.url,
+            "role": player.role,
+            "team_id": player.team_id,
+            "team_name": player.team.name if player.team else None,
+            "stats": {
+                "rating": player.stats.rating,
+                "kd_ratio": player.stats.kd_ratio,
+                "headshot_percentage": player.stats.headshot_percentage,
+                "damage_per_round": player.stats.damage_per_round,
+                "maps_played": player.stats.maps_played,
+                "country": player.stats.country,
+                "picture": player.stats.picture,
+            },
+            "achievements": [
+                {
+                    "id": achievement.id,
+                    "title": achievement.title,
+                    "event_name": achievement.event_name,
+                    "year": achievement.year,
+                    "placement": achievement.placement,
+                    "prize_money": achievement.prize_money,
+                    "trophy_image_url": achievement.trophy_image_url,
+                    "event_tier": achievement.event_tier,
+                    "mvp_award": achievement.mvp_award,
+                }
+                for achievement in player.achievements
+            ],
+        }
+        for player in players
+    ]
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_render(players: list) -> bytes:
+    return FastJSONResponse([serializers.player_list_item(player) for player in players]).body
+
+
+def measure(function, players: list, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(players)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {"p50_ms": percentile(timings, 50), "p95_ms": percentile(timings, 95)}
+
+
+def main(sizes, repeat):
+    backend = "orjson" if serializers.orjson is not None else "json"
+    print(f"Backend do FastJSONResponse: {backend}")
+    print(f"{'jogadores':>9} {'modo':<8} {'p50 ms':>10} {'p95 ms':>10} {'speedup':>8}")
+    for size in sizes:
+        players = build_players(size)
+        legacy = measure(legacy_render, players, repeat)
+        fast = measure(fast_render, players, repeat)
+        speedup = legacy["p50_ms"] / fast["p50_ms"] if fast["p50_ms"] else float("inf")
+        print(f"{size:>9} {'legado':<8} {legacy['p50_ms']:>10.3f} {legacy['p95_ms']:>10.3f}")
+        print(f"{size:>9} {'rápido':<8} {fast['p50_ms']:>10.3f} {fast['p95_ms']:>10.3f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara o custo de serialização das respostas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200, help="Repetições por cenário")
+    args = parser.parse_args()
+
+    main(args.sizes, args.repeat)
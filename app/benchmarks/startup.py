@@ -0,0 +1,147 @@
+"""
+Tempo de inicialização dos pontos de entrada (API e scraper) com `python -X importtime`
+
+Importa cada ponto de entrada em um interpretador novo, `--repeat` vezes, e
+reporta a mediana do tempo de import (soma do `-X importtime`) e do processo
+inteiro, além dos pacotes que mais pesam. Falha (código 1) se um ponto de
+entrada carregar um módulo proibido para ele (ex: a API carregando o Playwright)
+ou, com `--compare`, se o tempo de import piorar além da tolerância.
+
+Uso:
+    python -m app.benchmarks.startup --repeat 5 --save-baseline startup.json
+    python -m app.benchmarks.startup --repeat 5 --compare startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+
+ENTRY_POINTS = {
+    "api": "app.main",
+    "scraper": "app.scraper",
+}
+
+# Módulos que cada ponto de entrada não deve carregar ao ser importado
+FORBIDDEN_MODULES = {
+    # Os drivers assíncronos só são carregados quando o engine da API é criado, na primeira consulta
+    "api": (
+        "playwright", "bs4", "lxml", "numpy", "pyarrow", "alembic",
+        "psycopg", "psycopg2", "asyncpg", "aiosqlite",
+    ),
+    "scraper": ("playwright", "fastapi", "numpy", "pyarrow", "alembic"),
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+# Imprime os módulos carregados, para conferir os proibidos
+PROBE = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+def import_once(module: str) -> dict:
+    """Importa `module` em um interpretador novo e devolve os tempos (ms) e os módulos carregados"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.getenv("PYTHONPATH")]))}
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{process.stderr[-2000:]}")
+
+    total, packages = 0, defaultdict(int)
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        if not indent:
+            total += cumulative
+        packages[name.split(".")[0]] += own
+
+    return {
+        "import_ms": total / 1000,
+        "wall_ms": wall,
+        "packages": {name: own / 1000 for name, own in packages.items()},
+        "modules": json.loads(process.stdout.splitlines()[-1]),
+    }
+
+
+def measure(entry: str, repeat: int = 5, top: int = 8) -> dict:
+    """Medianas de `repeat` imports do ponto de entrada e os módulos proibidos carregados"""
+    runs = [import_once(ENTRY_POINTS[entry]) for _ in range(repeat)]
+    packages = defaultdict(list)
+    for run in runs:
+        for name, own in run["packages"].items():
+            packages[name].append(own)
+    heaviest = sorted(packages, key=lambda name: statistics.median(packages[name]), reverse=True)[:top]
+    loaded = {name.split(".")[0] for name in runs[-1]["modules"]}
+
+    return {
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 1),
+        "packages": {name: round(statistics.median(packages[name]), 1) for name in heaviest},
+        "forbidden": sorted(loaded & set(FORBIDDEN_MODULES.get(entry, ()))),
+    }
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Pontos de entrada cujo tempo de import cresceu mais que a tolerância (fração)"""
+    regressions = []
+    for entry, current in results.items():
+        previous = baseline.get(entry)
+        if previous is not None and current["import_ms"] > previous["import_ms"] * (1 + tolerance):
+            regressions.append(f"{entry}: import {previous['import_ms']:.1f} -> {current['import_ms']:.1f} ms")
+    return regressions
+
+
+def main(args) -> int:
+    results = {}
+    failed = False
+
+    print(f"{'entrada':<10} {'import ms':>10} {'processo ms':>12}  pacotes mais pesados (ms)")
+    for entry in args.entries:
+        result = results[entry] = measure(entry, args.repeat)
+        packages = ", ".join(f"{name} {own:.0f}" for name, own in result["packages"].items())
+        print(f"{entry:<10} {result['import_ms']:>10.1f} {result['wall_ms']:>12.1f}  {packages}")
+        if result["forbidden"]:
+            print(f"  ✗ {entry} carrega módulos proibidos: {', '.join(result['forbidden'])}")
+            failed = True
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nBaseline gravada em {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare_to_baseline(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressões em relação à baseline:")
+            for regression in regressions:
+                print(f"  ✗ {regression}")
+            failed = True
+        else:
+            print("\n✓ Sem regressões em relação à baseline")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo de inicialização dos pontos de entrada")
+    parser.add_argument("--entries", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=5, help="Interpretadores novos por ponto de entrada")
+    parser.add_argument("--save-baseline", help="Grava os resultados em JSON")
+    parser.add_argument("--compare", help="Compara com uma baseline gravada e falha se houver regressão")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Variação aceita na comparação (0.2 = 20%%)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,190 @@
+"""
+Cache de respostas da API HLTV Expandido
+
+Os dados só mudam quando o scraper roda, então as respostas GET são guardadas
+por rota + parâmetros e invalidadas pela versão dos dados (`data_version`),
+que o scraper incrementa ao fim de cada fase que salvou dados no banco.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.data_version import data_version
+from app.logger import logger
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+
+# Limites do cache em memória
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_MAX_ENTRY_BYTES = int(os.getenv("CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+
+# Backend compartilhado opcional (ex: redis://localhost:6379/0)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CACHE_REDIS_TTL = int(os.getenv("CACHE_REDIS_TTL", "3600"))
+
+# Rotas que nunca passam pelo cache
+EXCLUDED_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/metrics", "/export")
+
+
+class CachedResponse:
+    """Resposta guardada no cache (status, headers e corpo já serializado)"""
+
+    __slots__ = ("status_code", "headers", "body")
+
+    def __init__(self, status_code: int, headers: List[Tuple[str, str]], body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def to_response(self, cache_state: str) -> Response:
+        response = Response(content=self.body, status_code=self.status_code, headers=dict(self.headers))
+        response.headers["X-Cache"] = cache_state
+        return response
+
+    def to_bytes(self) -> bytes:
+        meta = json.dumps({"status_code": self.status_code, "headers": self.headers})
+        return meta.encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        meta, body = raw.split(b"\n", 1)
+        meta = json.loads(meta)
+        return cls(meta["status_code"], [tuple(h) for h in meta["headers"]], body)
+
+
+class LRUResponseCache:
+    """Cache LRU em memória limitado por quantidade de entradas e bytes"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._version = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def _check_version(self, version: int):
+        # Nova versão dos dados: tudo que está guardado ficou obsoleto
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+    async def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        self._check_version(version)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, version: int, entry: CachedResponse):
+        self._check_version(version)
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old.size
+
+        self._entries[key] = entry
+        self._size += entry.size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+
+
+class RedisResponseCache:
+    """Cache compartilhado entre processos; a versão dos dados faz parte da chave"""
+
+    def __init__(self, url: str, ttl: int = CACHE_REDIS_TTL):
+        import redis.asyncio as redis  # Dependência opcional
+
+        self.ttl = ttl
+        self._client = redis.from_url(url)
+
+    @staticmethod
+    def _key(key: str, version: int) -> str:
+        return f"cs2stats:response:{version}:{key}"
+
+    async def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        raw = await self._client.get(self._key(key, version))
+        return CachedResponse.from_bytes(raw) if raw else None
+
+    async def set(self, key: str, version: int, entry: CachedResponse):
+        await self._client.set(self._key(key, version), entry.to_bytes(), ex=self.ttl)
+
+
+def build_cache():
+    """Cria o backend de cache conforme a configuração"""
+    if CACHE_REDIS_URL:
+        try:
+            return RedisResponseCache(CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("⚠️ Pacote 'redis' não instalado, usando cache em memória")
+    return LRUResponseCache()
+
+
+def cache_key(request) -> str:
+    """
+    Chave do cache: origem + rota + parâmetros de query em ordem canônica.
+    A origem entra na chave porque o header `Link` da paginação traz a URL absoluta.
+    """
+    params = sorted(request.query_params.multi_items())
+    url = request.url
+    return f"{url.scheme}://{url.netloc}{url.path}?{urlencode(params)}"
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware que responde requisições GET repetidas a partir do cache.
+
+    Apenas respostas 200 em JSON são guardadas. O header `X-Cache` indica
+    se a resposta veio do cache (`HIT`) ou do banco (`MISS`).
+    """
+
+    def __init__(self, app, cache=None, exclude_prefixes=EXCLUDED_PREFIXES):
+        super().__init__(app)
+        self.cache = cache if cache is not None else build_cache()
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def dispatch(self, request, call_next):
+        if not CACHE_ENABLED or request.method != "GET" or request.url.path.startswith(self.exclude_prefixes):
+            return await call_next(request)
+
+        stamp = data_version.peek() or await data_version.get()
+        if stamp is None:
+            return await call_next(request)
+
+        key = cache_key(request)
+        if "no-cache" not in request.headers.get("cache-control", ""):
+            cached = await self.cache.get(key, stamp.version)
+            if cached is not None:
+                return cached.to_response("HIT")
+
+        response = await call_next(request)
+        if response.status_code != 200 or not response.headers.get("content-type", "").startswith("application/json"):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = [(name, value) for name, value in response.headers.items() if name != "content-length"]
+        entry = CachedResponse(response.status_code, headers, body)
+
+        if entry.size <= CACHE_MAX_ENTRY_BYTES:
+            await self.cache.set(key, stamp.version, entry)
+
+        return entry.to_response("MISS")
@@ -0,0 +1,82 @@
+"""
+Versão dos dados do banco
+
+O scraper incrementa a versão ao fim de cada lote salvo; a API usa o valor
+para invalidar caches e gerar ETags.
+"""
+
+import os
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+
+from app import banco, models
+from app.logger import logger
+
+# Intervalo (s) entre consultas da versão dos dados no banco
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "5"))
+
+DATA_VERSION_ID = 1
+
+DataStamp = namedtuple("DataStamp", ["version", "updated_at"])
+
+
+def bump_data_version(session):
+    """
+    Incrementa a versão dos dados, invalidando o cache de respostas da API.
+    Chamada pelo scraper ao fim de cada fase que salvou dados.
+    """
+    now = datetime.utcnow()
+    updated = session.query(models.DataVersion).filter_by(id=DATA_VERSION_ID).update(
+        {
+            models.DataVersion.version: models.DataVersion.version + 1,
+            models.DataVersion.updated_at: now,
+        }
+    )
+    if not updated:
+        session.add(models.DataVersion(id=DATA_VERSION_ID, version=1, updated_at=now))
+    session.commit()
+
+
+class DataVersionReader:
+    """Lê a versão dos dados do banco, reaproveitando o valor por `ttl` segundos"""
+
+    def __init__(self, ttl: float = DATA_VERSION_TTL):
+        self.ttl = ttl
+        self._stamp = None
+        self._checked_at = 0.0
+
+    def peek(self) -> Optional[DataStamp]:
+        """Retorna a versão conhecida se ainda estiver dentro do TTL, sem acessar o banco"""
+        if self._stamp is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._stamp
+        return None
+
+    async def get(self) -> Optional[DataStamp]:
+        stamp = self.peek()
+        if stamp is not None:
+            return stamp
+
+        try:
+            async with banco.AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(models.DataVersion.version, models.DataVersion.updated_at)
+                    .where(models.DataVersion.id == DATA_VERSION_ID)
+                )
+                row = result.first()
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível ler a versão dos dados, cache desativado: %s", e)
+            return None
+
+        self._stamp = DataStamp(row.version, row.updated_at) if row else DataStamp(0, None)
+        self._checked_at = time.monotonic()
+        return self._stamp
+
+    def invalidate(self):
+        self._stamp = None
+
+
+data_version = DataVersionReader()
@@ -0,0 +1,146 @@
+"""
+Exportação completa dos dados (NDJSON, CSV e snapshots Parquet/Arrow)
+
+As rotas `/export/{entity}` leem a tabela inteira com um cursor do lado do
+servidor (`stream` + `yield_per`) e enviam cada lote assim que ele chega, então
+a memória do worker não cresce com o tamanho da tabela e todas as linhas vêm
+da mesma consulta (sem as inconsistências da paginação com `skip/limit`).
+
+A linha de comando grava snapshots colunares de todas as tabelas com pyarrow
+(dependência opcional), lote a lote:
+
+    python -m app.export --format parquet --output snapshots/
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from app import banco, models
+from app.logger import logger
+from app.serializers import dumps
+
+# Linhas lidas do cursor e enviadas por vez
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Entidade da URL -> tabela
+EXPORT_TABLES = {
+    "teams": models.Team.__table__,
+    "players": models.Player.__table__,
+    "player_stats": models.PlayerStats.__table__,
+    "team_map_stats": models.TeamMapStats.__table__,
+    "team_achievements": models.TeamAchievement.__table__,
+    "player_achievements": models.PlayerAchievement.__table__,
+}
+
+# Formato -> media type da resposta
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_query(entity: str):
+    table = EXPORT_TABLES[entity]
+    return select(table).order_by(table.c.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def ndjson_chunk(columns, rows) -> bytes:
+    return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(entity: str, format: str) -> AsyncIterator[bytes]:
+    """Linhas da tabela no formato pedido, um lote do cursor por vez"""
+    columns = list(EXPORT_TABLES[entity].columns.keys())
+    if format == "csv":
+        yield csv_chunk([columns])
+
+    async with banco.get_async_engine().connect() as connection:
+        result = await connection.stream(export_query(entity))
+        async for rows in result.partitions(EXPORT_BATCH_SIZE):
+            yield ndjson_chunk(columns, rows) if format == "ndjson" else csv_chunk(rows)
+
+
+# Snapshots colunares (linha de comando)
+
+SNAPSHOT_FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def arrow_schema(pa, table):
+    types = {int: pa.int64(), float: pa.float64(), str: pa.string(), datetime: pa.timestamp("us")}
+    return pa.schema([(column.name, types[column.type.python_type]) for column in table.columns])
+
+
+def write_snapshot(connection, entity: str, output: str, format: str) -> int:
+    """Grava uma tabela em Parquet ou Arrow IPC, um lote do cursor por vez"""
+    import pyarrow as pa
+
+    table = EXPORT_TABLES[entity]
+    schema = arrow_schema(pa, table)
+    path = os.path.join(output, f"{entity}.{SNAPSHOT_FORMATS[format]}")
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    total = 0
+    with writer:
+        result = connection.execute(export_query(entity))
+        for rows in result.partitions(EXPORT_BATCH_SIZE):
+            columns = list(zip(*rows))
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            total += len(rows)
+    return total
+
+
+def write_snapshots(output: str, format: str, entities=None):
+    """Snapshot de todas as tabelas, lidas na mesma transação para ficarem consistentes entre si"""
+    os.makedirs(output, exist_ok=True)
+    options = {"stream_results": True}
+    engine = banco.get_engine()
+    if engine.dialect.name == "postgresql":
+        options["isolation_level"] = "REPEATABLE READ"
+
+    with engine.connect().execution_options(**options) as connection:
+        with connection.begin():
+            for entity in entities or EXPORT_TABLES:
+                total = write_snapshot(connection, entity, output, format)
+                logger.info("📦 %s: %d linhas exportadas", entity, total, extra={"entity": entity, "rows": total})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grava snapshots colunares de todas as tabelas")
+    parser.add_argument("--format", choices=list(SNAPSHOT_FORMATS), default="parquet")
+    parser.add_argument("--output", default="snapshots", help="Diretório de saída")
+    parser.add_argument("--entities", nargs="+", choices=list(EXPORT_TABLES), help="Tabelas (padrão: todas)")
+    args = parser.parse_args()
+
+    try:
+        import pyarrow  # noqa: F401  Dependência opcional, apenas para os snapshots
+    except ImportError:
+        logger.error("❌ Pacote 'pyarrow' não instalado (pip install pyarrow)")
+        sys.exit(1)
+
+    write_snapshots(args.output, args.format, args.entities)
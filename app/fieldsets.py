@@ -0,0 +1,93 @@
+"""
+Campos esparsos (`fields[tipo]=`) e relacionamentos opcionais (`include=`)
+
+O cliente escolhe quais campos de cada tipo de recurso quer receber e quais
+relacionamentos devem ser embutidos na resposta. As rotas usam a mesma seleção
+para decidir quais relacionamentos carregar do banco, então campos e listas
+não pedidos não custam joins nem consultas extras.
+"""
+
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+
+
+def _split(raw: str) -> list:
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+class Fieldset:
+    """
+    Campos pedidos para um tipo de recurso; sem `fields[tipo]` todos são retornados.
+
+    Campos de um sub-objeto (ex: `rating` dentro de `stats`) podem ser pedidos
+    diretamente; o sub-objeto é mantido apenas com eles.
+    """
+
+    def __init__(self, resource: str, fields: Optional[Iterable[str]] = None):
+        self.resource = resource
+        self.fields = frozenset(fields) if fields is not None else None
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.fields is not None
+
+    def __contains__(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def wants_any(self, names: Iterable[str]) -> bool:
+        return self.fields is None or not self.fields.isdisjoint(names)
+
+    def apply(self, data: dict, keep: Iterable[str] = (), nested: Iterable[str] = ()) -> dict:
+        """
+        Remove do dicionário os campos não pedidos.
+
+        - **keep**: chaves sempre mantidas (ex: relacionamentos incluídos)
+        - **nested**: sub-objetos cujos campos podem ser pedidos individualmente
+        """
+        if self.fields is None:
+            return data
+
+        keep = set(keep)
+        result = {}
+        for name, value in data.items():
+            if name in self.fields or name in keep:
+                result[name] = value
+            elif name in nested and isinstance(value, dict):
+                selected = {key: item for key, item in value.items() if key in self.fields}
+                if selected:
+                    result[name] = selected
+        return result
+
+
+def parse_fieldset(resource: str, raw: Optional[str], allowed: Iterable[str]) -> Fieldset:
+    """Valida `fields[tipo]`; responde 400 com os campos desconhecidos"""
+    if raw is None:
+        return Fieldset(resource)
+
+    fields = _split(raw)
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos para '{resource}': {', '.join(unknown)}"
+        )
+    return Fieldset(resource, fields)
+
+
+def parse_include(raw: Optional[str], allowed: Iterable[str], default: Iterable[str]) -> frozenset:
+    """
+    Valida `include`; sem o parâmetro vale o padrão da rota e `include=`
+    vazio não embute nenhum relacionamento.
+    """
+    if raw is None:
+        return frozenset(default)
+
+    include = frozenset(_split(raw))
+    unknown = sorted(include - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Relacionamentos inválidos em 'include': {', '.join(unknown)}"
+        )
+    return include
@@ -0,0 +1,118 @@
+"""
+Cache HTTP (ETag e GET condicional) da API HLTV Expandido
+
+O ETag de cada recurso é derivado da versão dos dados e da rota + parâmetros,
+então clientes que repetem a consulta com `If-None-Match` recebem
+`304 Not Modified` sem que a rota acesse o banco ou serialize o JSON.
+"""
+
+import hashlib
+import os
+import re
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.cache import EXCLUDED_PREFIXES, cache_key
+from app.data_version import DataStamp, data_version
+
+# Identificador da versão do código; muda o ETag quando o formato das respostas muda
+ETAG_SALT = os.getenv("ETAG_SALT", "1.0.0")
+
+# Cache-Control por recurso (primeira regra que casar com o caminho)
+CACHE_CONTROL_RULES = [
+    (re.compile(r"^/teams/?$"), "public, max-age=30, must-revalidate"),
+    (re.compile(r"^/teams/\d+$"), "public, max-age=60, must-revalidate"),
+    (re.compile(r"^/teams/compare$"), "public, max-age=60, must-revalidate"),
+    (re.compile(r"^/players/\d+$"), "public, max-age=60, must-revalidate"),
+    (re.compile(r"^/leaderboards/\w+$"), "public, max-age=60, must-revalidate"),
+]
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+
+def build_etag(stamp: DataStamp, key: str) -> str:
+    """ETag forte a partir da versão dos dados e da chave da requisição"""
+    digest = hashlib.sha1(f"{ETAG_SALT}:{key}".encode()).hexdigest()[:16]
+    return f'"{stamp.version}-{digest}"'
+
+
+def last_modified(stamp: DataStamp) -> Optional[str]:
+    if stamp.updated_at is None:
+        return None
+    return format_datetime(stamp.updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def cache_control_for(path: str) -> str:
+    for pattern, value in CACHE_CONTROL_RULES:
+        if pattern.match(path):
+            return value
+    return DEFAULT_CACHE_CONTROL
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca do If-None-Match, como define a RFC 9110"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified_since(if_modified_since: str, stamp: DataStamp) -> bool:
+    if stamp.updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    modified = stamp.updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified <= since
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware que adiciona `ETag`, `Last-Modified` e `Cache-Control` às
+    respostas GET e responde `304 Not Modified` quando o cliente já tem a
+    versão atual (`If-None-Match` ou `If-Modified-Since`).
+    """
+
+    def __init__(self, app, exclude_prefixes=EXCLUDED_PREFIXES):
+        super().__init__(app)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def dispatch(self, request, call_next):
+        if request.method != "GET" or request.url.path.startswith(self.exclude_prefixes):
+            return await call_next(request)
+
+        stamp = data_version.peek() or await data_version.get()
+        if stamp is None:
+            return await call_next(request)
+
+        etag = build_etag(stamp, cache_key(request))
+        headers = {"ETag": etag, "Cache-Control": cache_control_for(request.url.path)}
+        modified = last_modified(stamp)
+        if modified:
+            headers["Last-Modified"] = modified
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None and if_none_match.strip() == "*":
+            # O curinga só casa se o recurso existe (RFC 9110 §13.1.2): decide depois da rota, sem 304 para 404
+            response = await call_next(request)
+            if response.status_code == 200:
+                return Response(status_code=304, headers=headers)
+            return response
+        if if_none_match is not None:
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+        elif if_modified_since and not_modified_since(if_modified_since, stamp):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
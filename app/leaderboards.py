@@ -0,0 +1,154 @@
+"""
+Leaderboards de jogadores (rating, K/D, ADR e headshot%)
+
+No Postgres os dados ficam na materialized view `player_leaderboard`, que já
+traz o join de jogador, time e estatísticas e a posição global em cada métrica
+(`rank()`), com um índice por métrica. O scraper atualiza a view ao fim de cada
+coleta. Em outros bancos a mesma consulta é usada como subquery.
+"""
+
+from sqlalchemy import Float, Integer, String, column, func, select, table
+
+from app import models
+from app.logger import logger
+
+LEADERBOARD_VIEW = "player_leaderboard"
+
+# Métrica da URL -> coluna de PlayerStats
+LEADERBOARD_METRICS = {
+    "rating": "rating",
+    "kd": "kd_ratio",
+    "adr": "damage_per_round",
+    "headshots": "headshot_percentage",
+}
+
+
+def leaderboard_select():
+    """Jogadores com estatísticas, time e posição global em cada métrica"""
+    stats = models.PlayerStats
+    metric_columns = [getattr(stats, name) for name in LEADERBOARD_METRICS.values()]
+    ranks = [
+        func.rank().over(order_by=metric.desc().nulls_last()).label(f"{metric.key}_rank")
+        for metric in metric_columns
+    ]
+    return (
+        select(
+            stats.player_id,
+            models.Player.nickname,
+            models.Player.role,
+            models.Player.team_id,
+            models.Team.name.label("team_name"),
+            stats.country,
+            stats.picture,
+            stats.maps_played,
+            *metric_columns,
+            *ranks,
+        )
+        .join(models.Player, models.Player.id == stats.player_id)
+        .outerjoin(models.Team, models.Team.id == models.Player.team_id)
+    )
+
+
+def _view_definition() -> str:
+    from sqlalchemy.dialects import postgresql
+
+    return str(leaderboard_select().compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def leaderboard_view_ddl() -> list:
+    statements = [f"CREATE MATERIALIZED VIEW IF NOT EXISTS {LEADERBOARD_VIEW} AS {_view_definition()}"]
+    # Índice único exigido pelo REFRESH ... CONCURRENTLY
+    statements.append(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{LEADERBOARD_VIEW}_player_id ON {LEADERBOARD_VIEW} (player_id)"
+    )
+    for metric in LEADERBOARD_METRICS.values():
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS ix_{LEADERBOARD_VIEW}_{metric} "
+            f"ON {LEADERBOARD_VIEW} ({metric} DESC NULLS LAST, player_id)"
+        )
+    return statements
+
+
+def create_leaderboard_view(connection):
+    """Cria a materialized view e seus índices se ainda não existirem (apenas Postgres)"""
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in leaderboard_view_ddl():
+        connection.exec_driver_sql(statement)
+
+
+def refresh_leaderboards(session):
+    """
+    Recalcula a materialized view com os dados da última coleta.
+    Deve ser chamada pelo scraper ao fim de cada coleta.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    try:
+        with bind.begin() as connection:
+            create_leaderboard_view(connection)
+            connection.exec_driver_sql(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {LEADERBOARD_VIEW}")
+        logger.info("🏅 Leaderboards atualizados")
+    except Exception as e:
+        logger.error("❌ Erro ao atualizar leaderboards: %s", e)
+
+
+_view = table(
+    LEADERBOARD_VIEW,
+    column("player_id", Integer),
+    column("nickname", String),
+    column("role", String),
+    column("team_id", Integer),
+    column("team_name", String),
+    column("country", String),
+    column("picture", String),
+    column("maps_played", Integer),
+    *(column(metric, Float) for metric in LEADERBOARD_METRICS.values()),
+    *(column(f"{metric}_rank", Integer) for metric in LEADERBOARD_METRICS.values()),
+)
+
+
+def leaderboard_source(dialect_name: str):
+    """Materialized view no Postgres; a consulta equivalente como subquery nos demais bancos"""
+    if dialect_name == "postgresql":
+        return _view
+    return leaderboard_select().subquery(LEADERBOARD_VIEW)
+
+
+def leaderboard_query(dialect_name: str, metric: str, role=None, country=None, team_id=None,
+                      min_maps_played=None, limit: int = 20):
+    """
+    Top `limit` jogadores na métrica, com a posição (`rank()`) calculada entre os
+    jogadores que passam pelos filtros e a posição global pré-calculada.
+    """
+    source = leaderboard_source(dialect_name)
+    value = source.c[LEADERBOARD_METRICS[metric]]
+    # Mesma ordenação dos índices da view, para o Postgres ler o índice em vez de ordenar
+    ordering = value.desc().nulls_last()
+
+    query = select(
+        func.rank().over(order_by=ordering).label("rank"),
+        source.c[f"{LEADERBOARD_METRICS[metric]}_rank"].label("global_rank"),
+        source.c.player_id,
+        source.c.nickname,
+        source.c.role,
+        source.c.team_id,
+        source.c.team_name,
+        source.c.country,
+        source.c.picture,
+        source.c.maps_played,
+        value.label("value"),
+    ).filter(value.isnot(None))
+
+    if role:
+        query = query.filter(source.c.role == role)
+    if country:
+        query = query.filter(source.c.country == country)
+    if team_id:
+        query = query.filter(source.c.team_id == team_id)
+    if min_maps_played:
+        query = query.filter(source.c.maps_played >= min_maps_played)
+
+    return query.order_by(ordering, source.c.player_id).limit(limit)
@@ -1,16 +1,131 @@
+"""
+Configuração de logging
+
+Os registros entram em uma fila (`QueueHandler`) e são formatados e escritos
+por uma thread (`QueueListener`), fora do laço do scraper e das requisições.
+Campos passados em `extra` (ids das entidades, durações) viram chave=valor no
+formato texto ou chaves próprias no formato JSON.
+
+Variáveis de ambiente:
+- LOG_LEVEL: nível padrão (INFO)
+- LOG_LEVELS: níveis por logger, ex: "app.scraper=DEBUG,sqlalchemy.engine=INFO"
+- LOG_FORMAT: "text" (padrão) ou "json" (um objeto por linha)
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),  # Mostra no terminal também
-    ],
-)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
+# Atributos de todo LogRecord; o que sobra veio de `extra`
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+# Argumentos que podem ser formatados mais tarde, na thread do listener
+IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """Campos estruturados passados em `extra`"""
+    return {key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES}
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legível, com os campos de `extra` ao fim da linha"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = record_fields(record)
+        if fields:
+            line += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **record_fields(record),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enfileira o registro sem formatar a mensagem (o `QueueHandler` padrão formata
+    na thread de quem loga). Só antecipa a formatação quando algum argumento é
+    mutável e poderia mudar antes de ser escrito.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Um dicionário em `args` pode ser o próprio argumento (logger.info("%s", d)), sempre mutável
+        args = record.args or ()
+        if isinstance(args, dict) or not all(isinstance(arg, IMMUTABLE_TYPES) for arg in args):
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
+def parse_levels(raw: str) -> dict:
+    """"app.scraper=DEBUG,alembic=WARNING" -> {"app.scraper": "DEBUG", "alembic": "WARNING"}"""
+    levels = {}
+    for item in raw.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> QueueListener:
+    handler = logging.StreamHandler(sys.stdout)  # Mostra no terminal também
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+
+    # Esconde o registro dos plugins do Alembic, logado a cada migração
+    logging.getLogger("alembic.runtime.plugins").setLevel(logging.WARNING)
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener.start()
+    # Esvazia a fila antes de o processo terminar
+    atexit.register(listener.stop)
+    return listener
+
+
+listener = configure_logging()
 
 logger = logging.getLogger("cs2_scraper")
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger de um módulo (`__name__`), com nível ajustável por LOG_LEVELS"""
+    if name == "__main__":
+        # Módulo executado com `python -m`: usa o nome real (ex: app.scraper)
+        spec = getattr(sys.modules["__main__"], "__spec__", None)
+        name = spec.name if spec else name
+    return logging.getLogger(name)
@@ -1,11 +1,27 @@
 from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import Body, FastAPI, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import String, cast, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.middleware.cors import CORSMiddleware
-
-from app import models, banco
-from swagger_docs import custom_openapi
+from starlette.responses import StreamingResponse
+
+from app import models, banco, serializers
+from app.cache import ResponseCacheMiddleware
+from app.export import EXPORT_FORMATS, EXPORT_TABLES, stream_export
+from app.fieldsets import parse_fieldset, parse_include
+from app.http_cache import ConditionalGetMiddleware
+from app.leaderboards import LEADERBOARD_METRICS, leaderboard_query
+from app.metrics import QueryMetricsMiddleware, latency_tracker
+from app.pagination import PLAYER_ORDER, PLAYER_STATS_ORDER, TEAM_SORTS, KeysetOrder, paginate
+from app.profiling import ProfilingMiddleware
+from app.rosters import ROSTER_FORMATS, build_roster_summary, render_roster_summary, roster_summary_query
+from app.search import (
+    PLAYER_SEARCH_COLUMNS, SEARCH_MAX_LIMIT, TEAM_SEARCH_COLUMNS, autocomplete, icontains, ranked_search,
+)
+from app.serializers import FastJSONResponse, json_response
+from app.swagger_docs import custom_openapi
 
 app = FastAPI(
     title="Sistema HLTV Expandido API",
@@ -13,9 +29,20 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse
 )
 
+# Cache de respostas invalidado pela versão dos dados (fica dentro do CORS
+# para que os headers de origem não sejam guardados junto com a resposta)
+app.add_middleware(ResponseCacheMiddleware)
+
+# ETag / Last-Modified e respostas 304 para GETs condicionais
+app.add_middleware(ConditionalGetMiddleware)
+
+# Profile da requisição com `X-Profile: <PROFILING_TOKEN>` (fora dos caches, dentro do CORS)
+app.add_middleware(ProfilingMiddleware)
+
 origins = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
@@ -27,218 +54,304 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "Server-Timing", "X-DB-Queries", "X-Cache", "ETag", "Last-Modified", "X-Next-Cursor", "Link",
+        "X-Profiled-Status", "X-Profile-Duration-Ms",
+    ],
 )
 
+# Contagem de queries e tempo de banco por requisição (o engine é instrumentado ao ser criado)
+app.add_middleware(QueryMetricsMiddleware)
+
 # Configurar documentação customizada
 app.openapi = lambda: custom_openapi(app)
 
 
-def get_db():
-    db = banco.SessionLocal()
-    try:
+async def get_db():
+    async with banco.AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+# Quantidade máxima de ids por consulta em lote
+BATCH_MAX_IDS = 200
+
+
+def parse_ids(raw) -> List[int]:
+    """Converte `ids` (lista ou texto separado por vírgulas) em ids únicos na ordem pedida"""
+    values = raw.split(",") if isinstance(raw, str) else raw
+    try:
+        ids = list(dict.fromkeys(int(value) for value in values if str(value).strip()))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Parâmetro 'ids' deve conter apenas números inteiros")
+
+    if not ids:
+        raise HTTPException(status_code=400, detail="Informe ao menos um id")
+    if len(ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {BATCH_MAX_IDS} ids por consulta")
+    return ids
+
+
+async def fetch_teams_batch(db: AsyncSession, ids: List[int]) -> dict:
+    """Times detalhados indexados por id (`null` para ids inexistentes), com número fixo de queries"""
+    teams = (await db.scalars(
+        select(models.Team)
+        .options(
+            selectinload(models.Team.players).joinedload(models.Player.stats),
+            selectinload(models.Team.map_stats),
+            selectinload(models.Team.achievements),
+        )
+        .filter(models.Team.id.in_(ids))
+    )).all()
+    found = {team.id: serializers.team_detail(team) for team in teams}
+    return {team_id: found.get(team_id) for team_id in ids}
+
+
+async def fetch_players_batch(db: AsyncSession, ids: List[int]) -> dict:
+    """Jogadores detalhados indexados por id (`null` para ids inexistentes), com número fixo de queries"""
+    players = (await db.scalars(
+        select(models.Player)
+        .options(
+            joinedload(models.Player.team),
+            joinedload(models.Player.stats),
+            selectinload(models.Player.achievements),
+        )
+        .filter(models.Player.id.in_(ids))
+    )).all()
+    found = {player.id: serializers.player_detail(player) for player in players}
+    return {player_id: found.get(player_id) for player_id in ids}
 
 
 @app.get("/", tags=["Home"])
-def read_home():
+async def read_home():
     """Endpoint de boas-vindas da API"""
     return {"message": "Bem-vindo à API do Sistema HLTV"}
 
 
 # Rotas para Times
 @app.get("/teams/", tags=["Teams"], response_model=List[dict])
-def read_teams(
+async def read_teams(
+        request: Request,
+        response: Response,
         skip: int = 0,
         limit: int = 20,
         search: Optional[str] = None,
-        db: Session = Depends(get_db)
+        region: Optional[str] = None,
+        min_average_rating: Optional[float] = None,
+        min_average_maps_played: Optional[float] = None,
+        sort: str = "ranking",
+        cursor: Optional[str] = None,
+        include: Optional[str] = None,
+        fields_team: Optional[str] = Query(None, alias="fields[team]"),
+        fields_player: Optional[str] = Query(None, alias="fields[player]"),
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retorna uma lista de todos os times.
+    Retorna uma lista de todos os times, ordenados por ranking ou pela força do elenco.
 
     - **skip**: Número de registros a pular (paginação)
     - **limit**: Número máximo de registros a retornar
+    - **region**: Filtrar por região
+    - **min_average_rating**: Rating médio mínimo do elenco
+    - **min_average_maps_played**: Média mínima de mapas jogados pelo elenco
+    - **sort**: `ranking` (padrão) ou um agregado do elenco, do maior para o menor
+      (`average_rating`, `median_rating`, `average_kd_ratio`, `average_damage_per_round`,
+      `average_player_age`, `average_maps_played`)
+    - **cursor**: Cursor da próxima página (header `X-Next-Cursor` da resposta anterior)
+    - **include**: Relacionamentos embutidos (`players`, `achievements`; padrão: ambos)
+    - **fields[team]**: Campos do time a retornar (ex: `name,ranking`)
+    - **fields[player]**: Campos dos jogadores a retornar (ex: `nickname,rating`)
     """
-    query = db.query(models.Team)
+    if sort not in TEAM_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ordenação inválida: {sort}. Use uma de: {', '.join(TEAM_SORTS)}"
+        )
+    include = parse_include(include, serializers.TEAM_LIST_INCLUDES, serializers.TEAM_LIST_INCLUDES)
+    team_fields = parse_fieldset("team", fields_team, serializers.TEAM_LIST_FIELDS)
+    player_fields = parse_fieldset("player", fields_player, serializers.TEAM_PLAYER_FIELDS)
+
+    # Só carrega os relacionamentos que vão aparecer na resposta
+    options = []
+    if "players" in include:
+        players = selectinload(models.Team.players)
+        if player_fields.wants_any(serializers.TEAM_PLAYER_STATS_FIELDS):
+            players = players.joinedload(models.Player.stats)
+        options.append(players)
+    if "achievements" in include:
+        options.append(selectinload(models.Team.achievements))
+
+    query = select(models.Team).options(*options)
 
     if search:
-        query = query.filter(
-            models.Team.name.ilike(f"%{search}%")
-        )
+        query = query.filter(icontains(TEAM_SEARCH_COLUMNS, search))
+    if region:
+        query = query.filter(models.Team.region == region)
+    if min_average_rating is not None:
+        query = query.filter(models.Team.average_rating >= min_average_rating)
+    if min_average_maps_played is not None:
+        query = query.filter(models.Team.average_maps_played >= min_average_maps_played)
+
+    teams = await paginate(db, query, TEAM_SORTS[sort], request, response, skip, limit, cursor)
+    return json_response(
+        [serializers.team_list_item(team, include, team_fields, player_fields) for team in teams],
+        response
+    )
+
+
+# Rotas de busca (registradas antes de /teams/{team_id} para não serem capturadas por ela)
+@app.get("/teams/search", tags=["Teams"])
+async def search_teams(
+        name: Optional[str] = None,
+        ranking_min: Optional[int] = None,
+        ranking_max: Optional[int] = None,
+        limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca times por critérios específicos, ordenados por relevância.
+
+    - **name**: Busca aproximada por nome (tolera erros de digitação)
+    - **ranking_min**: Ranking mínimo
+    - **ranking_max**: Ranking máximo
+    - **limit**: Número máximo de resultados
+    """
+    query = select(models.Team)
+
+    if name:
+        query = ranked_search(query, TEAM_SEARCH_COLUMNS, name, models.ranking_position(models.Team.ranking))
+    else:
+        query = query.order_by(models.ranking_position(models.Team.ranking))
+
+    if ranking_min:
+        query = query.filter(models.Team.ranking >= ranking_min)
+
+    if ranking_max:
+        query = query.filter(models.Team.ranking <= ranking_max)
+
+    teams = (await db.scalars(query.limit(limit))).all()
+
+    return json_response([serializers.team_summary(team) for team in teams])
+
+
+@app.get("/teams/autocomplete", tags=["Teams"])
+async def autocomplete_teams(
+        q: str = Query(..., min_length=1),
+        limit: int = Query(10, ge=1, le=SEARCH_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Sugestões de times pelo início do nome (type-ahead).
+
+    - **q**: Prefixo digitado
+    - **limit**: Número máximo de sugestões
+    """
+    return json_response(await autocomplete(db, "teams", q, limit))
+
+
+@app.get("/teams/batch", tags=["Teams"])
+async def read_teams_batch(ids: str, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna vários times de uma vez, indexados por id.
+
+    - **ids**: IDs dos times separados por vírgula (ex: `1,2,3`)
+    """
+    return json_response(await fetch_teams_batch(db, parse_ids(ids)))
+
+
+@app.post("/teams/batch", tags=["Teams"])
+async def read_teams_batch_post(ids: List[int] = Body(..., embed=True), db: AsyncSession = Depends(get_db)):
+    """
+    Versão POST da consulta em lote de times, para listas longas de ids.
+
+    - **ids**: Lista de IDs no corpo (`{"ids": [1, 2, 3]}`)
+    """
+    return json_response(await fetch_teams_batch(db, parse_ids(ids)))
+
 
-    teams = query.offset(skip).limit(limit).all()
-    return [
-        {
-            "id": team.id,
-            "name": team.name,
-            "url": team.url,
-            "ranking": team.ranking,
-            "points": team.points,
-            "logo_url": team.logo_url,
-            "coach_name": team.coach_name,
-            "region": team.region,
-            "win_rate": team.win_rate,
-            "players": [
-                {
-                    "nickname": player.nickname,
-                    "picture": player.stats.picture,
-                    "rating": player.stats.rating,
-                    "kd_ratio": player.stats.kd_ratio,
-                    "damage_per_round": player.stats.damage_per_round,
-                }
-                for player in team.players
-            ],
-            "achievements": [
-                {
-                    "id": achievement.id,
-                    "title": achievement.title,
-                    "event_name": achievement.event_name,
-                    "year": achievement.year,
-                    "placement": achievement.placement,
-                    "prize_money": achievement.prize_money,
-                    "trophy_image_url": achievement.trophy_image_url,
-                    "event_tier": achievement.event_tier
-                }
-                for achievement in team.achievements
-            ]
-        }
-        for team in teams
-    ]
+@app.get("/teams/compare", tags=["Teams"])
+async def compare_teams(
+        a: int,
+        b: int,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Compara os map pools de dois times, mapa a mapa.
+
+    - **a**: ID do primeiro time
+    - **b**: ID do segundo time
+
+    `delta` é a diferença (time A - time B) de win rate, win rate de rounds e
+    win rate nos lados CT e T. `veto_preference` lista os mapas do mais
+    favorável (pick) ao menos favorável (ban) para cada time.
+    """
+    # Módulos com NumPy (map_pool, analytics, similarity) são importados nas rotas
+    # que os usam, para não pesar na inicialização da API
+    from app.map_pool import compare_map_pools, map_pool_query
+
+    if a == b:
+        raise HTTPException(status_code=400, detail="Informe dois times diferentes")
+
+    rows = (await db.execute(map_pool_query(a, b))).all()
+    comparison = compare_map_pools(a, b, rows)
+    if comparison is None:
+        raise HTTPException(status_code=404, detail="Time não encontrado")
+    return json_response(comparison)
 
 
 @app.get("/teams/{team_id}", tags=["Teams"])
-def read_team(team_id: int, db: Session = Depends(get_db)):
+async def read_team(team_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna informações detalhadas de um time específico incluindo estatísticas de mapas.
 
     - **team_id**: ID do time
     """
-    team = db.query(models.Team).filter(models.Team.id == team_id).first()
+    team = await db.scalar(
+        select(models.Team)
+        .options(
+            selectinload(models.Team.players).joinedload(models.Player.stats),
+            selectinload(models.Team.map_stats),
+            selectinload(models.Team.achievements),
+        )
+        .filter(models.Team.id == team_id)
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
 
-    return {
-        "id": team.id,
-        "name": team.name,
-        "url": team.url,
-        "ranking": team.ranking,
-        "points": team.points,
-        "logo_url": team.logo_url,
-        "region": team.region,
-        "win_rate": team.win_rate,
-        "weeks_in_top30": team.weeks_in_top30,
-        "average_player_age": team.average_player_age,
-        "coach_name": team.coach_name,
-        "peak_ranking": team.peak_ranking,
-        "time_at_peak": team.time_at_peak,
-        "players": [
-            {
-                "id": player.id,
-                "nickname": player.nickname,
-                "role": player.role,
-                "picture": player.stats.picture if player.stats else None
-            }
-            for player in team.players
-        ],
-        "map_stats": [
-            {
-                "map_name": stat.map_name,
-                "matches_played": stat.matches_played,
-                "matches_won": stat.matches_won,
-                "win_rate": stat.win_rate,
-                "rounds_played": stat.rounds_played,
-                "rounds_won": stat.rounds_won,
-                "round_win_rate": stat.round_win_rate,
-                "ct_rounds_won": stat.ct_rounds_won,
-                "t_rounds_won": stat.t_rounds_won,
-                "ct_win_rate": stat.ct_win_rate,
-                "t_win_rate": stat.t_win_rate
-            }
-            for stat in team.map_stats
-        ],
-        "achievements": [
-            {
-                "id": achievement.id,
-                "title": achievement.title,
-                "event_name": achievement.event_name,
-                "year": achievement.year,
-                "placement": achievement.placement,
-                "prize_money": achievement.prize_money,
-                "trophy_image_url": achievement.trophy_image_url,
-                "event_tier": achievement.event_tier
-            }
-            for achievement in team.achievements
-        ]
-    }
+    return json_response(serializers.team_detail(team))
 
 
 @app.get("/teams/{team_id}/players", tags=["Teams"])
-def read_team_players(team_id: int, db: Session = Depends(get_db)):
+async def read_team_players(team_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna todos os jogadores de um time específico com estatísticas completas.
 
     - **team_id**: ID do time
     """
-    team = db.query(models.Team).filter(models.Team.id == team_id).first()
+    team = await db.scalar(
+        select(models.Team)
+        .options(
+            selectinload(models.Team.players).joinedload(models.Player.stats),
+            selectinload(models.Team.players).selectinload(models.Player.achievements),
+        )
+        .filter(models.Team.id == team_id)
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
 
-    return [
-        {
-            "id": player.id,
-            "nickname": player.nickname,
-            "real_name": player.real_name,
-            "url": player.url,
-            "role": player.role,
-            "team_id": player.team_id,
-            "team_name": team.name,
-            "stats": {
-                "picture": player.stats.picture if player.stats else None,
-                "country": player.stats.country if player.stats else None,
-                "age": player.stats.age if player.stats else None,
-                "total_kills": player.stats.total_kills if player.stats else None,
-                "total_deaths": player.stats.total_deaths if player.stats else None,
-                "headshot_percentage": player.stats.headshot_percentage if player.stats else None,
-                "kd_ratio": player.stats.kd_ratio if player.stats else None,
-                "damage_per_round": player.stats.damage_per_round if player.stats else None,
-                "grenade_damage_per_round": player.stats.grenade_damage_per_round if player.stats else None,
-                "maps_played": player.stats.maps_played if player.stats else None,
-                "rounds_played": player.stats.rounds_played if player.stats else None,
-                "kills_per_round": player.stats.kills_per_round if player.stats else None,
-                "assists_per_round": player.stats.assists_per_round if player.stats else None,
-                "deaths_per_round": player.stats.deaths_per_round if player.stats else None,
-                "saved_by_teammate_per_round": player.stats.saved_by_teammate_per_round if player.stats else None,
-                "saved_teammates_per_round": player.stats.saved_teammates_per_round if player.stats else None,
-                "rating": player.stats.rating if player.stats else None,
-                "last_updated": player.stats.last_updated.isoformat() if player.stats and player.stats.last_updated else None
-            },
-            "achievements": [
-                {
-                    "id": achievement.id,
-                    "title": achievement.title,
-                    "event_name": achievement.event_name,
-                    "year": achievement.year,
-                    "placement": achievement.placement,
-                    "prize_money": achievement.prize_money,
-                    "trophy_image_url": achievement.trophy_image_url,
-                    "event_tier": achievement.event_tier,
-                    "mvp_award": achievement.mvp_award
-                }
-                for achievement in player.achievements
-            ] if player.achievements else []
-        }
-        for player in team.players
-    ]
+    return json_response([serializers.player_detail(player, team.name) for player in team.players])
 
 
 @app.get("/players/", tags=["Players"])
-def read_players(
+async def read_players(
+        request: Request,
+        response: Response,
         skip: int = 0,
         limit: int = 20,
         search: Optional[str] = None,
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = None,
+        include: Optional[str] = None,
+        fields_player: Optional[str] = Query(None, alias="fields[player]"),
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retorna uma lista de todos os jogadores com estatísticas básicas.
@@ -247,418 +360,488 @@ def read_players(
     - **skip**: Número de registros a pular (paginação)
     - **limit**: Número máximo de registros a retornar
     - **search**: Texto para buscar no nickname (opcional)
+    - **cursor**: Cursor da próxima página (header `X-Next-Cursor` da resposta anterior)
+    - **include**: Relacionamentos embutidos (`achievements`; padrão: `achievements`)
+    - **fields[player]**: Campos a retornar (ex: `nickname,rating`; campos de `stats` podem ser pedidos diretamente)
     """
-    # Cria a query base
-    query = db.query(models.Player)
+    include = parse_include(include, serializers.PLAYER_LIST_INCLUDES, serializers.PLAYER_LIST_INCLUDES)
+    player_fields = parse_fieldset("player", fields_player, serializers.PLAYER_LIST_FIELDS)
+
+    # Cria a query base, carregando só os relacionamentos usados na resposta
+    options = []
+    if "team_name" in player_fields:
+        options.append(joinedload(models.Player.team))
+    if player_fields.wants_any(serializers.STATS_SUMMARY_FIELDS + ("stats",)):
+        options.append(joinedload(models.Player.stats))
+    if "achievements" in include:
+        options.append(selectinload(models.Player.achievements))
+
+    query = select(models.Player).options(*options)
 
     # Aplica o filtro de busca se o parâmetro foi fornecido
     if search:
-        query = query.filter(
-            models.Player.nickname.ilike(f"%{search}%") |
-            models.Player.real_name.ilike(f"%{search}%")
-        )
+        query = query.filter(icontains(PLAYER_SEARCH_COLUMNS, search))
+
+    # Aplica ordenação estável e paginação
+    players = await paginate(db, query, PLAYER_ORDER, request, response, skip, limit, cursor)
+
+    return json_response(
+        [serializers.player_list_item(player, include, player_fields) for player in players],
+        response
+    )
+
+
+# Rotas de busca (registradas antes de /players/{player_id} para não serem capturadas por ela)
+@app.get("/players/search", tags=["Players"])
+async def search_players(
+        nickname: Optional[str] = None,
+        team_id: Optional[int] = None,
+        role: Optional[str] = None,
+        limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca jogadores por critérios específicos, ordenados por relevância.
+
+    - **nickname**: Busca aproximada por apelido ou nome real (tolera erros de digitação)
+    - **team_id**: Filtra por ID do time
+    - **role**: Filtra por função (player, coach, etc.)
+    - **limit**: Número máximo de resultados
+    """
+    query = select(models.Player).options(joinedload(models.Player.team))
+
+    if nickname:
+        query = ranked_search(query, PLAYER_SEARCH_COLUMNS, nickname, models.Player.id)
+    else:
+        query = query.order_by(models.Player.id)
+
+    if team_id:
+        query = query.filter(models.Player.team_id == team_id)
+
+    if role:
+        query = query.filter(models.Player.role == role)
+
+    players = (await db.scalars(query.limit(limit))).all()
+
+    return json_response([serializers.player_summary(player) for player in players])
+
+
+@app.get("/players/autocomplete", tags=["Players"])
+async def autocomplete_players(
+        q: str = Query(..., min_length=1),
+        limit: int = Query(10, ge=1, le=SEARCH_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Sugestões de jogadores pelo início do apelido ou de uma palavra do nome real (type-ahead).
+
+    - **q**: Prefixo digitado
+    - **limit**: Número máximo de sugestões
+    """
+    return json_response(await autocomplete(db, "players", q, limit))
+
+
+@app.get("/players/batch", tags=["Players"])
+async def read_players_batch(ids: str, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna vários jogadores de uma vez, indexados por id.
+
+    - **ids**: IDs dos jogadores separados por vírgula (ex: `1,2,3`)
+    """
+    return json_response(await fetch_players_batch(db, parse_ids(ids)))
+
+
+@app.post("/players/batch", tags=["Players"])
+async def read_players_batch_post(ids: List[int] = Body(..., embed=True), db: AsyncSession = Depends(get_db)):
+    """
+    Versão POST da consulta em lote de jogadores, para listas longas de ids.
 
-    # Aplica paginação
-    players = query.offset(skip).limit(limit).all()
-
-    return [
-        {
-            "id": player.id,
-            "nickname": player.nickname,
-            "real_name": player.real_name,
-            "url": player.url,
-            "role": player.role,
-            "team_id": player.team_id,
-            "team_name": player.team.name if player.team else None,
-            "stats": {
-                "rating": player.stats.rating if player.stats else None,
-                "kd_ratio": player.stats.kd_ratio if player.stats else None,
-                "headshot_percentage": player.stats.headshot_percentage if player.stats else None,
-                "damage_per_round": player.stats.damage_per_round if player.stats else None,
-                "maps_played": player.stats.maps_played if player.stats else None,
-                "country": player.stats.country if player.stats else None,
-                "picture": player.stats.picture if player.stats else None,
-            },
-            "achievements": [
-                {
-                    "id": achievement.id,
-                    "title": achievement.title,
-                    "event_name": achievement.event_name,
-                    "year": achievement.year,
-                    "placement": achievement.placement,
-                    "prize_money": achievement.prize_money,
-                    "trophy_image_url": achievement.trophy_image_url,
-                    "event_tier": achievement.event_tier,
-                    "mvp_award": achievement.mvp_award
-                }
-                for achievement in player.achievements
-            ]
-        }
-        for player in players
-    ]
+    - **ids**: Lista de IDs no corpo (`{"ids": [1, 2, 3]}`)
+    """
+    return json_response(await fetch_players_batch(db, parse_ids(ids)))
 
 
 @app.get("/players/{player_id}", tags=["Players"])
-def read_player(player_id: int, db: Session = Depends(get_db)):
+async def read_player(player_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna informações detalhadas de um jogador específico.
 
     - **player_id**: ID do jogador
     """
-    player = db.query(models.Player).filter(models.Player.id == player_id).first()
+    player = await db.scalar(
+        select(models.Player)
+        .options(
+            joinedload(models.Player.team),
+            joinedload(models.Player.stats),
+            selectinload(models.Player.achievements),
+        )
+        .filter(models.Player.id == player_id)
+    )
     if not player:
         raise HTTPException(status_code=404, detail="Jogador não encontrado")
 
-    return {
-        "id": player.id,
-        "nickname": player.nickname,
-        "real_name": player.real_name,
-        "url": player.url,
-        "role": player.role,
-        "team_id": player.team_id,
-        "team_name": player.team.name if player.team else None,
-        "stats": {
-                "picture": player.stats.picture if player.stats else None,
-                "country": player.stats.country if player.stats else None,
-                "age": player.stats.age if player.stats else None,
-                "total_kills": player.stats.total_kills if player.stats else None,
-                "total_deaths": player.stats.total_deaths if player.stats else None,
-                "headshot_percentage": player.stats.headshot_percentage if player.stats else None,
-                "kd_ratio": player.stats.kd_ratio if player.stats else None,
-                "damage_per_round": player.stats.damage_per_round if player.stats else None,
-                "grenade_damage_per_round": player.stats.grenade_damage_per_round if player.stats else None,
-                "maps_played": player.stats.maps_played if player.stats else None,
-                "rounds_played": player.stats.rounds_played if player.stats else None,
-                "kills_per_round": player.stats.kills_per_round if player.stats else None,
-                "assists_per_round": player.stats.assists_per_round if player.stats else None,
-                "deaths_per_round": player.stats.deaths_per_round if player.stats else None,
-                "saved_by_teammate_per_round": player.stats.saved_by_teammate_per_round if player.stats else None,
-                "saved_teammates_per_round": player.stats.saved_teammates_per_round if player.stats else None,
-                "rating": player.stats.rating if player.stats else None,
-                "last_updated": player.stats.last_updated.isoformat() if player.stats and player.stats.last_updated else None
-            },
-        "achievements": [
-            {
-                "id": achievement.id,
-                "title": achievement.title,
-                "event_name": achievement.event_name,
-                "year": achievement.year,
-                "placement": achievement.placement,
-                "prize_money": achievement.prize_money,
-                "trophy_image_url": achievement.trophy_image_url,
-                "event_tier": achievement.event_tier,
-                "mvp_award": achievement.mvp_award
-            }
-            for achievement in player.achievements
-        ]
-    }
+    return json_response(serializers.player_detail(player))
 
 
 @app.get("/players/{player_id}/stats", tags=["Player Stats"])
-def read_player_stats(player_id: int, db: Session = Depends(get_db)):
+async def read_player_stats(player_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna as estatísticas detalhadas de um jogador específico.
 
     - **player_id**: ID do jogador
     """
-    player = db.query(models.Player).filter(models.Player.id == player_id).first()
+    player = await db.scalar(
+        select(models.Player)
+        .options(joinedload(models.Player.stats))
+        .filter(models.Player.id == player_id)
+    )
     if not player:
         raise HTTPException(status_code=404, detail="Jogador não encontrado")
 
     if not player.stats:
         raise HTTPException(status_code=404, detail="Estatísticas não encontradas para este jogador")
 
-    stats = player.stats
-    return {
-        "player_id": player.id,
-        "player_nickname": player.nickname,
-        "picture": stats.picture,
-        "country": stats.country,
-        "age": stats.age,
-        "total_kills": stats.total_kills,
-        "total_deaths": stats.total_deaths,
-        "headshot_percentage": stats.headshot_percentage,
-        "kd_ratio": stats.kd_ratio,
-        "damage_per_round": stats.damage_per_round,
-        "grenade_damage_per_round": stats.grenade_damage_per_round,
-        "maps_played": stats.maps_played,
-        "rounds_played": stats.rounds_played,
-        "kills_per_round": stats.kills_per_round,
-        "assists_per_round": stats.assists_per_round,
-        "deaths_per_round": stats.deaths_per_round,
-        "saved_by_teammate_per_round": stats.saved_by_teammate_per_round,
-        "saved_teammates_per_round": stats.saved_teammates_per_round,
-        "rating": stats.rating,
-        "last_updated": stats.last_updated
-    }
+    return json_response(serializers.player_stats_item(player.stats, player.nickname))
+
+
+@app.get("/players/{player_id}/percentiles", tags=["Player Stats"])
+async def read_player_percentiles(player_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna o percentil e o z-score de cada métrica do jogador em relação a todos os jogadores.
+
+    - **player_id**: ID do jogador
+    """
+    from app.analytics import stats_snapshot
+
+    snapshot = await stats_snapshot.get(db)
+    percentiles = snapshot.player_percentiles(player_id)
+    if percentiles is None:
+        raise HTTPException(status_code=404, detail="Estatísticas não encontradas para este jogador")
+
+    return json_response(percentiles)
+
+
+@app.get("/players/{player_id}/similar", tags=["Player Stats"])
+async def read_similar_players(
+        player_id: int,
+        k: int = Query(10, ge=1, le=100),
+        metric: str = "euclidean",
+        role: Optional[str] = None,
+        country: Optional[str] = None,
+        team_id: Optional[int] = None,
+        min_maps_played: Optional[int] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna os jogadores com estilo de jogo mais parecido (k vizinhos mais próximos).
+
+    - **player_id**: ID do jogador
+    - **k**: Quantidade de jogadores a retornar
+    - **metric**: Distância usada: `euclidean`, `cosine` ou `manhattan`
+    - **role**, **country**, **team_id**, **min_maps_played**: Filtros dos candidatos
+    """
+    from app.analytics import stats_snapshot
+    from app.similarity import SIMILARITY_FEATURES, SIMILARITY_METRICS, similar_players
+
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f"Métrica inválida. Opções: {', '.join(SIMILARITY_METRICS)}")
+
+    snapshot = await stats_snapshot.get(db)
+    similar = similar_players(
+        snapshot, player_id, k, metric,
+        role=role, country=country, team_id=team_id, min_maps_played=min_maps_played
+    )
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Estatísticas não encontradas para este jogador")
+
+    return json_response({
+        "player_id": player_id,
+        "metric": metric,
+        "features": list(SIMILARITY_FEATURES),
+        "similar": similar,
+    })
 
 
 # Rotas para Estatísticas
 @app.get("/stats/players", tags=["Player Stats"])
-def read_all_player_stats(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+async def read_all_player_stats(
+        request: Request,
+        response: Response,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_db)
+):
     """
-    Retorna estatísticas de todos os jogadores.
+    Retorna estatísticas de todos os jogadores, ordenadas por rating.
 
     - **skip**: Número de registros a pular (paginação)
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor da próxima página (header `X-Next-Cursor` da resposta anterior)
     """
-    stats = db.query(models.PlayerStats).offset(skip).limit(limit).all()
-    return [
-        {
-            "player_id": stat.player_id,
-            "player_nickname": stat.player.nickname if stat.player else None,
-            "picture": stat.picture,
-            "country": stat.country,
-            "age": stat.age,
-            "total_kills": stat.total_kills,
-            "total_deaths": stat.total_deaths,
-            "headshot_percentage": stat.headshot_percentage,
-            "kd_ratio": stat.kd_ratio,
-            "damage_per_round": stat.damage_per_round,
-            "grenade_damage_per_round": stat.grenade_damage_per_round,
-            "maps_played": stat.maps_played,
-            "rounds_played": stat.rounds_played,
-            "kills_per_round": stat.kills_per_round,
-            "assists_per_round": stat.assists_per_round,
-            "deaths_per_round": stat.deaths_per_round,
-            "saved_by_teammate_per_round": stat.saved_by_teammate_per_round,
-            "saved_teammates_per_round": stat.saved_teammates_per_round,
-            "rating": stat.rating,
-            "last_updated": stat.last_updated
-        }
-        for stat in stats
-    ]
+    query = select(models.PlayerStats).options(joinedload(models.PlayerStats.player))
+    stats = await paginate(db, query, PLAYER_STATS_ORDER, request, response, skip, limit, cursor)
+    return json_response(
+        [serializers.player_stats_item(stat, stat.player.nickname if stat.player else None) for stat in stats],
+        response
+    )
 
 
 # Rotas para Achievements
 @app.get("/teams/{team_id}/achievements", tags=["Achievements"])
-def read_team_achievements(team_id: int, db: Session = Depends(get_db)):
+async def read_team_achievements(team_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna todos os achievements de um time específico.
 
     - **team_id**: ID do time
     """
-    team = db.query(models.Team).filter(models.Team.id == team_id).first()
+    team = await db.scalar(
+        select(models.Team)
+        .options(selectinload(models.Team.achievements))
+        .filter(models.Team.id == team_id)
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Time não encontrado")
 
-    return [
-        {
-            "id": achievement.id,
-            "title": achievement.title,
-            "event_name": achievement.event_name,
-            "year": achievement.year,
-            "placement": achievement.placement,
-            "prize_money": achievement.prize_money,
-            "trophy_image_url": achievement.trophy_image_url,
-            "event_tier": achievement.event_tier,
-            "team_id": achievement.team_id,
-            "team_name": team.name
-        }
-        for achievement in team.achievements
-    ]
+    return json_response([serializers.team_achievement_item(achievement, team.name) for achievement in team.achievements])
 
 
 @app.get("/players/{player_id}/achievements", tags=["Achievements"])
-def read_player_achievements(player_id: int, db: Session = Depends(get_db)):
+async def read_player_achievements(player_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retorna todos os achievements de um jogador específico.
 
     - **player_id**: ID do jogador
     """
-    player = db.query(models.Player).filter(models.Player.id == player_id).first()
+    player = await db.scalar(
+        select(models.Player)
+        .options(selectinload(models.Player.achievements))
+        .filter(models.Player.id == player_id)
+    )
     if not player:
         raise HTTPException(status_code=404, detail="Jogador não encontrado")
 
-    return [
-        {
-            "id": achievement.id,
-            "title": achievement.title,
-            "event_name": achievement.event_name,
-            "year": achievement.year,
-            "placement": achievement.placement,
-            "prize_money": achievement.prize_money,
-            "trophy_image_url": achievement.trophy_image_url,
-            "event_tier": achievement.event_tier,
-            "mvp_award": achievement.mvp_award,
-            "player_id": achievement.player_id,
-            "player_nickname": player.nickname
-        }
-        for achievement in player.achievements
-    ]
+    return json_response(
+        [serializers.player_achievement_item(achievement, player.nickname) for achievement in player.achievements]
+    )
+
+
+def achievements_feed_query(achievement_type: Optional[str], year: Optional[int], event_tier: Optional[str]):
+    """
+    Achievements de times e jogadores em uma única consulta (UNION ALL).
+
+    Os filtros são aplicados em cada lado da união para aproveitar os índices
+    de `year` e `event_tier`; retorna None se o tipo pedido não existir.
+    """
+    selects = []
+    for kind, model, owner, owner_name, mvp_award in (
+        ("team", models.TeamAchievement, models.Team, models.Team.name, cast(null(), String)),
+        ("player", models.PlayerAchievement, models.Player, models.Player.nickname, models.PlayerAchievement.mvp_award),
+    ):
+        if achievement_type not in (None, kind):
+            continue
+
+        owner_id = model.team_id if kind == "team" else model.player_id
+        query = (
+            select(
+                model.id,
+                literal(kind, String).label("type"),
+                model.title,
+                model.event_name,
+                model.year,
+                model.placement,
+                model.prize_money,
+                model.trophy_image_url,
+                model.event_tier,
+                mvp_award.label("mvp_award"),
+                owner_id.label("owner_id"),
+                owner_name.label("owner_name"),
+            )
+            .outerjoin(owner, owner.id == owner_id)
+        )
+        if year:
+            query = query.filter(model.year == year)
+        if event_tier:
+            query = query.filter(model.event_tier == event_tier)
+        selects.append(query)
+
+    if not selects:
+        return None
+    feed = union_all(*selects) if len(selects) > 1 else selects[0]
+    return feed.subquery("achievements_feed")
+
+
+def achievements_feed_order(feed) -> KeysetOrder:
+    """Mais recentes primeiro: ano, tipo e id (os ids se repetem entre as duas tabelas)"""
+    return KeysetOrder(
+        (func.coalesce(feed.c.year, 0), lambda row: row.year or 0),
+        (feed.c.type, lambda row: row.type),
+        (feed.c.id, lambda row: row.id),
+        descending=True,
+    )
 
 
 @app.get("/achievements/", tags=["Achievements"])
-def read_all_achievements(
+async def read_all_achievements(
+        request: Request,
+        response: Response,
         skip: int = 0,
         limit: int = 20,
         achievement_type: Optional[str] = None,
         year: Optional[int] = None,
         event_tier: Optional[str] = None,
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retorna todos os achievements do sistema com filtros opcionais.
+    Retorna todos os achievements do sistema com filtros opcionais, do mais recente para o mais antigo.
 
     - **skip**: Número de registros a pular (paginação)
     - **limit**: Número máximo de registros a retornar
     - **achievement_type**: Tipo de achievement ('team' ou 'player')
     - **year**: Filtrar por ano
     - **event_tier**: Filtrar por tier do evento (S-Tier, A-Tier, etc.)
+    - **cursor**: Cursor da próxima página (header `X-Next-Cursor` da resposta anterior)
     """
-    achievements = []
+    feed = achievements_feed_query(achievement_type, year, event_tier)
+    if feed is None:
+        return json_response([], response)
 
-    if achievement_type == "team" or achievement_type is None:
-        team_achievements = db.query(models.TeamAchievement)
+    order = achievements_feed_order(feed)
+    rows = await paginate(db, select(feed), order, request, response, skip, limit, cursor, scalars=False)
 
-        if year:
-            team_achievements = team_achievements.filter(models.TeamAchievement.year == year)
-        if event_tier:
-            team_achievements = team_achievements.filter(models.TeamAchievement.event_tier == event_tier)
-
-        team_achievements = team_achievements.offset(skip).limit(limit).all()
-
-        for achievement in team_achievements:
-            achievements.append({
-                "id": achievement.id,
-                "type": "team",
-                "title": achievement.title,
-                "event_name": achievement.event_name,
-                "year": achievement.year,
-                "placement": achievement.placement,
-                "prize_money": achievement.prize_money,
-                "trophy_image_url": achievement.trophy_image_url,
-                "event_tier": achievement.event_tier,
-                "team_id": achievement.team_id,
-                "team_name": achievement.team.name if achievement.team else None
-            })
-
-    if achievement_type == "player" or achievement_type is None:
-        player_achievements = db.query(models.PlayerAchievement)
+    return json_response([serializers.feed_item(row) for row in rows], response)
 
-        if year:
-            player_achievements = player_achievements.filter(models.PlayerAchievement.year == year)
-        if event_tier:
-            player_achievements = player_achievements.filter(models.PlayerAchievement.event_tier == event_tier)
-
-        player_achievements = player_achievements.offset(skip).limit(limit).all()
-
-        for achievement in player_achievements:
-            achievements.append({
-                "id": achievement.id,
-                "type": "player",
-                "title": achievement.title,
-                "event_name": achievement.event_name,
-                "year": achievement.year,
-                "placement": achievement.placement,
-                "prize_money": achievement.prize_money,
-                "trophy_image_url": achievement.trophy_image_url,
-                "event_tier": achievement.event_tier,
-                "mvp_award": achievement.mvp_award,
-                "player_id": achievement.player_id,
-                "player_nickname": achievement.player.nickname if achievement.player else None
-            })
-
-    return achievements
-
-
-# Rotas de busca e filtros
-@app.get("/players/search", tags=["Players"])
-def search_players(
-        nickname: Optional[str] = None,
-        team_id: Optional[int] = None,
-        role: Optional[str] = None,
-        db: Session = Depends(get_db)
-):
+
+# Rota de estatísticas gerais
+@app.get("/stats/summary", tags=["Stats"])
+async def get_stats_summary(db: AsyncSession = Depends(get_db)):
+    """
+    Retorna um resumo das estatísticas gerais do sistema.
     """
-    Busca jogadores por critérios específicos.
+    total_teams = await db.scalar(select(func.count()).select_from(models.Team))
+    total_players = await db.scalar(select(func.count()).select_from(models.Player))
+    total_stats = await db.scalar(select(func.count()).select_from(models.PlayerStats))
 
-    - **nickname**: Busca por apelido (busca parcial)
-    - **team_id**: Filtra por ID do time
-    - **role**: Filtra por função (player, coach, etc.)
+    return {
+        "total_teams": total_teams,
+        "total_players": total_players,
+        "total_player_stats": total_stats,
+        "coverage_percentage": round((total_stats / total_players * 100) if total_players > 0 else 0, 2)
+    }
+
+
+@app.get("/stats/rosters", tags=["Stats"])
+async def get_roster_summary(format: str = "json", coverage: bool = False, db: AsyncSession = Depends(get_db)):
     """
-    query = db.query(models.Player)
+    Retorna os elencos de todos os times (jogadores com rating e coaches) e os totais,
+    montados com uma consulta só.
 
-    if nickname:
-        query = query.filter(models.Player.nickname.ilike(f"%{nickname}%"))
+    - **format**: `json` (padrão), `text` ou `csv` (uma linha por pessoa)
+    - **coverage**: Inclui pessoas sem estatísticas e a idade das estatísticas por faixa
+    """
+    if format not in ROSTER_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato inválido: {format}. Use uma de: {', '.join(ROSTER_FORMATS)}"
+        )
 
-    if team_id:
-        query = query.filter(models.Player.team_id == team_id)
+    rows = await db.execute(roster_summary_query())
+    summary = build_roster_summary(rows.all(), coverage)
+    if format == "json":
+        return json_response(summary)
+    return Response(render_roster_summary(summary, format), media_type=ROSTER_FORMATS[format])
 
-    if role:
-        query = query.filter(models.Player.role == role)
 
-    players = query.all()
+@app.get("/stats/distributions", tags=["Stats"])
+async def get_stats_distributions(metrics: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    """
+    Retorna a distribuição de cada métrica entre os jogadores: média, desvio padrão,
+    mínimo, máximo, quantis (p10 a p90) e histograma.
 
-    return [
-        {
-            "id": player.id,
-            "nickname": player.nickname,
-            "real_name": player.real_name,
-            "url": player.url,
-            "role": player.role,
-            "team_id": player.team_id,
-            "team_name": player.team.name if player.team else None
-        }
-        for player in players
-    ]
+    - **metrics**: Métricas separadas por vírgula (padrão: todas)
+    """
+    from app.analytics import ANALYTICS_METRICS, stats_snapshot
 
+    selected = None
+    if metrics:
+        selected = [metric.strip() for metric in metrics.split(",") if metric.strip()]
+        unknown = sorted(set(selected) - set(ANALYTICS_METRICS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Métricas inválidas: {', '.join(unknown)}")
 
-@app.get("/teams/search", tags=["Teams"])
-def search_teams(
-        name: Optional[str] = None,
-        ranking_min: Optional[int] = None,
-        ranking_max: Optional[int] = None,
-        db: Session = Depends(get_db)
+    snapshot = await stats_snapshot.get(db)
+    return json_response(snapshot.distributions(selected))
+
+
+@app.get("/leaderboards/{metric}", tags=["Stats"])
+async def read_leaderboard(
+        metric: str,
+        role: Optional[str] = None,
+        country: Optional[str] = None,
+        team_id: Optional[int] = None,
+        min_maps_played: Optional[int] = None,
+        limit: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Busca times por critérios específicos.
+    Retorna os melhores jogadores em uma métrica, com a posição de cada um.
 
-    - **name**: Busca por nome (busca parcial)
-    - **ranking_min**: Ranking mínimo
-    - **ranking_max**: Ranking máximo
+    - **metric**: `rating`, `kd` (K/D), `adr` (dano por round) ou `headshots` (% de headshots)
+    - **role**: Filtra por função (player, coach, etc.)
+    - **country**: Filtra por país
+    - **team_id**: Filtra por ID do time
+    - **min_maps_played**: Mínimo de mapas jogados
+    - **limit**: Número de jogadores a retornar
+
+    `rank` é a posição entre os jogadores que passam pelos filtros e
+    `global_rank` a posição entre todos os jogadores.
     """
-    query = db.query(models.Team)
+    if metric not in LEADERBOARD_METRICS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Métrica não encontrada. Opções: {', '.join(LEADERBOARD_METRICS)}"
+        )
 
-    if name:
-        query = query.filter(models.Team.name.ilike(f"%{name}%"))
+    query = leaderboard_query(
+        banco.get_async_engine().dialect.name, metric, role, country, team_id, min_maps_played, limit
+    )
+    rows = await db.execute(query)
+    return json_response([serializers.leaderboard_item(row) for row in rows])
 
-    if ranking_min:
-        query = query.filter(models.Team.ranking >= ranking_min)
 
-    if ranking_max:
-        query = query.filter(models.Team.ranking <= ranking_max)
+@app.get("/export/{entity}", tags=["Export"])
+async def export_entity(entity: str, format: str = "ndjson"):
+    """
+    Exporta a tabela inteira em streaming, lida com um cursor do lado do servidor.
 
-    teams = query.all()
+    - **entity**: `teams`, `players`, `player_stats`, `team_map_stats`, `team_achievements` ou `player_achievements`
+    - **format**: `ndjson` (padrão, um objeto JSON por linha) ou `csv`
+    """
+    if entity not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Entidade não encontrada. Opções: {', '.join(EXPORT_TABLES)}"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato inválido: {format}. Use uma de: {', '.join(EXPORT_FORMATS)}"
+        )
 
-    return [
-        {
-            "id": team.id,
-            "name": team.name,
-            "url": team.url,
-            "ranking": team.ranking,
-            "points": team.points
-        }
-        for team in teams
-    ]
+    return StreamingResponse(
+        stream_export(entity, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
 
 
-# Rota de estatísticas gerais
-@app.get("/stats/summary", tags=["Stats"])
-def get_stats_summary(db: Session = Depends(get_db)):
+@app.get("/metrics/latency", tags=["Stats"])
+async def get_latency_metrics():
     """
-    Retorna um resumo das estatísticas gerais do sistema.
+    Retorna os percentis de latência (p50/p95/p99) por rota desde o início do processo.
     """
-    total_teams = db.query(models.Team).count()
-    total_players = db.query(models.Player).count()
-    total_stats = db.query(models.PlayerStats).count()
-
-    return {
-        "total_teams": total_teams,
-        "total_players": total_players,
-        "total_player_stats": total_stats,
-        "coverage_percentage": round((total_stats / total_players * 100) if total_players > 0 else 0, 2)
-    }
+    return latency_tracker.snapshot()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""
+Comparação dos map pools de dois times (prévia de confronto)
+
+As estatísticas de mapa dos dois times vêm de uma única consulta, são
+alinhadas por mapa em uma matriz NumPy (time x mapa x métrica) e as
+diferenças de win rate, rounds e lados CT/T são calculadas de uma vez.
+A preferência de veto ordena os mapas pela vantagem de cada time, com o
+win rate suavizado pelo número de partidas (poucos jogos puxam para 50%).
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app import models
+
+# Métricas comparadas mapa a mapa
+MAP_POOL_METRICS = ("win_rate", "round_win_rate", "ct_win_rate", "t_win_rate")
+
+# Partidas "fictícias" a 50% somadas a cada mapa ao calcular a vantagem
+VETO_PRIOR_MATCHES = float(os.getenv("VETO_PRIOR_MATCHES", "5"))
+
+
+def map_pool_query(team_a: int, team_b: int):
+    """Os dois times e todas as suas estatísticas de mapa em uma consulta"""
+    return (
+        select(
+            models.Team.id,
+            models.Team.name,
+            models.TeamMapStats.map_name,
+            models.TeamMapStats.matches_played,
+            *(getattr(models.TeamMapStats, metric) for metric in MAP_POOL_METRICS),
+        )
+        .outerjoin(models.TeamMapStats, models.TeamMapStats.team_id == models.Team.id)
+        .filter(models.Team.id.in_((team_a, team_b)))
+    )
+
+
+def _number(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 2)
+
+
+def compare_map_pools(team_a: int, team_b: int, rows) -> Optional[dict]:
+    """
+    Alinha as linhas de `map_pool_query` por mapa e calcula as diferenças
+    (time A - time B). Retorna None se algum dos times não existir.
+    """
+    names = {row.id: row.name for row in rows}
+    if team_a not in names or team_b not in names:
+        return None
+
+    maps = sorted({row.map_name for row in rows if row.map_name})
+    column = {map_name: index for index, map_name in enumerate(maps)}
+
+    # [time, mapa, partidas + métricas]; mapa sem estatísticas = NaN
+    values = np.full((2, len(maps), 1 + len(MAP_POOL_METRICS)), np.nan)
+    for row in rows:
+        if row.map_name:
+            side = 0 if row.id == team_a else 1
+            values[side, column[row.map_name]] = [row.matches_played, *(getattr(row, m) for m in MAP_POOL_METRICS)]
+
+    matches = np.nan_to_num(values[:, :, 0])
+    win_rate = np.nan_to_num(values[:, :, 1])
+    strength = (win_rate * matches + 50.0 * VETO_PRIOR_MATCHES) / (matches + VETO_PRIOR_MATCHES)
+    advantage = strength[0] - strength[1]
+    deltas = values[0, :, 1:] - values[1, :, 1:]
+
+    # Desempate pelo nome do mapa para a ordem ser estável
+    order = np.arange(len(maps))
+    preference_a = np.lexsort((order, -advantage))
+    preference_b = np.lexsort((order, advantage))
+
+    def side(index: int, map_index: int) -> dict:
+        stats = values[index, map_index]
+        return {
+            "matches_played": None if np.isnan(stats[0]) else int(stats[0]),
+            **{metric: _number(stats[1 + position]) for position, metric in enumerate(MAP_POOL_METRICS)},
+        }
+
+    return {
+        "team_a": {"id": team_a, "name": names[team_a]},
+        "team_b": {"id": team_b, "name": names[team_b]},
+        "maps": [
+            {
+                "map_name": map_name,
+                "team_a": side(0, index),
+                "team_b": side(1, index),
+                "delta": {metric: _number(deltas[index, position]) for position, metric in enumerate(MAP_POOL_METRICS)},
+                "advantage": _number(advantage[index]),
+            }
+            for index, map_name in enumerate(maps)
+        ],
+        # Do mapa mais favorável (pick) ao menos favorável (ban) para cada time
+        "veto_preference": {
+            "team_a": [maps[index] for index in preference_a],
+            "team_b": [maps[index] for index in preference_b],
+        },
+    }
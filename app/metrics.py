@@ -0,0 +1,203 @@
+"""
+Métricas de banco de dados e latência por requisição da API HLTV Expandido
+
+Conta os comandos SQL e o tempo gasto no banco em cada requisição (através dos
+eventos do engine do SQLAlchemy) e mantém percentis de latência por rota.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
+
+from app.logger import logger
+
+# Requisições acima deste tempo (ms) são logadas com os comandos executados
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+
+# Quantidade de amostras de latência mantidas por rota
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "1000"))
+
+# Limite de comandos SQL guardados por requisição (para o log de requisições lentas)
+MAX_RECORDED_STATEMENTS = 50
+
+
+class QueryStats:
+    """Acumula quantidade de comandos SQL e tempo de banco de um escopo"""
+
+    __slots__ = ("query_count", "db_time", "statements")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = []
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine):
+    """
+    Registra os listeners de execução de SQL no engine informado.
+
+    Os comandos só são contabilizados quando existe um escopo ativo
+    (requisição em andamento ou bloco `track_queries`).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        start = getattr(context, "_query_start_time", None)
+        if stats is None or start is None:
+            return
+
+        elapsed = time.perf_counter() - start
+        stats.query_count += 1
+        stats.db_time += elapsed
+        if len(stats.statements) < MAX_RECORDED_STATEMENTS:
+            stats.statements.append((statement, elapsed))
+
+
+@contextmanager
+def track_queries():
+    """
+    Contabiliza os comandos SQL executados dentro do bloco.
+
+    Útil em testes para detectar regressões de N+1:
+
+        with track_queries() as stats:
+            ...
+        assert stats.query_count <= 3
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Percentil pelo método nearest-rank sobre uma lista já ordenada"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class LatencyTracker:
+    """Guarda as últimas amostras de latência por rota e calcula p50/p95/p99"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, route: str, duration_ms: float):
+        with self._lock:
+            self._samples[route].append(duration_ms)
+            self._counts[route] += 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            samples = {route: sorted(values) for route, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        return {
+            route: {
+                "count": counts[route],
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+            for route, values in samples.items()
+        }
+
+
+latency_tracker = LatencyTracker()
+
+
+def resolve_route(scope):
+    """
+    Rota da requisição. Respostas dadas antes do roteamento (cache HIT, 304)
+    não passam pelo router, então a rota é procurada nas rotas da aplicação.
+    """
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return candidate
+    return route
+
+
+def _route_label(request) -> str:
+    path = getattr(resolve_route(request.scope), "path", None) or "<unmatched>"
+    return f"{request.method} {path}"
+
+
+class QueryMetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware que mede cada requisição.
+
+    Adiciona os headers `Server-Timing` e `X-DB-Queries`, registra a latência
+    da rota e loga as requisições lentas junto com os comandos SQL executados.
+    """
+
+    async def dispatch(self, request, call_next):
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        route = _route_label(request)
+        latency_tracker.record(route, total_ms)
+
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.db_time_ms:.2f};desc="{stats.query_count} queries", '
+            f"app;dur={total_ms:.2f}"
+        )
+        response.headers["X-DB-Queries"] = str(stats.query_count)
+
+        if total_ms >= SLOW_REQUEST_MS:
+            statements = "\n".join(
+                f"    [{elapsed * 1000:.2f} ms] {statement}" for statement, elapsed in stats.statements
+            )
+            logger.warning(
+                "🐢 Requisição lenta: %s (%s) %.2f ms, %d queries, %.2f ms no banco\n%s",
+                route, request.url.query or "-", total_ms, stats.query_count, stats.db_time_ms, statements,
+                extra={
+                    "route": route,
+                    "duration_ms": round(total_ms, 2),
+                    "db_queries": stats.query_count,
+                    "db_ms": round(stats.db_time_ms, 2),
+                },
+            )
+
+        return response
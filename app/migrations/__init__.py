@@ -0,0 +1,36 @@
+"""
+Migrações do banco (Alembic)
+
+Bancos criados antes das migrações (com `create_all`) são marcados com a
+revisão inicial antes do upgrade, já que o esquema deles é o da baseline.
+"""
+
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.logger import logger
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_REVISION = "0001_baseline"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(bind, revision: str = "head"):
+    """Aplica as migrações pendentes no banco de `bind` (engine)"""
+    with bind.begin() as connection:
+        config = alembic_config(connection)
+        tables = inspect(connection).get_table_names()
+        if "teams" in tables and "alembic_version" not in tables:
+            logger.info("🗂️ Banco sem histórico de migrações, marcando como %s", BASELINE_REVISION)
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
@@ -0,0 +1,24 @@
+"""
+Cria ou atualiza o esquema do banco de `DATABASE_URL`
+
+Diferente de `alembic upgrade head`, marca bancos anteriores às migrações com a
+revisão inicial antes do upgrade.
+
+Uso:
+    python -m app.migrations
+    python -m app.migrations --revision 0003_hot_path_indexes
+"""
+
+import argparse
+
+from app.banco import get_engine
+from app.logger import logger
+from app.migrations import upgrade_database
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aplica as migrações pendentes no banco")
+    parser.add_argument("--revision", default="head", help="Revisão alvo (padrão: head)")
+    args = parser.parse_args()
+
+    upgrade_database(get_engine(), args.revision)
+    logger.info("✅ Esquema do banco na revisão %s", args.revision)
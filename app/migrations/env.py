@@ -0,0 +1,46 @@
+"""
+Ambiente do Alembic: usa a URL de `app.banco` e os modelos de `app.models`
+
+Com uma conexão em `config.attributes["connection"]` (ex: `upgrade_database`)
+as migrações rodam nela em vez de abrir um engine novo.
+"""
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from app import banco, models
+
+config = context.config
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline():
+    """Gera o SQL das migrações sem conectar no banco (alembic upgrade head --sql)"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or banco.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or banco.DATABASE_URL)
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,125 @@
+"""Esquema inicial (tabelas e índices criados pelo `create_all` antes das migrações)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "teams",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("url", sa.String()),
+        sa.Column("ranking", sa.Integer()),
+        sa.Column("points", sa.Integer()),
+        sa.Column("logo_url", sa.String()),
+        sa.Column("region", sa.String()),
+        sa.Column("win_rate", sa.Float()),
+        sa.Column("weeks_in_top30", sa.Integer()),
+        sa.Column("average_player_age", sa.Float()),
+        sa.Column("coach_name", sa.String()),
+        sa.Column("peak_ranking", sa.Integer()),
+        sa.Column("time_at_peak", sa.String()),
+    )
+    op.create_index("ix_teams_id", "teams", ["id"])
+    op.create_index("ix_teams_name", "teams", ["name"], unique=True)
+
+    op.create_table(
+        "players",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("nickname", sa.String()),
+        sa.Column("real_name", sa.String()),
+        sa.Column("url", sa.String()),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("teams.id")),
+        sa.Column("role", sa.String()),
+    )
+
+    op.create_table(
+        "player_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("player_id", sa.Integer(), sa.ForeignKey("players.id"), unique=True),
+        sa.Column("picture", sa.String()),
+        sa.Column("country", sa.String()),
+        sa.Column("age", sa.Integer()),
+        sa.Column("total_kills", sa.Integer()),
+        sa.Column("total_deaths", sa.Integer()),
+        sa.Column("headshot_percentage", sa.Float()),
+        sa.Column("kd_ratio", sa.Float()),
+        sa.Column("damage_per_round", sa.Float()),
+        sa.Column("grenade_damage_per_round", sa.Float()),
+        sa.Column("maps_played", sa.Integer()),
+        sa.Column("rounds_played", sa.Integer()),
+        sa.Column("kills_per_round", sa.Float()),
+        sa.Column("assists_per_round", sa.Float()),
+        sa.Column("deaths_per_round", sa.Float()),
+        sa.Column("saved_by_teammate_per_round", sa.Float()),
+        sa.Column("saved_teammates_per_round", sa.Float()),
+        sa.Column("rating", sa.Float()),
+        sa.Column("last_updated", sa.DateTime()),
+    )
+
+    op.create_table(
+        "player_achievements",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("player_id", sa.Integer(), sa.ForeignKey("players.id")),
+        sa.Column("title", sa.String()),
+        sa.Column("event_name", sa.String()),
+        sa.Column("year", sa.Integer()),
+        sa.Column("placement", sa.String()),
+        sa.Column("prize_money", sa.String()),
+        sa.Column("trophy_image_url", sa.String()),
+        sa.Column("event_tier", sa.String()),
+        sa.Column("mvp_award", sa.String()),
+    )
+
+    op.create_table(
+        "team_achievements",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("teams.id")),
+        sa.Column("title", sa.String()),
+        sa.Column("event_name", sa.String()),
+        sa.Column("year", sa.Integer()),
+        sa.Column("placement", sa.String()),
+        sa.Column("prize_money", sa.String()),
+        sa.Column("trophy_image_url", sa.String()),
+        sa.Column("event_tier", sa.String()),
+    )
+
+    op.create_table(
+        "team_map_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("teams.id")),
+        sa.Column("map_name", sa.String()),
+        sa.Column("matches_played", sa.Integer()),
+        sa.Column("matches_won", sa.Integer()),
+        sa.Column("win_rate", sa.Float()),
+        sa.Column("rounds_played", sa.Integer()),
+        sa.Column("rounds_won", sa.Integer()),
+        sa.Column("round_win_rate", sa.Float()),
+        sa.Column("ct_rounds_won", sa.Integer()),
+        sa.Column("t_rounds_won", sa.Integer()),
+        sa.Column("ct_win_rate", sa.Float()),
+        sa.Column("t_win_rate", sa.Float()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("team_map_stats", "team_achievements", "player_achievements", "player_stats",
+                  "players", "teams"):
+        op.drop_table(table)
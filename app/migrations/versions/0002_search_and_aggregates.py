@@ -0,0 +1,70 @@
+"""Busca por trigramas, agregados dos times, versão dos dados e índices do feed
+
+Revision ID: 0002_search_and_aggregates
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_search_and_aggregates"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Agregados do elenco recalculados pelo scraper (app/team_aggregates.py)
+TEAM_AGGREGATE_COLUMNS = (
+    "average_rating", "median_rating", "average_kd_ratio", "average_damage_per_round", "average_maps_played",
+)
+
+# (índice, tabela, coluna) da busca aproximada (GIN com gin_trgm_ops no Postgres)
+TRIGRAM_INDEXES = (
+    ("ix_teams_name_trgm", "teams", "name"),
+    ("ix_players_nickname_trgm", "players", "nickname"),
+    ("ix_players_real_name_trgm", "players", "real_name"),
+)
+
+# (índice, tabela, colunas) dos filtros do feed de achievements e da ordenação por força do elenco
+INDEXES = (
+    ("ix_player_achievements_year", "player_achievements", ["year"]),
+    ("ix_player_achievements_event_tier", "player_achievements", ["event_tier"]),
+    ("ix_team_achievements_year", "team_achievements", ["year"]),
+    ("ix_team_achievements_event_tier", "team_achievements", ["event_tier"]),
+    ("ix_teams_average_rating", "teams", [sa.text("coalesce(average_rating, 0)"), "id"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in TEAM_AGGREGATE_COLUMNS:
+        op.add_column("teams", sa.Column(column, sa.Float()))
+
+    op.create_table(
+        "data_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(name, table, [column], postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES + TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("data_version")
+    with op.batch_alter_table("teams") as batch:
+        for column in reversed(TEAM_AGGREGATE_COLUMNS):
+            batch.drop_column(column)
@@ -0,0 +1,44 @@
+"""Índices das chaves estrangeiras e das ordenações das listagens
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_search_and_aggregates
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_hot_path_indexes"
+down_revision: Union[str, Sequence[str], None] = "0002_search_and_aggregates"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (índice, tabela, colunas)
+INDEXES = (
+    # Jogadores de um time (/teams/{id}/players, include=players, filtro team_id)
+    ("ix_players_team_id", "players", ["team_id"]),
+    # Conquistas e mapas carregados por time/jogador (selectinload)
+    ("ix_player_achievements_player_id", "player_achievements", ["player_id"]),
+    ("ix_team_achievements_team_id", "team_achievements", ["team_id"]),
+    ("ix_team_map_stats_team_id", "team_map_stats", ["team_id"]),
+    # Ordenação padrão de /teams/ (posição no ranking, com os times fora dele por último, e id)
+    ("ix_teams_ranking", "teams", [sa.text("coalesce(nullif(ranking, 0), 2147483647)"), "id"]),
+    # Ordenação de /stats/players (coalesce(rating, 0), id)
+    ("ix_player_stats_rating", "player_stats", [sa.text("coalesce(rating, 0)"), "id"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,60 @@
+"""Materialized view dos leaderboards (apenas Postgres)
+
+Revision ID: 0004_player_leaderboard_view
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_player_leaderboard_view"
+down_revision: Union[str, Sequence[str], None] = "0003_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQL fixo desta revisão: mudanças na consulta de `app.leaderboards` exigem uma nova migração
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS player_leaderboard AS
+SELECT player_stats.player_id, players.nickname, players.role, players.team_id, teams.name AS team_name,
+       player_stats.country, player_stats.picture, player_stats.maps_played,
+       player_stats.rating, player_stats.kd_ratio, player_stats.damage_per_round, player_stats.headshot_percentage,
+       rank() OVER (ORDER BY player_stats.rating DESC NULLS LAST) AS rating_rank,
+       rank() OVER (ORDER BY player_stats.kd_ratio DESC NULLS LAST) AS kd_ratio_rank,
+       rank() OVER (ORDER BY player_stats.damage_per_round DESC NULLS LAST) AS damage_per_round_rank,
+       rank() OVER (ORDER BY player_stats.headshot_percentage DESC NULLS LAST) AS headshot_percentage_rank
+FROM player_stats
+JOIN players ON players.id = player_stats.player_id
+LEFT OUTER JOIN teams ON teams.id = players.team_id
+"""
+
+CREATE_INDEXES = (
+    # Índice único exigido pelo REFRESH ... CONCURRENTLY
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_player_leaderboard_player_id ON player_leaderboard (player_id)",
+    "CREATE INDEX IF NOT EXISTS ix_player_leaderboard_rating "
+    "ON player_leaderboard (rating DESC NULLS LAST, player_id)",
+    "CREATE INDEX IF NOT EXISTS ix_player_leaderboard_kd_ratio "
+    "ON player_leaderboard (kd_ratio DESC NULLS LAST, player_id)",
+    "CREATE INDEX IF NOT EXISTS ix_player_leaderboard_damage_per_round "
+    "ON player_leaderboard (damage_per_round DESC NULLS LAST, player_id)",
+    "CREATE INDEX IF NOT EXISTS ix_player_leaderboard_headshot_percentage "
+    "ON player_leaderboard (headshot_percentage DESC NULLS LAST, player_id)",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(CREATE_VIEW)
+        for statement in CREATE_INDEXES:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS player_leaderboard")
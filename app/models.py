@@ -1,10 +1,36 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import DDL, Column, Integer, String, Float, ForeignKey, DateTime, Index, event, func, literal_column
 from sqlalchemy.orm import relationship
 
 from app.banco import Base
 
+# Os índices de busca aproximada (GIN com gin_trgm_ops) dependem da extensão pg_trgm
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """Índice GIN de trigramas no Postgres (índice comum nos demais bancos)"""
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+# Posição dos times fora do ranking (ranking 0 ou nulo): depois do último colocado
+UNRANKED_POSITION = 2147483647
+
+
+def ranking_position(ranking):
+    """
+    Ranking sem zeros nem nulos, para ordenar os times fora do ranking por último
+    (constantes literais, para que a consulta use o índice de mesma expressão)
+    """
+    return func.coalesce(
+        func.nullif(ranking, literal_column("0")), literal_column(str(UNRANKED_POSITION)), type_=Integer
+    )
+
 
 class Player(Base):
     __tablename__ = 'players'
@@ -13,7 +39,7 @@ class Player(Base):
     nickname = Column(String)
     real_name = Column(String)  # Nome real do jogador
     url = Column(String)
-    team_id = Column(Integer, ForeignKey('teams.id'))
+    team_id = Column(Integer, ForeignKey('teams.id'), index=True)
     role = Column(String)  # 'player' ou 'coach'
 
     team = relationship("Team", back_populates="players")
@@ -26,6 +52,11 @@ class Player(Base):
     )
     achievements = relationship("PlayerAchievement", back_populates="player", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        trigram_index("ix_players_nickname_trgm", "nickname"),
+        trigram_index("ix_players_real_name_trgm", "real_name"),
+    )
+
 
 class PlayerStats(Base):
     __tablename__ = 'player_stats'
@@ -59,20 +90,25 @@ class PlayerStats(Base):
         back_populates="stats"
     )
 
+    __table_args__ = (
+        # Ordenação de /stats/players (PLAYER_STATS_ORDER)
+        Index("ix_player_stats_rating", func.coalesce(rating, 0), id),
+    )
+
 
 class PlayerAchievement(Base):
     __tablename__ = 'player_achievements'
 
     id = Column(Integer, primary_key=True)
-    player_id = Column(Integer, ForeignKey('players.id'))
+    player_id = Column(Integer, ForeignKey('players.id'), index=True)
 
     title = Column(String)
     event_name = Column(String)
-    year = Column(Integer)
+    year = Column(Integer, index=True)
     placement = Column(String)
     prize_money = Column(String)
     trophy_image_url = Column(String)
-    event_tier = Column(String)
+    event_tier = Column(String, index=True)
     mvp_award = Column(String)
 
     player = relationship("Player", back_populates="achievements")
@@ -96,24 +132,39 @@ class Team(Base):
     peak_ranking = Column(Integer)
     time_at_peak = Column(String)
 
+    # Agregados do elenco (apenas role == 'player'), recalculados pelo scraper
+    average_rating = Column(Float)
+    median_rating = Column(Float)
+    average_kd_ratio = Column(Float)
+    average_damage_per_round = Column(Float)
+    average_maps_played = Column(Float)  # Experiência média do elenco
+
     players = relationship("Player", back_populates="team", cascade="all, delete-orphan")
     achievements = relationship("TeamAchievement", back_populates="team", cascade="all, delete-orphan")
     map_stats = relationship("TeamMapStats", back_populates="team", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        trigram_index("ix_teams_name_trgm", "name"),
+        # Ordenação padrão de /teams/ (TEAM_ORDER), com os times fora do ranking por último
+        Index("ix_teams_ranking", ranking_position(ranking), id),
+        # Ordenação por força do elenco em /teams/?sort=average_rating
+        Index("ix_teams_average_rating", func.coalesce(average_rating, 0), id),
+    )
+
 
 class TeamAchievement(Base):
     __tablename__ = 'team_achievements'
 
     id = Column(Integer, primary_key=True)
-    team_id = Column(Integer, ForeignKey('teams.id'))
+    team_id = Column(Integer, ForeignKey('teams.id'), index=True)
 
     title = Column(String)
     event_name = Column(String)
-    year = Column(Integer)
+    year = Column(Integer, index=True)
     placement = Column(String)
     prize_money = Column(String)
     trophy_image_url = Column(String)
-    event_tier = Column(String)
+    event_tier = Column(String, index=True)
 
     team = relationship("Team", back_populates="achievements")
 
@@ -122,7 +173,7 @@ class TeamMapStats(Base):
     __tablename__ = 'team_map_stats'
 
     id = Column(Integer, primary_key=True)
-    team_id = Column(Integer, ForeignKey('teams.id'))
+    team_id = Column(Integer, ForeignKey('teams.id'), index=True)
 
     map_name = Column(String)
     matches_played = Column(Integer)
@@ -137,3 +188,11 @@ class TeamMapStats(Base):
     t_win_rate = Column(Float)
 
     team = relationship("Team", back_populates="map_stats")
+
+
+class DataVersion(Base):
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # Incrementado pelo scraper a cada lote salvo
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,156 @@
+"""
+Paginação por cursor (keyset) para os endpoints de listagem
+
+Em vez de `OFFSET`, cada página filtra a partir da última chave de ordenação
+retornada, então páginas profundas custam o mesmo que a primeira. O cursor é
+um token opaco (JSON em base64) devolvido no header `X-Next-Cursor` e no
+header `Link` com `rel="next"`.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+
+from app import models
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _matches_type(value: Any, expected: type) -> bool:
+    # JSON não distingue 1.0 de 1, então colunas float aceitam inteiros; bool é subclasse de int
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(token: str, types: Optional[Sequence[type]] = None) -> list:
+    """
+    Decodifica o cursor; responde 400 se o token for inválido ou, com `types`,
+    se os valores não tiverem a quantidade e os tipos das chaves da ordenação
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if types is not None and (
+        len(values) != len(types) or not all(map(_matches_type, values, types))
+    ):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return values
+
+
+class KeysetOrder:
+    """
+    Ordenação estável usada pela paginação por cursor.
+
+    Cada chave é `(expressão SQL, função que extrai o valor do objeto)`; a
+    última chave deve ser única (normalmente o id) para desempatar.
+    """
+
+    def __init__(self, *keys: Tuple[Any, Callable[[Any], Any]], descending: bool = False):
+        self.keys = keys
+        self.descending = descending
+
+    @property
+    def columns(self) -> list:
+        return [expression for expression, _ in self.keys]
+
+    @property
+    def types(self) -> list:
+        """Tipo Python de cada chave, para validar os cursores recebidos"""
+        return [column.type.python_type for column in self.columns]
+
+    def order_by(self, query):
+        if self.descending:
+            return query.order_by(*(column.desc() for column in self.columns))
+        return query.order_by(*self.columns)
+
+    def after(self, query, values: Sequence[Any]):
+        """Filtra as linhas posteriores à chave informada"""
+        row, last = tuple_(*self.columns), tuple_(*values)
+        return query.filter(row < last if self.descending else row > last)
+
+    def cursor_for(self, obj) -> str:
+        return encode_cursor([getter(obj) for _, getter in self.keys])
+
+
+# Times fora do ranking (ranking 0 ou nulo) depois do último colocado
+TEAM_ORDER = KeysetOrder(
+    (models.ranking_position(models.Team.ranking), lambda team: team.ranking or models.UNRANKED_POSITION),
+    (models.Team.id, lambda team: team.id),
+)
+
+
+def _aggregate_order(name: str) -> KeysetOrder:
+    """Times do maior para o menor agregado do elenco (sem estatísticas = 0)"""
+    return KeysetOrder(
+        (func.coalesce(getattr(models.Team, name), 0), lambda team: getattr(team, name) or 0),
+        (models.Team.id, lambda team: team.id),
+        descending=True,
+    )
+
+
+# Ordenações aceitas em /teams/?sort=
+TEAM_SORTS = {
+    "ranking": TEAM_ORDER,
+    **{
+        name: _aggregate_order(name)
+        for name in (
+            "average_rating", "median_rating", "average_kd_ratio", "average_damage_per_round",
+            "average_player_age", "average_maps_played",
+        )
+    },
+}
+
+PLAYER_ORDER = KeysetOrder(
+    (models.Player.id, lambda player: player.id),
+)
+
+PLAYER_STATS_ORDER = KeysetOrder(
+    (func.coalesce(models.PlayerStats.rating, 0), lambda stat: stat.rating or 0),
+    (models.PlayerStats.id, lambda stat: stat.id),
+    descending=True,
+)
+
+
+def set_next_cursor(request, response, token: str):
+    """Publica o cursor da próxima página nos headers da resposta"""
+    next_url = request.url.remove_query_params("skip").include_query_params(cursor=token)
+    response.headers["X-Next-Cursor"] = token
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+
+async def paginate(db, query, order: KeysetOrder, request, response, skip: int, limit: int,
+                   cursor: Optional[str] = None, scalars: bool = True) -> List[Any]:
+    """
+    Aplica ordenação estável e paginação à query e executa na sessão.
+
+    Com `cursor` a página começa após a última chave da página anterior;
+    sem ele, `skip` continua funcionando como antes (OFFSET). Com
+    `scalars=False` retorna as linhas completas em vez de objetos.
+    """
+    query = order.order_by(query)
+    if cursor:
+        query = order.after(query, decode_cursor(cursor, order.types))
+    elif skip:
+        query = query.offset(skip)
+
+    query = query.limit(limit + 1)
+    rows = (await db.scalars(query) if scalars else await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        set_next_cursor(request, response, order.cursor_for(rows[-1]))
+    return rows
@@ -0,0 +1,651 @@
+"""
+Parsers das páginas do HLTV.org, separados da navegação do Playwright
+
+As funções `parse_*` recebem o HTML já baixado e o backend do BeautifulSoup
+e devolvem os mesmos dicionários que o scraper salva no banco. Assim o parsing
+pode ser medido e testado sem navegador (ver `app.benchmarks.parsers`).
+"""
+
+import re
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Backend padrão do BeautifulSoup ("lxml" ou "html.parser")
+DEFAULT_PARSER = "lxml"
+
+# Campo -> palavras-chave do rótulo na página de stats do jogador
+PLAYER_STAT_LABELS = {
+    "total_kills": ["total kills"],
+    "headshot_percentage": ["headshot %"],
+    "total_deaths": ["total deaths"],
+    "kd_ratio": ["k/d ratio"],
+    "damage_per_round": ["damage / round"],
+    "grenade_damage_per_round": ["grenade dmg / round"],
+    "maps_played": ["maps played"],
+    "rounds_played": ["rounds played"],
+    "kills_per_round": ["kills / round"],
+    "assists_per_round": ["assists / round"],
+    "deaths_per_round": ["deaths / round"],
+    "saved_by_teammate_per_round": ["saved by teammate / round"],
+    "saved_teammates_per_round": ["saved teammates / round"],
+}
+
+
+def parse_ranking(html: str, parser: str = DEFAULT_PARSER) -> List[Dict]:
+    """
+    Top 30 times da página de ranking (https://www.hltv.org/ranking/teams/),
+    sem os detalhes coletados na página de cada time
+    """
+    soup = BeautifulSoup(html, parser)
+
+    ranking_block = soup.find("div", {"class": "ranking"})
+    if not ranking_block:
+        logger.warning("⚠️ Ranking block não encontrado!")
+        return extract_teams_alternative(soup)
+
+    teams = []
+
+    for team in ranking_block.find_all("div", {"class": "ranked-team standard-box"}):
+        if len(teams) >= 30:
+            break
+
+        try:
+            name = team.find("div", class_="ranking-header").select_one(".name").text.strip()
+            ranking = int(team.select_one(".position").text.strip().replace("#", ""))
+
+            points_elem = team.find("span", {"class": "points"})
+            points = int(points_elem.text.strip("()").split(" ")[0]) if points_elem else 0
+
+            more_div = team.find("div", class_="more")
+            team_url = None
+            if more_div:
+                profile_link = more_div.find("a", href=re.compile(r"/team/\d+/"))
+                if profile_link:
+                    team_url = "https://www.hltv.org" + profile_link["href"]
+
+            team_picture_elem = team.find("span", {"class": "team-logo"}).find("img")
+            team_picture_url = team_picture_elem.get("src") if team_picture_elem else None
+
+            if not all([name, ranking, team_url]):
+                continue
+
+            teams.append({
+                "name": name,
+                "ranking": ranking,
+                "points": points,
+                "url": team_url,
+                "logo_url": team_picture_url,
+            })
+
+        except Exception as e:
+            logger.warning("Erro ao processar time: %s", e)
+            continue
+
+    return teams
+
+
+def parse_team(html: str, parser: str = DEFAULT_PARSER) -> Dict:
+    """Página de um time com o elenco (`lineup`), construindo a árvore do HTML uma vez só"""
+    team_soup = BeautifulSoup(html, parser)
+    team_page = extract_team_page(team_soup)
+    team_page["lineup"] = extract_team_lineup(team_soup)
+    return team_page
+
+
+def parse_team_page(html: str, parser: str = DEFAULT_PARSER) -> Dict:
+    """País, troféus, estatísticas e mapas da página de um time"""
+    return extract_team_page(BeautifulSoup(html, parser))
+
+
+def parse_team_lineup(html: str, parser: str = DEFAULT_PARSER) -> List[Dict]:
+    """Até 5 jogadores ativos e 1 coach da página de um time"""
+    return extract_team_lineup(BeautifulSoup(html, parser))
+
+
+def extract_team_page(team_soup) -> Dict:
+    details = {}
+    country_elem = team_soup.find("div", class_="team-country")
+    if country_elem:
+        details["country"] = country_elem.text.strip()
+
+    return {
+        "details": details,
+        "trophies": get_team_achievements(team_soup),
+        "stats": get_team_stats(team_soup),
+        "map_stats": get_team_map_stats(team_soup),
+    }
+
+
+def extract_team_lineup(soup) -> List[Dict]:
+    players_and_coach = []
+
+    # Estratégia 1: Procura por seção de lineup atual
+    lineup_section = soup.find(
+        "div", class_=["lineup", "team-lineup", "current-lineup"]
+    )
+
+    if lineup_section:
+        players_and_coach.extend(extract_from_lineup_section(lineup_section))
+
+    # Estratégia 2: Procura por links de jogadores na página principal
+    if not players_and_coach:
+        players_and_coach.extend(extract_players_alternative(soup))
+
+    # Limita a 6 pessoas (5 jogadores + 1 coach)
+    if len(players_and_coach) > 6:
+        players_and_coach = players_and_coach[:6]
+
+    # Identifica quem é coach baseado em padrões comuns
+    for person in players_and_coach:
+        if is_likely_coach(person["nickname"]):
+            person["role"] = "coach"
+        else:
+            person["role"] = "player"
+
+    # Garante que temos no máximo 5 jogadores e 1 coach
+    players = [p for p in players_and_coach if p["role"] == "player"][:5]
+    coaches = [p for p in players_and_coach if p["role"] == "coach"][:1]
+
+    return players + coaches
+
+
+def parse_player_page(html: str, parser: str = DEFAULT_PARSER) -> Dict:
+    """Foto, nome real, país, idade e troféus da página de perfil de um jogador ou coach"""
+    soup = BeautifulSoup(html, parser)
+
+    data = {}
+
+    # Foto
+    picture_elem = soup.find("img", {"class": "bodyshot-img"})
+    if not picture_elem:
+        picture_elem = soup.find("img", src=re.compile(r"playerbodyshot"))
+    if picture_elem:
+        data["photo"] = picture_elem.get("src")
+
+    # Nome real
+    real_name_elem = soup.find("div", class_="playerRealname")
+    if real_name_elem:
+        data["real_name"] = real_name_elem.get_text(strip=True)
+
+    # País
+    country_elem = soup.find("img", class_="flag")
+    if country_elem:
+        data["country"] = country_elem.get("title")
+
+    # Idade
+    age_text = soup.find("div", class_="playerAge")
+    if age_text:
+        age_match = re.search(r"(\d+)", age_text.get_text())
+        if age_match:
+            data["age"] = int(age_match.group(1))
+
+    # Troféus/conquistas do jogador
+    data["achievements"] = get_player_achievements(soup)
+
+    return data
+
+
+def try_parse_stat(value):
+    value = value.replace('%', '').replace(',', '.')
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+
+def parse_player_stats(html: str, parser: str = DEFAULT_PARSER) -> Dict[str, float]:
+    """
+    Estatísticas da página de stats do jogador.
+    Exemplo: https://www.hltv.org/stats/players/18765/donk
+    """
+    soup = BeautifulSoup(html, parser)
+
+    # Pares (rótulo, valor) lidos uma única vez, na ordem da página
+    rows = []
+    for row in soup.select(".standard-box .stats-row"):
+        spans = row.select("span")
+        if len(spans) >= 2:
+            rows.append((spans[0].text.strip().lower(), spans[1].text.strip()))
+
+    def extract_stat(label_keywords):
+        """
+        Procura o valor de uma estatística com base em palavras-chave
+        """
+        for label_text, value in rows:
+            for keyword in label_keywords:
+                if keyword in label_text:
+                    return try_parse_stat(value)
+        return None
+
+    stats = {field: extract_stat(keywords) for field, keywords in PLAYER_STAT_LABELS.items()}
+
+    rating = extract_stat(["rating"])
+    if not rating:
+        rating = extract_stat(["rating 2.1"])
+
+    stats["rating"] = rating
+
+    return stats
+
+
+def extract_from_lineup_section(lineup_section):
+    """Extrai jogadores da seção de lineup"""
+    players = []
+
+    # Procura por links de jogadores na seção
+    player_links = lineup_section.find_all(
+        "a", href=re.compile(r"/(?:player|coach)/\d+/")
+    )
+
+    for link in player_links:
+        try:
+            href = link.get("href", "")
+            if not href:
+                continue
+
+            # Extrai ID e nome do jogador
+            player_match = re.search(r"/(?:player|coach)/(\d+)/([^/]+)", href)
+            if not player_match:
+                continue
+
+            player_id = int(player_match.group(1))
+            player_name = player_match.group(2)
+            player_nickname = link.get_text(strip=True)
+
+            if player_nickname and len(player_nickname) > 1:
+                players.append(
+                    {
+                        "id": player_id,
+                        "name": player_name,
+                        "nickname": player_nickname,
+                        "url": "https://www.hltv.org" + href,
+                        "role": "player",  # Será ajustado depois
+                    }
+                )
+
+        except Exception as e:
+            logger.warning("Erro ao processar link de jogador: %s", e)
+            continue
+
+    return players
+
+
+def extract_players_alternative(soup):
+    """Método alternativo para extrair jogadores quando não há seção específica"""
+    players = []
+
+    # Procura por todos os links de jogadores na página
+    player_links = soup.find_all("a", href=re.compile(r"/(?:player|coach)/\d+/"))
+
+    # Remove duplicatas baseado no ID
+    seen_ids = set()
+    unique_links = []
+
+    for link in player_links:
+        href = link.get("href", "")
+        player_match = re.search(r"/(?:player|coach)/(\d+)/([^/]+)", href)
+        if player_match:
+            player_id = int(player_match.group(1))
+            if player_id not in seen_ids:
+                seen_ids.add(player_id)
+                unique_links.append(link)
+
+    # Processa os primeiros 6 links únicos (assumindo 5 jogadores + 1 coach)
+    for link in unique_links[:6]:
+        try:
+            href = link.get("href", "")
+            player_match = re.search(r"/(?:player|coach)/(\d+)/([^/]+)", href)
+            if not player_match:
+                continue
+
+            player_id = int(player_match.group(1))
+            player_name = player_match.group(2)
+            player_nickname = link.get_text(strip=True)
+
+            if player_nickname and len(player_nickname) > 1:
+                players.append(
+                    {
+                        "id": player_id,
+                        "name": player_name,
+                        "nickname": player_nickname,
+                        "url": "https://www.hltv.org" + href,
+                        "role": "player",  # Será ajustado depois
+                    }
+                )
+
+        except Exception as e:
+            logger.warning("Erro ao processar jogador alternativo: %s", e)
+            continue
+
+    return players
+
+
+def is_likely_coach(nickname):
+    """Identifica se um nickname provavelmente pertence a um coach"""
+    coach_indicators = [
+        "coach",
+        "manager",
+        "head",
+        "assistant",
+        "staff",
+        "zonic",
+        "threat",
+        "xizt",
+        "natu",
+        "kassad",  # Coaches conhecidos
+        "blade",
+        "starix",
+        "zeus",
+        "ex6tenz",  # Mais coaches conhecidos
+    ]
+
+    nickname_lower = nickname.lower()
+
+    # Verifica se contém indicadores de coach
+    for indicator in coach_indicators:
+        if indicator in nickname_lower:
+            return True
+
+    return False
+
+
+def get_team_achievements(team_soup):
+    """
+    Coleta todas as conquistas/troféus de um time e formata para o modelo TeamAchievement
+    Retorna lista de dicionários prontos para criação de objetos TeamAchievement
+    """
+    achievements = []
+
+    trophy_row = team_soup.find("div", class_="trophyRow")
+    if not trophy_row:
+        return achievements
+
+    for trophy in trophy_row.find_all(["a", "div"], class_="trophy"):
+        try:
+            img = trophy.find("img", class_="trophyIcon")
+            if not img:
+                continue
+
+            # Extrai título e verifica se é um Major
+            title_span = trophy.find("span", class_="trophyDescription")
+            is_major = "majorTrophy" in title_span.get("class", [])
+            title = title_span.get("title", "")
+
+            # Extrai o ano do título
+            year = None
+            year_match = re.search(r"\b(20\d{2})\b", title)
+            if year_match:
+                year = int(year_match.group(1))
+
+            # Determina o tier do evento
+            event_tier = "S-Tier"  # Valor padrão
+            if is_major:
+                event_tier = "Major"
+            elif "blast" in title.lower():
+                event_tier = "S-Tier"
+            elif "iem" in title.lower():
+                event_tier = "S-Tier"
+            elif "esl" in title.lower():
+                event_tier = "A-Tier"
+
+            # Formata a URL da imagem
+            image_url = img["src"]
+            if image_url.startswith("/"):
+                image_url = "https://www.hltv.org" + image_url
+
+            achievement_data = {
+                "title": title,
+                "event_name": title.split(" ")[0] if title else None,  # Nome simplificado do evento
+                "year": year,
+                "placement": "1st",  # Assume primeiro lugar
+                "trophy_image_url": image_url,
+                "event_tier": event_tier
+            }
+
+            # Se for um link, pega a URL do evento
+            if trophy.name == "a" and trophy.has_attr("href"):
+                achievement_data["event_url"] = "https://www.hltv.org" + trophy["href"]
+
+            achievements.append(achievement_data)
+
+        except Exception as e:
+            logger.warning("Erro ao processar troféu: %s", e)
+            continue
+
+    return achievements
+
+
+def get_player_achievements(player_soup):
+    """
+    Coleta todas as conquistas/troféus de um jogador e formata para o modelo PlayerAchievement
+    Retorna lista de dicionários prontos para criação de objetos PlayerAchievement
+
+    Args:
+        player_soup: BeautifulSoup object da página do jogador
+
+    Returns:
+        Lista de dicionários com informações dos troféus
+    """
+    achievements = []
+
+    trophy_row = player_soup.find("div", class_="trophyRow")
+    if not trophy_row:
+        return achievements
+
+    for trophy in trophy_row.find_all(["a", "div"], class_="trophy"):
+        try:
+            img = trophy.find("img", class_="trophyIcon")
+            if not img:
+                continue
+
+            # Extrai título e verifica se é um Major
+            title_span = trophy.find("span", class_="trophyDescription")
+            is_major = "majorTrophy" in title_span.get("class", []) if title_span else False
+            title = title_span.get("title", "") if title_span else ""
+
+            # Extrai o ano do título (se for um prêmio anual)
+            year = None
+            award_year = trophy.find("span", class_="award-year")
+            if award_year:
+                year = int(award_year.text.strip().replace("'", "20"))
+            else:
+                year_match = re.search(r"\b(20\d{2})\b", title)
+                if year_match:
+                    year = int(year_match.group(1))
+
+            # Determina o tipo de conquista
+            achievement_type = "tournament"  # Padrão para torneios
+            if "best player" in title.lower() or "award" in title.lower():
+                achievement_type = "individual_award"
+            elif "igl of the year" in title.lower():
+                achievement_type = "panel_award"
+
+            # Determina o tier do evento (para torneios)
+            event_tier = "S-Tier"  # Valor padrão
+            if is_major:
+                event_tier = "Major"
+            elif "blast" in title.lower():
+                event_tier = "S-Tier"
+            elif "iem" in title.lower():
+                event_tier = "S-Tier"
+            elif "esl" in title.lower():
+                event_tier = "A-Tier"
+            elif "dreamhack" in title.lower():
+                event_tier = "A-Tier"
+
+            # Formata a URL da imagem
+            image_url = img["src"]
+            if image_url.startswith("/"):
+                image_url = "https://www.hltv.org" + image_url
+
+            achievement_data = {
+                "title": title,
+                "event_name": title.split(" ")[0] if title else None,
+                "year": year,
+                "achievement_type": achievement_type,
+                "trophy_image_url": image_url,
+                "event_tier": event_tier if achievement_type == "tournament" else None,
+                "placement": "1st" if achievement_type == "tournament" else None,
+                "individual_award_type": achievement_type if achievement_type != "tournament" else None
+            }
+
+            # Se for um link, pega a URL do evento
+            if trophy.name == "a" and trophy.has_attr("href"):
+                achievement_data["event_url"] = "https://www.hltv.org" + trophy["href"]
+
+            achievements.append(achievement_data)
+
+        except Exception as e:
+            logger.warning("Erro ao processar troféu do jogador: %s", e)
+            continue
+
+    return achievements
+
+
+def get_team_stats(team_soup):
+    """
+    Coleta estatísticas do time como win rate, etc.
+    """
+    stats = {
+        'win_rate': None,
+    }
+
+    try:
+        matches_tab = team_soup.find("div", {"id": "matchesBox"})
+        if not matches_tab:
+            return stats
+
+        win_rate_div = matches_tab.findAll("div", class_="highlighted-stat")[1]
+        if win_rate_div:
+            stat_div = win_rate_div.find("div", class_="stat")
+            stats['win_rate'] = float(stat_div.text.strip().replace('%', ''))
+
+        stats_tab = team_soup.find("div", {"id": "statsBox"})
+        if not stats_tab:
+            return stats
+
+
+    except Exception as e:
+        logger.warning("Erro ao coletar estatísticas do time: %s", e)
+
+    return stats
+
+
+def get_team_map_stats(team_soup):
+    """
+    Coleta estatísticas dos mapas do time a partir do HTML
+    Retorna lista de dicionários com os dados dos mapas
+    """
+    maps = []
+
+    try:
+        map_stats_div = team_soup.find("div", {"class": "map-statistics"})
+        if not map_stats_div:
+            return maps
+
+        for map_container in map_stats_div.find_all("div", {"class": "map-statistics-container"}):
+            try:
+                # Informações básicas do mapa
+                map_row = map_container.find("div", {"class": "map-statistics-row"})
+                map_name = map_row.find("div", {"class": "map-statistics-row-map-mapname"}).text.strip()
+                win_percentage = float(
+                    map_row.find("div", {"class": "map-statistics-row-win-percentage"}).text.strip('%'))
+
+                # Informações estendidas (podem estar ocultas)
+                extended_div = map_container.find("div", {"class": "map-statistics-extended"})
+
+                # Win/Draw/Loss
+                wdl = extended_div.find("div", {"class": "map-statistics-extended-wdl"})
+                wins = int(wdl.find_all("div", {"class": "stat"})[0].text.strip())
+                draws = int(wdl.find_all("div", {"class": "stat"})[1].text.strip())
+                losses = int(wdl.find_all("div", {"class": "stat"})[2].text.strip())
+
+                # Estatísticas gerais
+                general_stats = {}
+                for stat in extended_div.find_all("div", {"class": "map-statistics-extended-general-stat"}):
+                    stat_name = stat.find("div").text.strip()
+                    stat_value = stat.find_all("div")[1].text.strip('%')
+                    general_stats[stat_name] = float(stat_value) if '%' in stat.find_all("div")[1].text else stat_value
+
+                # Veto data
+                veto_data = {}
+                veto_container = extended_div.find("div", {"class": "map-statistics-extended-highlight-veto-container"})
+                if veto_container:
+                    picks_text = \
+                    veto_container.find_all("div", {"class": "map-statistics-extended-highlight-veto"})[0].find_all(
+                        "div")[1].text
+                    bans_text = \
+                    veto_container.find_all("div", {"class": "map-statistics-extended-highlight-veto"})[1].find_all(
+                        "div")[1].text
+
+                    veto_data["picks_percentage"] = float(picks_text.split('%')[0]) if '%' in picks_text else 0
+                    veto_data["bans_percentage"] = float(bans_text.split('%')[0]) if '%' in bans_text else 0
+
+                # Calcular rounds totais e win rates
+                total_rounds = wins + draws + losses
+                round_win_rate = (wins / total_rounds * 100) if total_rounds > 0 else 0
+
+                # Separar CT e T rounds (simplificado - na prática precisaria de scraping mais detalhado)
+                ct_rounds = int(wins * 0.6)  # Aproximação - ajuste conforme dados reais
+                t_rounds = wins - ct_rounds
+                ct_win_rate = (ct_rounds / wins * 100) if wins > 0 else 0
+                t_win_rate = (t_rounds / wins * 100) if wins > 0 else 0
+
+                maps.append({
+                    "map_name": map_name,
+                    "matches_played": total_rounds,
+                    "matches_won": wins,
+                    "win_rate": win_percentage,
+                    "rounds_played": total_rounds * 30,  # Aproximação - 30 rounds por partida
+                    "rounds_won": wins * 16,  # Aproximação - 16 rounds para vencer
+                    "round_win_rate": round_win_rate,
+                    "ct_rounds_won": ct_rounds,
+                    "t_rounds_won": t_rounds,
+                    "ct_win_rate": ct_win_rate,
+                    "t_win_rate": t_win_rate,
+                    "general_stats": general_stats,
+                    "veto_data": veto_data
+                })
+
+            except Exception as e:
+                logger.warning("Erro ao processar mapa: %s", e)
+                continue
+
+    except Exception as e:
+        logger.warning("Erro ao coletar estatísticas dos mapas do time: %s", e)
+
+    return maps
+
+
+def extract_teams_alternative(soup):
+    """
+    Método alternativo para extrair times quando a estrutura padrão não funciona
+    """
+    logger.info("Tentando método alternativo de extração...")
+
+    teams = []
+    # Implementação de um método alternativo, se necessário
+    return teams
+
+
+# Adicione estas funções de parse para evitar erros de NameError
+def try_parse_float(value):
+    try:
+        return float(value.replace("%", "").replace(",", "."))
+    except:
+        return None
+
+
+def try_parse_int(value):
+    try:
+        return int(value.replace(".", ""))
+    except:
+        return None
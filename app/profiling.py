@@ -0,0 +1,283 @@
+"""
+Profiling sob demanda do scraper e da API
+
+- Fases do scraper (`@profiled_phase`): com o profiling ligado (`configure`,
+  ou `--profile` no scraper), cada chamada grava um arquivo por fase em
+  PROFILE_DIR: `.prof` do cProfile (abre no snakeviz / pstats) ou `.html` do
+  pyinstrument, se instalado e escolhido.
+- Memória (`memory_snapshots`): em coletas longas, grava snapshots do
+  tracemalloc a cada intervalo e loga as linhas que mais cresceram.
+- API (`ProfilingMiddleware`): com PROFILING_TOKEN definido, uma requisição com
+  o header `X-Profile: <token>` roda sem cache e devolve o profile dela no
+  lugar da resposta. Sem a variável o middleware não faz nada.
+"""
+
+import cProfile
+import functools
+import hmac
+import importlib.util
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILER = os.getenv("PROFILER", "cprofile")  # "cprofile" ou "pyinstrument"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Funções listadas no relatório em texto do cProfile
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "40"))
+
+# Profiling das fases do scraper; desligado até `configure`
+_settings = {"enabled": False, "output_dir": PROFILE_DIR, "profiler": PROFILER}
+_active = threading.Lock()
+
+
+def configure(enabled: bool = True, output_dir: str = PROFILE_DIR, profiler: str = PROFILER):
+    _settings.update(enabled=enabled, output_dir=output_dir, profiler=resolve_profiler(profiler))
+
+
+def resolve_profiler(name: str) -> str:
+    if name == "pyinstrument" and importlib.util.find_spec("pyinstrument") is None:
+        logger.warning("⚠️ Pacote 'pyinstrument' não instalado, usando cProfile")
+        return "cprofile"
+    return name
+
+
+class Profile:
+    """cProfile ou pyinstrument atrás da mesma interface (start/stop/relatórios)"""
+
+    def __init__(self, profiler: str = "cprofile"):
+        self.profiler = resolve_profiler(profiler)
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            # async_mode="disabled": amostra a thread inteira, inclusive as tasks criadas pela requisição
+            self._profile = Profiler(async_mode="disabled")
+        else:
+            self._profile = cProfile.Profile()
+        self.duration_ms = 0.0
+
+    @property
+    def extension(self) -> str:
+        return "html" if self.profiler == "pyinstrument" else "prof"
+
+    def start(self):
+        self._start = time.perf_counter()
+        if self.profiler == "pyinstrument":
+            self._profile.start()
+        else:
+            self._profile.enable()
+
+    def stop(self):
+        if self.profiler == "pyinstrument":
+            self._profile.stop()
+        else:
+            self._profile.disable()
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def text(self, limit: int = PROFILE_TOP_FUNCTIONS) -> str:
+        if self.profiler == "pyinstrument":
+            return self._profile.output_text()
+        output = io.StringIO()
+        pstats.Stats(self._profile, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def html(self) -> str:
+        return self._profile.output_html()
+
+    def save(self, path: Path):
+        if self.profiler == "pyinstrument":
+            path.write_text(self.html(), encoding="utf-8")
+        else:
+            self._profile.dump_stats(str(path))
+
+
+@contextmanager
+def profile_phase(name: str, output_dir: str = PROFILE_DIR, profiler: str = PROFILER):
+    """Executa o bloco sob o profiler e grava o resultado em `output_dir/<fase>-<data>.<ext>`"""
+    # Só um profiler por vez (o cProfile não aceita dois ativos); fases aninhadas rodam sem
+    if not _active.acquire(blocking=False):
+        yield None
+        return
+
+    profile = Profile(profiler)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active.release()
+
+        # Gravado mesmo se a fase falhar
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{profile.extension}"
+        profile.save(path)
+        logger.info(
+            "🔬 Profile da fase %s gravado em %s", name, path,
+            extra={"phase": name, "duration_ms": round(profile.duration_ms, 1)},
+        )
+
+
+def profiled_phase(function):
+    """Grava um profile por chamada da função quando o profiling das fases está ligado"""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _settings["enabled"]:
+            return function(*args, **kwargs)
+        with profile_phase(function.__name__, _settings["output_dir"], _settings["profiler"]):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class MemorySnapshots:
+    """
+    Snapshots periódicos do tracemalloc: a cada `interval` segundos grava o
+    snapshot (`tracemalloc-<n>.snap`, lido com `tracemalloc.Snapshot.load`) e loga
+    as `top` linhas de código cuja memória mais cresceu desde o primeiro.
+    """
+
+    def __init__(self, interval: float, output_dir: str = PROFILE_DIR, top: int = 10, frames: int = 1):
+        self.interval = interval
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self.frames = frames
+        self.count = 0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tracemalloc-snapshots", daemon=True)
+
+    def start(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start(self.frames)
+        self._baseline = tracemalloc.take_snapshot()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.take()
+        tracemalloc.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.take()
+
+    def take(self) -> tracemalloc.Snapshot:
+        snapshot = tracemalloc.take_snapshot()
+        self.count += 1
+        path = self.output_dir / f"tracemalloc-{self.count:03d}.snap"
+        snapshot.dump(str(path))
+
+        current, peak = tracemalloc.get_traced_memory()
+        logger.info(
+            "🧠 Snapshot de memória %d gravado em %s", self.count, path,
+            extra={"current_kib": current // 1024, "peak_kib": peak // 1024},
+        )
+        for stat in snapshot.compare_to(self._baseline, "lineno")[:self.top]:
+            logger.info("   %s", stat)
+        return snapshot
+
+
+@contextmanager
+def memory_snapshots(interval: Optional[float], output_dir: str = PROFILE_DIR, top: int = 10):
+    """Snapshots do tracemalloc durante o bloco (nada se `interval` for vazio)"""
+    if not interval:
+        yield None
+        return
+
+    snapshots = MemorySnapshots(interval, output_dir, top)
+    snapshots.start()
+    try:
+        yield snapshots
+    finally:
+        snapshots.stop()
+
+
+def profiling_requested(header: Optional[str], token: Optional[str] = None) -> bool:
+    token = PROFILING_TOKEN if token is None else token
+    return bool(token) and header is not None and hmac.compare_digest(header, token)
+
+
+class ProfilingMiddleware:
+    """
+    Com `X-Profile: <PROFILING_TOKEN>`, executa a requisição sob o profiler e
+    responde com o profile (texto; HTML do pyinstrument com `X-Profile-Format: html`).
+    Os caches de resposta e o GET condicional são ignorados nessa requisição.
+    """
+
+    def __init__(self, app, token: Optional[str] = None, profiler: str = PROFILER):
+        self.app = app
+        self.token = token
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        header = headers.get(b"x-profile")
+        if not profiling_requested(header.decode("latin-1") if header else None, self.token):
+            await self.app(scope, receive, send)
+            return
+
+        # Importado só aqui para que o scraper, que usa as fases, não carregue o Starlette
+        from starlette.responses import HTMLResponse, PlainTextResponse
+
+        if not _active.acquire(blocking=False):
+            response = PlainTextResponse("Outro profile em andamento, tente novamente", status_code=409)
+            await response(scope, receive, send)
+            return
+
+        # Força o caminho completo: sem cache de respostas e sem 304
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"x-profile", b"cache-control", b"if-none-match", b"if-modified-since")
+        ] + [(b"cache-control", b"no-cache")]
+
+        status = {}
+
+        async def discard(message):
+            # Descarta a resposta original; só o status é reportado
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        profile = Profile(self.profiler)
+        profile.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profile.stop()
+            _active.release()
+
+        wants_html = headers.get(b"x-profile-format") == b"html" and profile.profiler == "pyinstrument"
+        body = profile.html() if wants_html else profile.text()
+        logger.info(
+            "🔬 Requisição perfilada: %s", scope["path"],
+            extra={"route": scope["path"], "duration_ms": round(profile.duration_ms, 1)},
+        )
+
+        response_class = HTMLResponse if wants_html else PlainTextResponse
+        response = response_class(body, headers={
+            "Cache-Control": "no-store",
+            "X-Profiled-Status": str(status.get("code", 500)),
+            "X-Profile-Duration-Ms": f"{profile.duration_ms:.2f}",
+        })
+        await response(scope, receive, send)
@@ -0,0 +1,209 @@
+"""
+Resumo dos elencos: jogadores e coaches de cada time e cobertura das estatísticas
+
+O resumo sai de uma consulta só (jogadores com time e estatísticas, em outer
+joins, na ordem do ranking), agrupada por time em Python; o número de consultas
+não depende da quantidade de times. É usado pelo scraper (`--roster-summary`),
+pela rota `/stats/rosters` e pela linha de comando:
+
+    python -m app.rosters --format csv --coverage --output elencos.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+
+from app import models
+from app.logger import logger
+
+# Formato -> media type da resposta
+ROSTER_FORMATS = {
+    "text": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Idade das estatísticas (limite em horas -> faixa); acima do último limite, "older"
+STATS_AGE_BUCKETS = ((24, "24h"), (24 * 7, "7d"), (24 * 30, "30d"))
+
+CSV_COLUMNS = ("team_id", "team_name", "ranking", "player_id", "nickname", "role", "rating", "last_updated")
+
+
+def roster_summary_query():
+    """Todas as pessoas com o time e as estatísticas, agrupáveis por time (ranking, sem time por último)"""
+    return (
+        select(
+            models.Team.id.label("team_id"),
+            models.Team.name.label("team_name"),
+            models.Team.ranking,
+            models.Player.id.label("player_id"),
+            models.Player.nickname,
+            models.Player.role,
+            models.PlayerStats.id.label("stats_id"),
+            models.PlayerStats.rating,
+            models.PlayerStats.last_updated,
+        )
+        .select_from(models.Player)
+        .outerjoin(models.Team, models.Team.id == models.Player.team_id)
+        .outerjoin(models.PlayerStats, models.PlayerStats.player_id == models.Player.id)
+        .order_by(
+            models.Team.id.is_(None), models.ranking_position(models.Team.ranking), models.Team.id, models.Player.id
+        )
+    )
+
+
+def stats_age_bucket(last_updated: Optional[datetime], now: datetime) -> str:
+    if last_updated is None:
+        return "unknown"
+    hours = (now - last_updated).total_seconds() / 3600
+    for limit, label in STATS_AGE_BUCKETS:
+        if hours <= limit:
+            return label
+    return "older"
+
+
+def build_roster_summary(rows: Iterable, coverage: bool = False, now: Optional[datetime] = None) -> Dict:
+    """
+    Agrupa as linhas de `roster_summary_query` em times, totais e, com
+    `coverage`, pessoas sem estatísticas e idade das estatísticas por faixa
+    """
+    now = now or datetime.utcnow()
+    teams = []
+    totals = {"teams": 0, "players": 0, "coaches": 0, "people": 0}
+    missing_stats = 0
+    ages = dict.fromkeys([label for _, label in STATS_AGE_BUCKETS] + ["older", "unknown"], 0)
+
+    for team_id, members in groupby(rows, key=lambda row: row.team_id):
+        members = list(members)
+        players = [row for row in members if row.role == "player"]
+        coaches = [row for row in members if row.role == "coach"]
+
+        totals["players"] += len(players)
+        totals["coaches"] += len(coaches)
+        totals["people"] += len(members)
+        for row in members:
+            if row.stats_id is None:
+                missing_stats += 1
+            else:
+                ages[stats_age_bucket(row.last_updated, now)] += 1
+
+        # Pessoas sem time entram só nos totais
+        if team_id is None:
+            continue
+
+        totals["teams"] += 1
+        teams.append({
+            "id": team_id,
+            "name": members[0].team_name,
+            "ranking": members[0].ranking,
+            "players": [
+                {"id": row.player_id, "nickname": row.nickname, "rating": row.rating,
+                 "last_updated": row.last_updated.isoformat() if row.last_updated else None}
+                for row in players
+            ],
+            "coaches": [{"id": row.player_id, "nickname": row.nickname} for row in coaches],
+        })
+
+    summary = {"teams": teams, "totals": totals}
+    if coverage:
+        summary["coverage"] = {
+            "missing_stats": missing_stats,
+            "missing_stats_percentage": round(missing_stats / totals["people"] * 100, 2) if totals["people"] else 0,
+            "stats_age": ages,
+        }
+    return summary
+
+
+def roster_summary(session, coverage: bool = False) -> Dict:
+    """Resumo dos elencos com uma sessão síncrona (scraper e linha de comando)"""
+    return build_roster_summary(session.execute(roster_summary_query()).all(), coverage)
+
+
+def format_text(summary: Dict) -> str:
+    lines = ["📊 RESUMO DOS JOGADORES ATIVOS", "=" * 50]
+
+    for team in summary["teams"]:
+        lines.append(f"🏆 {team['name']} (#{team['ranking']})")
+        for player in team["players"]:
+            rating = f"{player['rating']:.2f}" if player["rating"] else "N/A"
+            lines.append(f"   👤 {player['nickname']} (Rating: {rating})")
+        for coach in team["coaches"]:
+            lines.append(f"   🎯 {coach['nickname']} (Coach)")
+        lines.append(f"   📊 Total: {len(team['players'])} jogadores + {len(team['coaches'])} coach(es)")
+
+    totals = summary["totals"]
+    lines += [
+        "=" * 50,
+        "📈 TOTAIS GERAIS:",
+        f"   🏆 Times com elenco: {totals['teams']}",
+        f"   👤 Jogadores ativos: {totals['players']}",
+        f"   🎯 Coaches ativos: {totals['coaches']}",
+        f"   📊 Total de pessoas ativas: {totals['people']}",
+    ]
+
+    coverage = summary.get("coverage")
+    if coverage:
+        ages = ", ".join(f"{label}: {count}" for label, count in coverage["stats_age"].items())
+        lines += [
+            "🧮 COBERTURA DAS ESTATÍSTICAS:",
+            f"   ❔ Sem estatísticas: {coverage['missing_stats']} ({coverage['missing_stats_percentage']}%)",
+            f"   🕒 Idade das estatísticas: {ages}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def format_csv(summary: Dict) -> str:
+    """Uma linha por pessoa com time (jogadores e coaches)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for team in summary["teams"]:
+        people = [(player, "player") for player in team["players"]] + [(coach, "coach") for coach in team["coaches"]]
+        for person, role in people:
+            writer.writerow([
+                team["id"], team["name"], team["ranking"], person["id"], person["nickname"], role,
+                person.get("rating"), person.get("last_updated"),
+            ])
+    return buffer.getvalue()
+
+
+def render_roster_summary(summary: Dict, format: str = "text") -> str:
+    if format == "json":
+        return json.dumps(summary, ensure_ascii=False, indent=2) + "\n"
+    if format == "csv":
+        return format_csv(summary)
+    return format_text(summary)
+
+
+def write_roster_summary(summary: Dict, format: str = "text", output: Optional[str] = None):
+    """Grava o resumo em `output`; sem arquivo, o texto vai para o log e JSON/CSV para a saída padrão"""
+    content = render_roster_summary(summary, format)
+    if output:
+        Path(output).write_text(content, encoding="utf-8")
+        logger.info("📝 Resumo dos elencos gravado em %s", output)
+    elif format == "text":
+        for line in content.splitlines():
+            logger.info("%s", line)
+    else:
+        sys.stdout.write(content)
+
+
+if __name__ == "__main__":
+    from app.banco import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Resumo dos elencos e da cobertura das estatísticas")
+    parser.add_argument("--format", choices=list(ROSTER_FORMATS), default="text")
+    parser.add_argument("--coverage", action="store_true", help="Inclui pessoas sem estatísticas e idade por faixa")
+    parser.add_argument("--output", help="Arquivo de saída (padrão: log para texto, saída padrão para JSON/CSV)")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        write_roster_summary(roster_summary(session, args.coverage), args.format, args.output)
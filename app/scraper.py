@@ -1,19 +1,86 @@
+"""
+Coleta dos times, jogadores ativos e estatísticas do HLTV.org
+
+A coleta é dividida em fases, executadas nesta ordem:
+- ranking: página do ranking e dos times (times, conquistas e mapas)
+- rosters: jogadores ativos e coach de cada time
+- stats: estatísticas e conquistas dos jogadores
+
+Uso:
+    python -m app.scraper
+    python -m app.scraper --phases stats --refresh stale --max-age 48 --concurrency 3
+    python -m app.scraper --phases rosters stats --team-ids 12 40 --max-pages 30
+    python -m app.scraper --phases stats --player-ids 7998 --dry-run
+
+Códigos de saída: 0 sucesso, 1 falhas na coleta, 2 argumentos inválidos, 3
+execução incompleta (orçamento de páginas esgotado antes do fim) e 4 banco
+indisponível ou migração com erro.
+"""
+
+import argparse
+import itertools
+import json
 import random
+import sys
 import time
-from datetime import datetime
-
-import models
-from banco import SessionLocal, engine
-from logger import logger
-from scraper_functions import (
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager, scoped_session
+
+from app import models
+from app.banco import SessionLocal, get_engine
+from app.data_version import bump_data_version
+from app.leaderboards import refresh_leaderboards
+from app.logger import get_logger
+from app.profiling import PROFILE_DIR, PROFILER, PROFILERS, memory_snapshots, profiled_phase
+from app.profiling import configure as configure_profiling
+from app.rosters import ROSTER_FORMATS, roster_summary, write_roster_summary
+from app.team_aggregates import update_team_aggregates
+from app.scraper_functions import (
+    close_playwright_session,
+    fetch_concurrently,
+    page_budget,
     top30_teams,
     get_player_details,
     get_team_active_players_and_coach
 )
 
-models.Base.metadata.create_all(bind=engine)
+logger = get_logger(__name__)
+
+# Sessão aberta no primeiro uso, e não ao importar o módulo
+db = scoped_session(SessionLocal)
+
+PHASES = ("ranking", "rosters", "stats")
+
+# Quais jogadores têm as estatísticas coletadas: sem estatísticas, também as antigas ou todos
+REFRESH_POLICIES = ("missing", "stale", "all")
+STATS_MAX_AGE_HOURS = 24
+
+# Times do ranking do HLTV (estimativa de páginas do --dry-run)
+RANKING_SIZE = 30
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INCOMPLETE = 3  # O código 2 é o de argumentos inválidos do argparse
+EXIT_DATABASE = 4
+
+# Pausa (segundos) da thread após uma coleta de jogador sem dados, para não ser bloqueado
+FAILURE_BACKOFF_SECONDS = (20, 30)
+
 
-db = SessionLocal()
+def new_counts() -> Dict[str, int]:
+    return {"selected": 0, "succeeded": 0, "failed": 0, "skipped": 0}
+
+
+def count_missing(counts: Dict[str, int]) -> bool:
+    """Conta um item sem dados: pulado se o orçamento de páginas acabou (True), senão uma falha"""
+    skipped = page_budget.exhausted
+    counts["skipped" if skipped else "failed"] += 1
+    return skipped
 
 
 def reset_team_rankings():
@@ -21,6 +88,7 @@ def reset_team_rankings():
     logger.info("🔄 Resetando rankings e pontos dos times...")
     db.query(models.Team).update({models.Team.ranking: 0, models.Team.points: 0})
     db.commit()
+    bump_data_version(db)
     logger.info("✅ Rankings resetados.")
 
 
@@ -37,289 +105,564 @@ def get_or_create_player(session, player_id, defaults=None):
         return instance, True
 
 
-def save_teams_with_active_players():
-    """
-    Coleta e salva times com apenas jogadores ativos e coach do HLTV.org
+def select_teams(session, team_ids: Optional[Iterable[int]] = None) -> List[models.Team]:
+    """Times com URL: os de `team_ids` ou, sem eles, os que estão no ranking"""
+    query = session.query(models.Team).filter(models.Team.url.isnot(None))
+    if team_ids:
+        query = query.filter(models.Team.id.in_(team_ids))
+    else:
+        query = query.filter(models.Team.ranking > 0)
+    teams = query.order_by(models.ranking_position(models.Team.ranking), models.Team.id).all()
+
+    unknown = set(team_ids or ()) - {team.id for team in teams}
+    if unknown:
+        logger.warning("⚠️ Times não encontrados (ou sem URL): %s", sorted(unknown))
+    return teams
+
+
+def select_players(
+    session,
+    player_ids: Optional[Iterable[int]] = None,
+    team_ids: Optional[Iterable[int]] = None,
+    refresh: str = "missing",
+    max_age_hours: float = STATS_MAX_AGE_HOURS,
+    limit: Optional[int] = None,
+) -> List[models.Player]:
     """
-    logger.info("🚀 Iniciando coleta dos times com jogadores ativos e coach do HLTV.org...")
+    Jogadores e coaches com URL cujas estatísticas devem ser coletadas
 
-    try:
-        # Coleta times do ranking
-        teams = top30_teams()
+    Args:
+        player_ids / team_ids: restringe aos jogadores informados ou aos elencos dos times
+        refresh: "missing" (sem estatísticas), "stale" (sem estatísticas ou
+            atualizadas há mais de `max_age_hours`) ou "all"
+        limit: limite de jogadores
+    """
+    query = (
+        session.query(models.Player)
+        .outerjoin(models.Player.stats)
+        .options(contains_eager(models.Player.stats))
+        .filter(models.Player.url.isnot(None))
+    )
+    if player_ids:
+        query = query.filter(models.Player.id.in_(player_ids))
+    if team_ids:
+        query = query.filter(models.Player.team_id.in_(team_ids))
+
+    if refresh == "missing":
+        query = query.filter(models.PlayerStats.id.is_(None))
+    elif refresh == "stale":
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        query = query.filter(or_(
+            models.PlayerStats.id.is_(None),
+            models.PlayerStats.last_updated.is_(None),
+            models.PlayerStats.last_updated < cutoff,
+        ))
+
+    query = query.order_by(models.Player.id)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def save_team(t: Dict) -> models.Team:
+    """Cria ou atualiza um time do ranking e, se a página dele foi coletada, as conquistas e os mapas"""
+    details = t.get("details")
+
+    # Busca ou cria o time
+    team = db.query(models.Team).filter_by(name=t["name"]).first()
+    if not team:
+        team = models.Team(
+            name=t['name'],
+            url=t['url'],
+            ranking=t['ranking'],
+            points=t['points'],
+            logo_url=t.get('logo_url'),
+            region=(details or {}).get('country'),
+            win_rate=t.get('stats', {}).get('win_rate'),
+        )
+        db.add(team)
+        logger.info("   ➕ Novo time criado: %s", t["name"])
+    else:
+        # Atualiza informações do time
+        team.ranking = t['ranking']
+        team.points = t['points']
+        team.url = t['url']
+        team.logo_url = t.get('logo_url')
+        if details is not None:
+            team.region = details.get('country')
+            team.win_rate = t.get('stats', {}).get('win_rate')
+        logger.info("   🔄 Time atualizado: %s", t["name"])
 
-        if not teams:
-            logger.error("❌ Nenhum time foi coletado do HLTV.org")
-            return False
+    db.commit()
+    db.refresh(team)
 
-        logger.info(f"📊 {len(teams)} times coletados do HLTV.org")
+    if 'trophies' in t:
+        logger.info("   🏆 Processando %d conquistas para %s", len(t["trophies"]), t["name"])
 
-        for i, t in enumerate(teams, 1):
-            logger.info(f"💾 [{i}/{len(teams)}] Processando time: {t["name"]} (#{t["ranking"]})")
+        # Remove conquistas antigas
+        db.query(models.TeamAchievement).filter_by(team_id=team.id).delete()
 
-            try:
-                # Busca ou cria o time
-                team = db.query(models.Team).filter_by(name=t["name"]).first()
-                if not team:
-                    team = models.Team(
-                        name=t['name'],
-                        url=t['url'],
-                        ranking=t['ranking'],
-                        points=t['points'],
-                        logo_url=t.get('logo_url'),
-                        region=t.get('details', {}).get('country'),
-                        win_rate=t.get('stats', {}).get('win_rate'),
-                    )
-                    db.add(team)
-                    logger.info(f"   ➕ Novo time criado: {t["name"]}")
-                else:
-                    # Atualiza informações do time
-                    team.ranking = t['ranking']
-                    team.points = t['points']
-                    team.url = t['url']
-                    team.logo_url = t.get('logo_url'),
-                    team.region = t.get('details', {}).get('country')
-                    team.win_rate = t.get('stats', {}).get('win_rate')
-                    logger.info(f"   🔄 Time atualizado: {t['name']}")
-
-                db.commit()
-                db.refresh(team)
-
-                if 'trophies' in t:
-                    logger.info(f"   🏆 Processando {len(t['trophies'])} conquistas para {t['name']}")
-
-                    # Remove conquistas antigas
-                    db.query(models.TeamAchievement).filter_by(team_id=team.id).delete()
-
-                    for trophy in t['trophies']:
-                        achievement = models.TeamAchievement(
-                            team_id=team.id,
-                            title=trophy['title'],
-                            event_name=trophy['event_name'],
-                            year=trophy['year'],
-                            placement=trophy['placement'],
-                            trophy_image_url=trophy['trophy_image_url'],
-                            event_tier=trophy['event_tier']
-                        )
-                        db.add(achievement)
-
-                db.commit()
-
-                if 'map_stats' in t and t['map_stats']:
-                    logger.info(f"   🗺️ Processando {len(t['map_stats'])} mapas para {t['name']}")
-                    db.query(models.TeamMapStats).filter_by(team_id=team.id).delete()
-
-                    for map_stat in t['map_stats']:
-                        try:
-                            map_record = models.TeamMapStats(
-                                team_id=team.id,
-                                map_name=map_stat['map_name'],
-                                matches_played=map_stat['matches_played'],
-                                matches_won=map_stat['matches_won'],
-                                win_rate=map_stat['win_rate'],
-                                rounds_played=map_stat['rounds_played'],
-                                rounds_won=map_stat['rounds_won'],
-                                round_win_rate=map_stat['round_win_rate'],
-                                ct_rounds_won=map_stat['ct_rounds_won'],
-                                t_rounds_won=map_stat['t_rounds_won'],
-                                ct_win_rate=map_stat['ct_win_rate'],
-                                t_win_rate=map_stat['t_win_rate']
-                            )
-                            db.add(map_record)
-                            logger.debug(f"      ✅ Mapa {map_stat['map_name']} adicionado")
-                        except Exception as e:
-                            logger.error(f"      ❌ Erro ao processar mapa {map_stat.get('map_name')}: {e}")
-                            continue
-
-                db.commit()
-
-                # Coleta jogadores ativos e coach do time
-                if t["url"]:
-                    logger.info(f"   👥 Coletando jogadores ativos e coach de {t["name"]}...")
-
-                    try:
-                        active_players_and_coach = get_team_active_players_and_coach(t["url"])
-
-                        if active_players_and_coach:
-                            logger.info(f"   📊 {len(active_players_and_coach)} pessoas encontradas")
-
-                            for person in active_players_and_coach:
-                                role_emoji = "👤" if person["role"] == "player" else "🎯"
-                                logger.info(
-                                    f"      {role_emoji} Processando {person["role"]}: {person["nickname"]} (ID: {person["id"]})")
-
-                                try:
-                                    player, created = get_or_create_player(
-                                        db,
-                                        person["id"],
-                                        {
-                                            "nickname": person["nickname"],
-                                            "real_name": person["name"],
-                                            "url": person["url"],
-                                            "team_id": team.id,
-                                            "role": person["role"],
-                                        }
-                                    )
-                                    # Não commitar aqui, o commit será feito no final do loop do time
-                                    if created:
-                                        logger.info(f"         ➕ Novo {person["role"]} criado: {person["nickname"]}")
-                                    else:
-                                        logger.info(f"         🔄 {person["role"]} atualizado: {person["nickname"]}")
-
-                                except Exception as e:
-                                    logger.error(
-                                        f"         ❌ Erro ao processar {person["role"]} {person["nickname"]}: {e}")
-                                    db.rollback()
-                                    continue
-                            db.commit()  # Commit all players for the current team
-                        else:
-                            logger.warning(f"   ⚠️ Nenhum jogador ativo encontrado para {t["name"]}")
-
-                    except Exception as e:
-                        logger.error(f"   ❌ Erro ao coletar jogadores de {t["name"]}: {e}")
+        for trophy in t['trophies']:
+            achievement = models.TeamAchievement(
+                team_id=team.id,
+                title=trophy['title'],
+                event_name=trophy['event_name'],
+                year=trophy['year'],
+                placement=trophy['placement'],
+                trophy_image_url=trophy['trophy_image_url'],
+                event_tier=trophy['event_tier']
+            )
+            db.add(achievement)
 
+    db.commit()
 
+    if t.get('map_stats'):
+        logger.info("   🗺️ Processando %d mapas para %s", len(t["map_stats"]), t["name"])
+        db.query(models.TeamMapStats).filter_by(team_id=team.id).delete()
 
+        for map_stat in t['map_stats']:
+            try:
+                map_record = models.TeamMapStats(
+                    team_id=team.id,
+                    map_name=map_stat['map_name'],
+                    matches_played=map_stat['matches_played'],
+                    matches_won=map_stat['matches_won'],
+                    win_rate=map_stat['win_rate'],
+                    rounds_played=map_stat['rounds_played'],
+                    rounds_won=map_stat['rounds_won'],
+                    round_win_rate=map_stat['round_win_rate'],
+                    ct_rounds_won=map_stat['ct_rounds_won'],
+                    t_rounds_won=map_stat['t_rounds_won'],
+                    ct_win_rate=map_stat['ct_win_rate'],
+                    t_win_rate=map_stat['t_win_rate']
+                )
+                db.add(map_record)
+                logger.debug("      ✅ Mapa %s adicionado", map_stat["map_name"])
             except Exception as e:
-                logger.error(f"❌ Erro ao processar time {t["name"]}: {e}")
-                db.rollback()
+                logger.error("      ❌ Erro ao processar mapa %s: %s", map_stat.get("map_name"), e)
                 continue
 
-        logger.info("✅ Times com jogadores ativos e coach salvos com sucesso!")
-        return True
+    db.commit()
+    return team
 
-    except Exception as e:
-        logger.error(f"❌ Erro crítico ao salvar times: {e}")
-        return False
 
+def save_lineup(team: models.Team, people: List[Dict]):
+    """Cria ou atualiza os jogadores ativos e o coach de um time, com um commit por time"""
+    logger.info("   📊 %d pessoas encontradas", len(people), extra={"team_id": team.id})
+
+    for person in people:
+        role_emoji = "👤" if person["role"] == "player" else "🎯"
+        logger.debug(
+            "      %s Processando %s: %s", role_emoji, person["role"], person["nickname"],
+            extra={"player_id": person["id"], "team_id": team.id},
+        )
+
+        fields = {
+            "nickname": person["nickname"],
+            "real_name": person["name"],
+            "url": person["url"],
+            "team_id": team.id,
+            "role": person["role"],
+        }
+        try:
+            player, created = get_or_create_player(db, person["id"], dict(fields))
+            if created:
+                logger.info(
+                    "         ➕ Novo %s criado: %s", person["role"], person["nickname"],
+                    extra={"player_id": person["id"], "team_id": team.id},
+                )
+            else:
+                # Transferências e trocas de função
+                for key, value in fields.items():
+                    setattr(player, key, value)
+                logger.debug(
+                    "         🔄 %s atualizado: %s", person["role"], person["nickname"],
+                    extra={"player_id": person["id"], "team_id": team.id},
+                )
+
+        except Exception as e:
+            logger.error(
+                "         ❌ Erro ao processar %s %s: %s", person["role"], person["nickname"], e,
+                extra={"player_id": person["id"], "team_id": team.id},
+            )
+            db.rollback()
+            continue
+
+    db.commit()
 
-def update_active_player_stats(player_id=None, force_update=False, max_players=None):
+
+@profiled_phase
+def save_ranking(names: Optional[Iterable[str]] = None, concurrency: int = 1):
     """
-    Atualiza estatísticas apenas dos jogadores ativos coletando dados do HLTV.org
+    Fase "ranking": coleta o ranking e as páginas dos times do HLTV.org e salva
+    os times, com conquistas e mapas
+
+    Args:
+        names: coleta a página só destes times (None para todos)
+        concurrency: páginas de times abertas em paralelo
+
+    Returns:
+        (contagens, {id do time: elenco lido da página do time ou None})
+    """
+    logger.info("🚀 Iniciando coleta do ranking dos times do HLTV.org...")
+    counts, lineups = new_counts(), {}
+
+    teams = top30_teams(names, concurrency)
+    if not teams:
+        if not count_missing(counts):
+            logger.error("❌ Nenhum time foi coletado do HLTV.org")
+        return counts, lineups
+
+    counts["selected"] = len(teams)
+    logger.info("📊 %d times coletados do HLTV.org", len(teams))
+
+    for i, t in enumerate(teams, 1):
+        logger.info("💾 [%d/%d] Processando time: %s (#%d)", i, len(teams), t["name"], t["ranking"])
+        team_start = time.perf_counter()
+
+        try:
+            team = save_team(t)
+            lineups[team.id] = t.get("lineup")
+            counts["succeeded"] += 1
+            logger.info(
+                "   ✅ Time %s salvo", t["name"],
+                extra={"team_id": team.id, "duration_ms": round((time.perf_counter() - team_start) * 1000, 1)},
+            )
+
+        except Exception as e:
+            logger.error("❌ Erro ao processar time %s: %s", t["name"], e)
+            db.rollback()
+            counts["failed"] += 1
+
+    return counts, lineups
+
+
+@profiled_phase
+def save_rosters(teams: List[models.Team], lineups: Optional[Dict[int, List[Dict]]] = None, concurrency: int = 1):
+    """
+    Fase "rosters": salva os jogadores ativos e o coach de cada time
+
+    Args:
+        teams: times a atualizar
+        lineups: elencos já lidos na fase "ranking" ({id do time: elenco}); os
+            demais times têm a página coletada de novo
+        concurrency: páginas de times abertas em paralelo
+    """
+    logger.info("👥 Atualizando elencos de %d times...", len(teams))
+    counts = new_counts()
+    counts["selected"] = len(teams)
+    lineups = lineups or {}
+
+    known = [(team, lineups[team.id]) for team in teams if lineups.get(team.id)]
+    by_url = {team.url: team for team in teams if not lineups.get(team.id)}
+    fetched = (
+        (by_url[url], people)
+        for url, people in fetch_concurrently(get_team_active_players_and_coach, by_url, concurrency)
+    )
+
+    for team, people in itertools.chain(known, fetched):
+        if not people:
+            if not count_missing(counts):
+                logger.warning(
+                    "   ⚠️ Nenhum jogador ativo encontrado para %s", team.name, extra={"team_id": team.id}
+                )
+            continue
+
+        try:
+            save_lineup(team, people)
+            counts["succeeded"] += 1
+        except Exception as e:
+            logger.error("   ❌ Erro ao salvar o elenco de %s: %s", team.name, e, extra={"team_id": team.id})
+            db.rollback()
+            counts["failed"] += 1
+
+    return counts
+
+
+def save_player_stats(player: models.Player, player_data: Dict):
+    """Grava as estatísticas e conquistas coletadas de um jogador (sem commit)"""
+    # Cria ou atualiza estatísticas
+    if not player.stats:
+        player.stats = models.PlayerStats(player_id=player.id)
+        db.add(player.stats)
+
+    # Atualiza todos os campos
+    stats = player.stats
+    stats.picture = player_data.get("photo")
+    stats.real_name = player_data.get("real_name")
+    stats.country = player_data.get("country")
+    stats.age = player_data.get("age")
+
+    # Sem a página de stats (falha ou orçamento esgotado) os números anteriores são mantidos e seguem antigos
+    if player_data.get("stats"):
+        stats_data = player_data["stats"]
+        stats.last_updated = datetime.utcnow()
+        stats.total_kills = stats_data.get("total_kills")
+        stats.total_deaths = stats_data.get("total_deaths")
+        stats.headshot_percentage = stats_data.get("headshot_percentage")
+        stats.kd_ratio = stats_data.get("kd_ratio")
+        stats.damage_per_round = stats_data.get("damage_per_round")
+        stats.grenade_damage_per_round = stats_data.get("grenade_damage_per_round")
+        stats.maps_played = stats_data.get("maps_played")
+        stats.rounds_played = stats_data.get("rounds_played")
+        stats.kills_per_round = stats_data.get("kills_per_round")
+        stats.assists_per_round = stats_data.get("assists_per_round")
+        stats.deaths_per_round = stats_data.get("deaths_per_round")
+        stats.saved_by_teammate_per_round = stats_data.get("saved_by_teammate_per_round")
+        stats.saved_teammates_per_round = stats_data.get("saved_teammates_per_round")
+        stats.rating = stats_data.get("rating")
+
+    # Processa os achievements (troféus/conquistas)
+    if "achievements" in player_data and player_data["achievements"]:
+        logger.info(
+            "   🏆 Processando %d conquistas para %s", len(player_data["achievements"]), player.nickname
+        )
+
+        # Remove conquistas antigas
+        db.query(models.PlayerAchievement).filter_by(player_id=player.id).delete()
+
+        for achievement in player_data["achievements"]:
+            player_achievement = models.PlayerAchievement(
+                player_id=player.id,
+                title=achievement['title'],
+                event_name=achievement['event_name'],
+                year=achievement['year'],
+                trophy_image_url=achievement['trophy_image_url'],
+                event_tier=achievement.get('event_tier'),
+                placement=achievement.get('placement'),
+            )
+            db.add(player_achievement)
+
+
+def timed_player_details(url: str):
+    """`get_player_details` com a duração da coleta em ms"""
+    start = time.perf_counter()
+    player_data = get_player_details(url)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    # Pausa maior em caso de erro, só na thread que falhou (páginas puladas pelo orçamento não contam)
+    if not player_data and not page_budget.exhausted:
+        time.sleep(random.uniform(*FAILURE_BACKOFF_SECONDS))
+    return player_data, duration_ms
+
+
+@profiled_phase
+def update_active_player_stats(player_id=None, force_update=False, max_players=None, players=None, concurrency=1):
+    """
+    Fase "stats": atualiza estatísticas dos jogadores ativos coletando dados do HLTV.org
 
     Args:
         player_id: ID específico do jogador (None para todos)
         force_update: Força atualização mesmo se dados são recentes
         max_players: Limite máximo de jogadores para processar
+        players: jogadores já selecionados (`select_players`); ignora os argumentos acima
+        concurrency: jogadores coletados em paralelo
     """
     logger.info("🔄 Iniciando atualização de estatísticas dos jogadores ativos...")
 
-    if player_id:
-        players = db.query(models.Player).filter_by(id=player_id).all()
-        logger.info(f"🎯 Atualizando jogador específico: ID {player_id}")
-    else:
-        query = db.query(models.Player).filter(
-            models.Player.url.isnot(None),
-            # Removido filtro por role == 'player' para incluir coaches
+    if players is None:
+        players = select_players(
+            db,
+            player_ids=[player_id] if player_id else None,
+            refresh="all" if force_update else "missing",
+            limit=max_players,
         )
-        if max_players:
-            query = query.limit(max_players)
-        players = query.all()
-        logger.info(f"📊 Atualizando estatísticas de {len(players)} pessoas ativas...")
-
-    success_count = 0
-    error_count = 0
-    skipped_count = 0
-
-    for i, player in enumerate(players, 1):
-        logger.info(f"🔍 [{i}/{len(players)}] Atualizando estatísticas de {player.nickname} ({player.role})...")
-
-        # Verifica se precisa atualizar
-        if not force_update and player.stats:
-            logger.info(f"   ⏭️ {player.nickname} já tem estatísticas, pulando...")
-            skipped_count += 1
-            continue
+    logger.info("📊 Atualizando estatísticas de %d pessoas ativas...", len(players))
 
-        if not player.url:
-            logger.warning(f"   ⚠️ {player.nickname} não tem URL, pulando...")
-            skipped_count += 1
-            continue
+    counts = new_counts()
+    counts["selected"] = len(players)
+    by_url = {player.url: player for player in players}
 
-        try:
-            player_data = get_player_details(player.url)
-            if not player_data:
-                logger.warning(f"   ⚠️ Nenhum dado coletado para {player.nickname}")
-                error_count += 1
-                continue
+    for i, (url, result) in enumerate(fetch_concurrently(timed_player_details, by_url, concurrency), 1):
+        player = by_url[url]
+        player_data, duration_ms = result or ({}, None)
+        logger.info(
+            "🔍 [%d/%d] Atualizando estatísticas de %s (%s)...", i, len(players), player.nickname, player.role
+        )
 
-            # Cria ou atualiza estatísticas
-            if not player.stats:
-                player.stats = models.PlayerStats(player_id=player.id)
-                db.add(player.stats)
-
-            # Atualiza todos os campos
-            stats = player.stats
-            stats.picture = player_data.get("photo")
-            stats.real_name = player_data.get("real_name")
-            stats.country = player_data.get("country")
-            stats.age = player_data.get("age")
-
-            if "stats" in player_data:
-                stats_data = player_data["stats"]
-                stats.total_kills = stats_data.get("total_kills")
-                stats.total_deaths = stats_data.get("total_deaths")
-                stats.headshot_percentage = stats_data.get("headshot_percentage")
-                stats.kd_ratio = stats_data.get("kd_ratio")
-                stats.damage_per_round = stats_data.get("damage_per_round")
-                stats.grenade_damage_per_round = stats_data.get("grenade_damage_per_round")
-                stats.maps_played = stats_data.get("maps_played")
-                stats.rounds_played = stats_data.get("rounds_played")
-                stats.kills_per_round = stats_data.get("kills_per_round")
-                stats.assists_per_round = stats_data.get("assists_per_round")
-                stats.deaths_per_round = stats_data.get("deaths_per_round")
-                stats.saved_by_teammate_per_round = stats_data.get("saved_by_teammate_per_round")
-                stats.saved_teammates_per_round = stats_data.get("saved_teammates_per_round")
-                stats.rating = stats_data.get("rating")
-
-            # Processa os achievements (troféus/conquistas)
-            if "achievements" in player_data and player_data["achievements"]:
-                logger.info(f"   🏆 Processando {len(player_data['achievements'])} conquistas para {player.nickname}")
-
-                # Remove conquistas antigas
-                db.query(models.PlayerAchievement).filter_by(player_id=player.id).delete()
-
-                for achievement in player_data["achievements"]:
-                    player_achievement = models.PlayerAchievement(
-                        player_id=player.id,
-                        title=achievement['title'],
-                        event_name=achievement['event_name'],
-                        year=achievement['year'],
-                        trophy_image_url=achievement['trophy_image_url'],
-                        event_tier=achievement.get('event_tier'),
-                        placement=achievement.get('placement'),
-                    )
-                    db.add(player_achievement)
+        if not player_data:
+            if not count_missing(counts):
+                logger.warning(
+                    "   ⚠️ Nenhum dado coletado para %s", player.nickname, extra={"player_id": player.id}
+                )
+            continue
 
+        try:
+            save_player_stats(player, player_data)
             db.commit()
             db.refresh(player.stats)
-            success_count += 1
+            counts["succeeded"] += 1
+
+            logger.info(
+                "   ✅ %s atualizado com sucesso!", player.nickname,
+                extra={
+                    "player_id": player.id,
+                    "rating": player.stats.rating,
+                    "achievements": len(player_data.get("achievements") or []),
+                    "duration_ms": duration_ms,
+                },
+            )
 
-            stats_info = []
-            if player_data.get("rating"):
-                stats_info.append(f"rating: {player_data['rating']}")
-            if player_data.get("photo"):
-                stats_info.append("foto: ✅")
-            if player_data.get("achievements"):
-                stats_info.append(f"conquistas: {len(player_data['achievements'])}")
+        except Exception as e:
+            counts["failed"] += 1
+            logger.error("   ❌ Erro ao atualizar %s: %s", player.nickname, e, extra={"player_id": player.id})
+            db.rollback()
 
-            logger.info(f"   ✅ {player.nickname} atualizado com sucesso!")
-            if stats_info:
-                logger.info(f"   📊 Dados coletados: {', '.join(stats_info)}")
+    logger.info(
+        "✅ Atualização de estatísticas concluída! Sucessos: %d, erros: %d, pulados: %d",
+        counts["succeeded"], counts["failed"], counts["skipped"],
+        extra={"succeeded": counts["succeeded"], "failed": counts["failed"], "skipped": counts["skipped"]},
+    )
+    return counts
+
+
+def refresh_derived_data():
+    """Recalcula os agregados dos times e os leaderboards e invalida o cache da API"""
+    update_team_aggregates(db)
+    refresh_leaderboards(db)
+    bump_data_version(db)
+
+
+def run_phases(
+    phases: Iterable[str] = PHASES,
+    team_ids: Optional[List[int]] = None,
+    player_ids: Optional[List[int]] = None,
+    refresh: str = "missing",
+    max_age_hours: float = STATS_MAX_AGE_HOURS,
+    max_players: Optional[int] = None,
+    concurrency: int = 1,
+) -> Dict:
+    """
+    Executa as fases pedidas, na ordem de PHASES, e devolve o resumo da
+    execução: contagens, páginas e duração de cada fase
+    """
+    summary = {"phases": {}, "page_budget": page_budget.limit}
+    pages_at_start = page_budget.used
+    lineups = None
 
+    for phase in PHASES:
+        if phase not in phases:
+            continue
 
+        logger.info("📋 FASE %s", phase.upper())
+        pages, start = page_budget.used, time.perf_counter()
 
-        except Exception as e:
-            error_count += 1
-            logger.error(f"   ❌ Erro ao atualizar {player.nickname}: {str(e)}")
-            db.rollback()
+        if phase == "ranking":
+            names = [team.name for team in select_teams(db, team_ids)] if team_ids else None
+            counts, lineups = save_ranking(names, concurrency)
+        elif phase == "rosters":
+            # Sem ids, atualiza os times salvos na fase ranking (ou, sem ela, os ranqueados no banco)
+            teams = select_teams(db, team_ids or (list(lineups) if lineups else None))
+            counts = save_rosters(teams, lineups, concurrency)
+        else:
+            players = select_players(db, player_ids, team_ids, refresh, max_age_hours, max_players)
+            counts = update_active_player_stats(players=players, concurrency=concurrency)
+
+        counts["pages"] = page_budget.used - pages
+        counts["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        summary["phases"][phase] = counts
+
+        # Uma invalidação do cache da API por fase, não por item salvo
+        if counts["succeeded"]:
+            bump_data_version(db)
+
+    if any(counts["succeeded"] for counts in summary["phases"].values()):
+        refresh_derived_data()
+
+    summary["pages"] = page_budget.used - pages_at_start
+    return summary
+
+
+def exit_code(summary: Dict) -> int:
+    phases = summary["phases"].values()
+    if any(counts["failed"] for counts in phases):
+        return EXIT_FAILED
+    if any(counts["skipped"] for counts in phases):
+        return EXIT_INCOMPLETE
+    return EXIT_OK
+
+
+def plan_run(
+    session,
+    phases: Iterable[str] = PHASES,
+    team_ids: Optional[List[int]] = None,
+    player_ids: Optional[List[int]] = None,
+    refresh: str = "missing",
+    max_age_hours: float = STATS_MAX_AGE_HOURS,
+    max_players: Optional[int] = None,
+) -> Dict:
+    """
+    O que `run_phases` faria, sem navegar nem gravar: os alvos de cada fase e as
+    páginas estimadas. Os times do ranking só são conhecidos ao baixá-lo, então
+    sem `team_ids` a estimativa usa os times ranqueados no banco.
+    """
+    plan = {"dry_run": True, "phases": {}}
+    teams = select_teams(session, team_ids)
+
+    if "ranking" in phases:
+        plan["phases"]["ranking"] = {
+            "targets": [team.name for team in teams] if team_ids else ["ranking completo"],
+            "pages": 1 + (len(teams) if team_ids else RANKING_SIZE),
+        }
+    if "rosters" in phases:
+        plan["phases"]["rosters"] = {
+            "targets": [team.name for team in teams],
+            # Com a fase ranking, os elencos saem das páginas de time já baixadas
+            "pages": 0 if "ranking" in phases else len(teams),
+        }
+    if "stats" in phases:
+        players = select_players(session, player_ids, team_ids, refresh, max_age_hours, max_players)
+        new = sum(1 for player in players if player.stats is None)
+        plan["phases"]["stats"] = {
+            "targets": [player.nickname for player in players],
+            "new": new,
+            "refreshed": len(players) - new,
+            "pages": 2 * len(players),  # Perfil e página de stats
+        }
+
+    plan["pages"] = sum(phase["pages"] for phase in plan["phases"].values())
+    return plan
+
+
+def log_plan(plan: Dict, page_limit: Optional[int] = None, shown: int = 10):
+    logger.info("🧪 Dry-run: nada será coletado nem gravado")
+    for name, phase in plan["phases"].items():
+        targets = phase["targets"]
+        listed = ", ".join(map(str, targets[:shown]))
+        if len(targets) > shown:
+            listed += f" e mais {len(targets) - shown}"
+        logger.info("   %s: %d alvos, ~%d páginas: %s", name, len(targets), phase["pages"], listed or "-")
+        if name == "stats":
+            logger.info(
+                "      %d sem estatísticas, %d com estatísticas a atualizar", phase["new"], phase["refreshed"]
+            )
+
+    logger.info("📄 Total estimado: ~%d páginas", plan["pages"])
+    if page_limit is not None and plan["pages"] > page_limit:
+        logger.warning("⚠️ Estimativa acima do orçamento de %d páginas; parte dos alvos será pulada", page_limit)
+
+
+def log_summary(summary: Dict):
+    logger.info("=" * 70)
+    logger.info("🎉 EXECUÇÃO FINALIZADA (código de saída %d)", summary["exit_code"])
+    for name, counts in summary["phases"].items():
+        logger.info(
+            "   %s: %d selecionados, %d atualizados, %d falhas, %d pulados, %d páginas",
+            name, counts["selected"], counts["succeeded"], counts["failed"], counts["skipped"], counts["pages"],
+            extra={"phase": name, "duration_ms": counts["duration_ms"]},
+        )
+    budget = f" de {summary['page_budget']}" if summary["page_budget"] is not None else ""
+    logger.info(
+        "⏱️ Tempo total: %.1f s, %d páginas%s", summary["duration_ms"] / 1000, summary["pages"], budget,
+        extra={"duration_ms": summary["duration_ms"]},
+    )
+    logger.info("=" * 70)
 
-            # Pausa maior em caso de erro
-            time.sleep(random.uniform(20, 30))
-            continue
 
-    logger.info(f"✅ Atualização de estatísticas concluída!")
-    logger.info(f"   📊 Sucessos: {success_count}")
-    logger.info(f"   ❌ Erros: {error_count}")
-    logger.info(f"   ⏭️ Pulados: {skipped_count}")
+def write_summary(path: Optional[str], summary: Dict):
+    if path:
+        Path(path).write_text(json.dumps(summary, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        logger.info("📝 Resumo gravado em %s", path)
 
 
 def full_update_active_only(max_players_stats=None):
@@ -330,34 +673,13 @@ def full_update_active_only(max_players_stats=None):
         max_players_stats: Limite de jogadores para atualizar estatísticas (None = todos)
     """
     logger.info("🚀 INICIANDO ATUALIZAÇÃO COMPLETA - APENAS JOGADORES ATIVOS E COACH")
-    logger.info("=" * 70)
-
-    start_time = datetime.utcnow()
 
     try:
-        # Fase 1: Coleta times com jogadores ativos e coach do HLTV.org
-        logger.info("📋 FASE 1: Coletando times com jogadores ativos e coach do HLTV.org...")
-        if not save_teams_with_active_players():
-            logger.error("❌ Falha na coleta de times. Continuando com dados existentes...")
-
-        # Fase 2: Atualiza estatísticas apenas dos jogadores ativos do HLTV.org
-        logger.info("📊 FASE 2: Atualizando estatísticas dos jogadores ativos do HLTV.org...")
-        update_active_player_stats(max_players=max_players_stats)
-
-        end_time = datetime.utcnow()
-        duration = end_time - start_time
-
-        logger.info("=" * 70)
-        logger.info("🎉 ATUALIZAÇÃO COMPLETA FINALIZADA!")
-        logger.info(f"📊 Fonte de dados: HLTV.org exclusivamente")
-        logger.info(f"🎯 Foco: Apenas jogadores ativos (5) e coach de cada time")
-        logger.info(f"⏱️ Tempo total: {duration}")
-        logger.info("=" * 70)
-
-        return True
+        summary = run_phases(PHASES, max_players=max_players_stats)
+        return exit_code(summary) != EXIT_FAILED
 
     except Exception as e:
-        logger.error(f"❌ Erro crítico durante atualização: {e}")
+        logger.exception("❌ Erro crítico durante atualização: %s", e)
         return False
 
 
@@ -368,7 +690,8 @@ def quick_update_active_only():
     logger.info("⚡ INICIANDO ATUALIZAÇÃO RÁPIDA - APENAS JOGADORES ATIVOS E COACH...")
 
     try:
-        if save_teams_with_active_players():
+        summary = run_phases(("ranking", "rosters"))
+        if summary["phases"]["ranking"]["succeeded"]:
             logger.info("✅ Atualização rápida concluída!")
             return True
         else:
@@ -376,67 +699,130 @@ def quick_update_active_only():
             return False
 
     except Exception as e:
-        logger.error(f"❌ Erro na atualização rápida: {e}")
+        logger.exception("❌ Erro na atualização rápida: %s", e)
         return False
 
 
-def show_active_players_summary():
+def show_active_players_summary(format: str = "text", coverage: bool = True, output: Optional[str] = None):
     """
-    Mostra resumo dos jogadores ativos no banco de dados
+    Mostra resumo dos jogadores ativos no banco de dados (uma consulta só, ver `app.rosters`)
     """
-    logger.info("📊 RESUMO DOS JOGADORES ATIVOS")
-    logger.info("=" * 50)
-
     try:
-        teams = db.query(models.Team).order_by(models.Team.ranking).all()
-
-        for team in teams:
-            active_players = db.query(models.Player).filter_by(
-                team_id=team.id,
-            ).all()
+        write_roster_summary(roster_summary(db, coverage), format, output)
+    except Exception as e:
+        logger.error("❌ Erro ao gerar resumo: %s", e)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Coleta dos times, jogadores ativos e estatísticas do HLTV.org")
+    parser.add_argument(
+        "--phases", nargs="+", choices=PHASES, default=list(PHASES),
+        help="Fases a executar, sempre na ordem ranking, rosters, stats (padrão: todas)",
+    )
+    parser.add_argument("--team-ids", nargs="+", type=int, help="Restringe as fases aos times informados")
+    parser.add_argument("--player-ids", nargs="+", type=int, help="Restringe a fase stats aos jogadores informados")
+    parser.add_argument("--max-players", type=int, help="Limite de jogadores na fase stats")
+    parser.add_argument(
+        "--refresh", choices=REFRESH_POLICIES,
+        help="Jogadores da fase stats: sem estatísticas (missing, padrão), também as antigas (stale) "
+             "ou todos (all, padrão com --player-ids)",
+    )
+    parser.add_argument(
+        "--max-age", type=float, default=STATS_MAX_AGE_HOURS,
+        help="Horas até as estatísticas serem consideradas antigas (--refresh stale)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Páginas abertas em paralelo, cada thread com seu navegador"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, help="Orçamento de páginas baixadas; ao atingi-lo o restante é pulado (saída 3)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Mostra o que seria coletado e atualizado, sem navegar nem gravar"
+    )
+    parser.add_argument("--summary-json", help="Grava o resumo da execução (ou o plano do --dry-run) em JSON")
+    parser.add_argument(
+        "--roster-summary", nargs="?", const="text", default="text", choices=list(ROSTER_FORMATS),
+        help="Formato do resumo dos elencos e da cobertura das estatísticas mostrado ao final (padrão: text)",
+    )
+    parser.add_argument(
+        "--no-roster-summary", dest="roster_summary", action="store_const", const=None,
+        help="Não mostra o resumo dos elencos ao final",
+    )
+    parser.add_argument("--roster-summary-file", help="Grava o resumo dos elencos em um arquivo")
+    parser.add_argument("--profile", action="store_true", help="Grava um profile por fase da coleta")
+    parser.add_argument("--profiler", choices=PROFILERS, default=PROFILER)
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="Diretório dos profiles e snapshots")
+    parser.add_argument(
+        "--tracemalloc-interval", type=float, help="Segundos entre snapshots de memória (tracemalloc) durante a coleta"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency deve ser pelo menos 1")
+    if args.max_pages is not None and args.max_pages < 1:
+        parser.error("--max-pages deve ser pelo menos 1")
+
+    targets = {
+        "phases": args.phases,
+        "team_ids": args.team_ids,
+        "player_ids": args.player_ids,
+        "refresh": args.refresh or ("all" if args.player_ids else "missing"),
+        "max_age_hours": args.max_age,
+        "max_players": args.max_players,
+    }
+
+    if args.dry_run:
+        # O dry-run não aplica migrações: banco indisponível ou desatualizado sai com o código de erro de banco
+        try:
+            plan = plan_run(db, **targets)
+        except SQLAlchemyError as e:
+            logger.error("❌ Erro ao consultar o banco de dados: %s", e)
+            return EXIT_DATABASE
+        log_plan(plan, args.max_pages)
+        write_summary(args.summary_json, plan)
+        return EXIT_OK
 
-            if active_players:
-                logger.info(f"\n🏆 {team.name} (#{team.ranking})")
+    if args.profile:
+        configure_profiling(output_dir=args.profile_dir, profiler=args.profiler)
 
-                players = [p for p in active_players if p.role == "player"]
-                coaches = [p for p in active_players if p.role == "coach"]
+    logger.info("🎯 Sistema de Scraping HLTV.org - Apenas Jogadores Ativos e Coach")
+    logger.info("📊 Fases: %s", ", ".join(phase for phase in PHASES if phase in args.phases))
 
-                for player in players:
-                    rating = "N/A"
-                    if player.stats and player.stats.rating:
-                        rating = f"{player.stats.rating:.2f}"
-                    logger.info(f"   👤 {player.nickname} (Rating: {rating})")
+    # Cria ou atualiza o esquema do banco antes da coleta (Alembic só é importado aqui)
+    try:
+        from app.migrations import upgrade_database
 
-                for coach in coaches:
-                    logger.info(f"   🎯 {coach.nickname} (Coach)")
+        upgrade_database(get_engine())
+    except Exception as e:
+        logger.exception("❌ Erro ao preparar o banco de dados: %s", e)
+        return EXIT_DATABASE
 
-                logger.info(f"   📊 Total: {len(players)} jogadores + {len(coaches)} coach(es)")
+    page_budget.reset(args.max_pages)
+    start = time.perf_counter()
+    try:
+        with memory_snapshots(args.tracemalloc_interval, args.profile_dir):
+            summary = run_phases(concurrency=args.concurrency, **targets)
+    except Exception as e:
+        logger.exception("❌ Erro crítico durante atualização: %s", e)
+        return EXIT_FAILED
+    finally:
+        close_playwright_session()
 
-        total_active = db.query(models.Player).filter_by().count()
-        total_players = db.query(models.Player).filter_by(role="player").count()
-        total_coaches = db.query(models.Player).filter_by(role="coach").count()
+    summary["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    summary["exit_code"] = exit_code(summary)
+    log_summary(summary)
+    write_summary(args.summary_json, summary)
 
-        logger.info("\n" + "=" * 50)
-        logger.info(f"📈 TOTAIS GERAIS:")
-        logger.info(f"   👤 Jogadores ativos: {total_players}")
-        logger.info(f"   🎯 Coaches ativos: {total_coaches}")
-        logger.info(f"   📊 Total de pessoas ativas: {total_active}")
+    if args.roster_summary:
+        show_active_players_summary(args.roster_summary, output=args.roster_summary_file)
 
-    except Exception as e:
-        logger.error(f"❌ Erro ao gerar resumo: {e}")
+    return summary["exit_code"]
 
 
 if __name__ == "__main__":
-    logger.info("🎯 Sistema de Scraping HLTV.org - Apenas Jogadores Ativos e Coach")
-    logger.info("📊 Fonte de dados: HLTV.org exclusivamente")
-    logger.info("🎯 Foco: 5 jogadores ativos + 1 coach por time")
-    logger.info("🚀 Iniciando coleta completa e atualização...")
-
-    # Coleta times + jogadores ativos + estatísticas já salvas junto
-    if full_update_active_only():
-        logger.info("✅ Coleta e atualização concluídas com sucesso!")
-    else:
-        logger.error("❌ Falha na coleta e atualização")
-
-    # Mostra resumo final
-    show_active_players_summary()
+    sys.exit(main())
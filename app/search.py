@@ -0,0 +1,168 @@
+"""
+Busca aproximada de jogadores e times
+
+No Postgres a busca usa os índices GIN de trigramas (`pg_trgm`): o operador `%`
+tolera erros de digitação e `similarity()` ordena os resultados por relevância.
+Em outros bancos (ex: SQLite nos testes) cai para `ILIKE` com prefixos primeiro.
+
+Para o autocomplete há também um índice de prefixos em memória, reconstruído
+quando a versão dos dados muda, que responde sem acessar o banco.
+"""
+
+import asyncio
+import os
+from bisect import bisect_left
+from typing import List, Optional, Sequence
+
+from sqlalchemy import case, func, or_, select
+
+from app import banco, models
+from app.data_version import data_version
+
+# Índice de prefixos em memória para o autocomplete (0 desativa e consulta o banco)
+AUTOCOMPLETE_INDEX = os.getenv("AUTOCOMPLETE_INDEX", "1") == "1"
+
+SEARCH_MAX_LIMIT = 100
+
+
+def use_trigrams() -> bool:
+    return banco.get_async_engine().dialect.name == "postgresql"
+
+
+def icontains(columns: Sequence, term: str):
+    """
+    Linhas cujo texto contém o termo (`ILIKE '%termo%'`, com `%` e `_` escapados);
+    no Postgres a substring é resolvida pelos índices GIN de trigramas
+    """
+    return or_(*(column.icontains(term, autoescape=True) for column in columns))
+
+
+def match_filter(columns: Sequence, term: str):
+    """Linhas cujo texto contém o termo ou, no Postgres, é parecido com ele"""
+    conditions = [icontains(columns, term)]
+    if use_trigrams():
+        conditions.extend(column.op("%")(term) for column in columns)
+    return or_(*conditions)
+
+
+def match_rank(columns: Sequence, term: str):
+    """Relevância: prefixo exato primeiro, depois similaridade de trigramas (ou substring)"""
+    prefix = or_(*(column.istartswith(term, autoescape=True) for column in columns))
+    rank = case((prefix, 1.0), else_=0.0)
+    if use_trigrams():
+        return rank + func.greatest(*(func.coalesce(func.similarity(column, term), 0.0) for column in columns))
+    return rank + case((icontains(columns, term), 0.5), else_=0.0)
+
+
+def ranked_search(query, columns: Sequence, term: str, tiebreaker):
+    """Aplica filtro e ordenação por relevância à query"""
+    return query.filter(match_filter(columns, term)).order_by(match_rank(columns, term).desc(), tiebreaker)
+
+
+PLAYER_SEARCH_COLUMNS = (models.Player.nickname, models.Player.real_name)
+TEAM_SEARCH_COLUMNS = (models.Team.name,)
+
+
+class PrefixIndex:
+    """
+    Índice de prefixos ordenado: cada entrada é `(chave em minúsculas, id, rótulo)`
+    e a busca é uma bisseção seguida de uma varredura curta.
+
+    As entradas `secondary` (ex: palavras do nome real) só completam o resultado
+    depois das principais (ex: nickname), para que o prefixo do apelido venha primeiro.
+    """
+
+    def __init__(self, entries=(), secondary=()):
+        self._tiers = []
+        for tier in (entries, secondary):
+            tier = sorted(tier)
+            self._tiers.append((tier, [key for key, _, _ in tier]))
+
+    def __len__(self):
+        return sum(len(tier) for tier, _ in self._tiers)
+
+    def search(self, prefix: str, limit: int = 10) -> List[dict]:
+        prefix = prefix.casefold()
+        results = {}
+        for entries, keys in self._tiers:
+            position = bisect_left(keys, prefix)
+            while position < len(entries) and len(results) < limit:
+                key, entity_id, label = entries[position]
+                if not key.startswith(prefix):
+                    break
+                results.setdefault(entity_id, label)
+                position += 1
+        return [{"id": entity_id, "label": label} for entity_id, label in results.items()]
+
+
+def prefix_keys(*texts: Optional[str]) -> set:
+    """Chaves indexadas: o texto completo e cada palavra (ex: sobrenome do nome real)"""
+    keys = set()
+    for text in texts:
+        if text:
+            text = text.casefold()
+            keys.add(text)
+            keys.update(text.split())
+    return keys
+
+
+async def _load_players(db) -> PrefixIndex:
+    rows = await db.execute(select(models.Player.id, models.Player.nickname, models.Player.real_name))
+    rows = rows.all()
+    return PrefixIndex(
+        ((key, row.id, row.nickname) for row in rows for key in prefix_keys(row.nickname)),
+        secondary=((key, row.id, row.nickname) for row in rows for key in prefix_keys(row.real_name)),
+    )
+
+
+async def _load_teams(db) -> PrefixIndex:
+    rows = await db.execute(select(models.Team.id, models.Team.name))
+    return PrefixIndex((key, row.id, row.name) for row in rows for key in prefix_keys(row.name))
+
+
+class AutocompleteIndex:
+    """Índices de prefixos de jogadores e times, reconstruídos a cada nova versão dos dados"""
+
+    loaders = {"players": _load_players, "teams": _load_teams}
+
+    def __init__(self):
+        self._indexes = {}
+        self._version = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db, kind: str) -> Optional[PrefixIndex]:
+        stamp = data_version.peek() or await data_version.get()
+        if stamp is None:
+            return None
+
+        async with self._lock:
+            if stamp.version != self._version:
+                self._indexes.clear()
+                self._version = stamp.version
+            if kind not in self._indexes:
+                self._indexes[kind] = await self.loaders[kind](db)
+            return self._indexes[kind]
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+async def autocomplete(db, kind: str, prefix: str, limit: int) -> List[dict]:
+    """Sugestões por prefixo, do índice em memória ou do banco se ele estiver desativado"""
+    if AUTOCOMPLETE_INDEX:
+        index = await autocomplete_index.get(db, kind)
+        if index is not None:
+            return index.search(prefix, limit)
+
+    if kind == "players":
+        columns, label, model = PLAYER_SEARCH_COLUMNS, models.Player.nickname, models.Player
+    else:
+        columns, label, model = TEAM_SEARCH_COLUMNS, models.Team.name, models.Team
+
+    query = (
+        select(model.id, label)
+        .filter(or_(*(column.istartswith(prefix, autoescape=True) for column in columns)))
+        .order_by(case((label.istartswith(prefix, autoescape=True), 0), else_=1), label, model.id)
+        .limit(limit)
+    )
+    return [{"id": row[0], "label": row[1]} for row in await db.execute(query)]
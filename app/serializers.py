@@ -0,0 +1,257 @@
+"""
+Serialização das respostas da API HLTV Expandido
+
+Cada modelo tem um mapeador pré-compilado (`operator.attrgetter` sobre a lista
+de campos) que monta o dicionário de saída uma única vez, e as rotas devolvem
+`FastJSONResponse` diretamente, sem passar pelo `jsonable_encoder` do FastAPI.
+"""
+
+import json
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Callable, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+from app.fieldsets import Fieldset
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da biblioteca padrão
+    orjson = None
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Objeto do tipo {type(value).__name__} não é serializável em JSON")
+
+
+def dumps(content) -> bytes:
+    """Serializa em JSON compacto com orjson (ou json, se orjson não estiver instalado)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_json_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON renderizada com orjson (ou json, se orjson não estiver instalado)"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content, response=None) -> FastJSONResponse:
+    """
+    Monta a resposta final da rota.
+
+    Os headers definidos no `Response` injetado pelo FastAPI (ex: cursor da
+    paginação) são copiados, já que ao devolver uma resposta pronta o FastAPI
+    não os aplica.
+    """
+    result = FastJSONResponse(content)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name not in ("content-length", "content-type"):
+                result.headers[name] = value
+    return result
+
+
+def make_mapper(fields: Sequence[str]) -> Callable[[object], dict]:
+    """Cria uma função que converte um objeto em dict com os campos informados"""
+    fields = tuple(fields)
+    getter = attrgetter(*fields)
+
+    if len(fields) == 1:
+        return lambda obj: {fields[0]: getter(obj)}
+
+    def mapper(obj) -> dict:
+        return dict(zip(fields, getter(obj)))
+
+    return mapper
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+TEAM_SUMMARY_FIELDS = ("id", "name", "url", "ranking", "points")
+# Agregados do elenco gravados pelo scraper (app.team_aggregates)
+TEAM_AGGREGATE_FIELDS = (
+    "average_rating", "median_rating", "average_kd_ratio", "average_damage_per_round", "average_player_age",
+    "average_maps_played",
+)
+TEAM_LIST_FIELDS = (
+    "id", "name", "url", "ranking", "points", "logo_url", "coach_name", "region", "win_rate",
+) + TEAM_AGGREGATE_FIELDS
+TEAM_DETAIL_FIELDS = (
+    "id", "name", "url", "ranking", "points", "logo_url", "region", "win_rate", "weeks_in_top30",
+    "average_player_age", "coach_name", "peak_ranking", "time_at_peak", "average_rating", "median_rating",
+    "average_kd_ratio", "average_damage_per_round", "average_maps_played",
+)
+
+PLAYER_FIELDS = ("id", "nickname", "real_name", "url", "role", "team_id")
+
+STATS_FIELDS = (
+    "picture", "country", "age", "total_kills", "total_deaths", "headshot_percentage", "kd_ratio",
+    "damage_per_round", "grenade_damage_per_round", "maps_played", "rounds_played", "kills_per_round",
+    "assists_per_round", "deaths_per_round", "saved_by_teammate_per_round", "saved_teammates_per_round",
+    "rating", "last_updated",
+)
+STATS_SUMMARY_FIELDS = ("rating", "kd_ratio", "headshot_percentage", "damage_per_round", "maps_played", "country", "picture")
+TEAM_PLAYER_STATS_FIELDS = ("picture", "rating", "kd_ratio", "damage_per_round")
+
+TEAM_ACHIEVEMENT_FIELDS = (
+    "id", "title", "event_name", "year", "placement", "prize_money", "trophy_image_url", "event_tier",
+)
+PLAYER_ACHIEVEMENT_FIELDS = TEAM_ACHIEVEMENT_FIELDS + ("mvp_award",)
+
+# Campos aceitos em `fields[player]` nas listagens de times e de jogadores
+TEAM_PLAYER_FIELDS = ("nickname",) + TEAM_PLAYER_STATS_FIELDS
+PLAYER_LIST_FIELDS = PLAYER_FIELDS + ("team_name", "stats") + STATS_SUMMARY_FIELDS
+
+# Relacionamentos que podem ser embutidos com `include` (e que são embutidos por padrão)
+TEAM_LIST_INCLUDES = ("players", "achievements")
+PLAYER_LIST_INCLUDES = ("achievements",)
+
+LEADERBOARD_FIELDS = (
+    "rank", "global_rank", "player_id", "nickname", "role", "team_id", "team_name", "country", "picture",
+    "maps_played", "value",
+)
+
+MAP_STATS_FIELDS = (
+    "map_name", "matches_played", "matches_won", "win_rate", "rounds_played", "rounds_won", "round_win_rate",
+    "ct_rounds_won", "t_rounds_won", "ct_win_rate", "t_win_rate",
+)
+
+_team_summary = make_mapper(TEAM_SUMMARY_FIELDS)
+_team_list = make_mapper(TEAM_LIST_FIELDS)
+_team_detail = make_mapper(TEAM_DETAIL_FIELDS)
+_player = make_mapper(PLAYER_FIELDS)
+_stats = make_mapper(STATS_FIELDS)
+_stats_summary = make_mapper(STATS_SUMMARY_FIELDS)
+_team_achievement = make_mapper(TEAM_ACHIEVEMENT_FIELDS)
+_player_achievement = make_mapper(PLAYER_ACHIEVEMENT_FIELDS)
+_map_stats = make_mapper(MAP_STATS_FIELDS)
+_team_player_stats = make_mapper(TEAM_PLAYER_STATS_FIELDS)
+leaderboard_item = make_mapper(LEADERBOARD_FIELDS)
+
+
+def player_stats(stats) -> dict:
+    """Estatísticas completas; campos nulos quando o jogador ainda não tem estatísticas"""
+    if stats is None:
+        return dict.fromkeys(STATS_FIELDS)
+    data = _stats(stats)
+    data["last_updated"] = _isoformat(data["last_updated"])
+    return data
+
+
+def team_summary(team) -> dict:
+    return _team_summary(team)
+
+
+def team_player_item(player, fields: Optional[Fieldset] = None) -> dict:
+    """Jogador resumido dentro da listagem de times"""
+    data = {"nickname": player.nickname}
+    if fields is None or fields.wants_any(TEAM_PLAYER_STATS_FIELDS):
+        data.update(_team_player_stats(player.stats) if player.stats else dict.fromkeys(TEAM_PLAYER_STATS_FIELDS))
+    return fields.apply(data) if fields is not None else data
+
+
+def team_list_item(team, include=TEAM_LIST_INCLUDES, fields: Optional[Fieldset] = None,
+                   player_fields: Optional[Fieldset] = None) -> dict:
+    """
+    Time da listagem; só acessa os relacionamentos pedidos em `include`,
+    que são os únicos carregados pela rota.
+    """
+    data = _team_list(team)
+    if "players" in include:
+        data["players"] = [team_player_item(player, player_fields) for player in team.players]
+    if "achievements" in include:
+        data["achievements"] = [_team_achievement(achievement) for achievement in team.achievements]
+    return fields.apply(data, keep=include) if fields is not None else data
+
+
+def team_detail(team) -> dict:
+    data = _team_detail(team)
+    data["players"] = [
+        {
+            "id": player.id,
+            "nickname": player.nickname,
+            "role": player.role,
+            "picture": player.stats.picture if player.stats else None,
+        }
+        for player in team.players
+    ]
+    data["map_stats"] = [_map_stats(stat) for stat in team.map_stats]
+    data["achievements"] = [_team_achievement(achievement) for achievement in team.achievements]
+    return data
+
+
+def player_summary(player, team_name: Optional[str] = None) -> dict:
+    data = _player(player)
+    data["team_name"] = team_name if team_name is not None else (player.team.name if player.team else None)
+    return data
+
+
+def player_detail(player, team_name: Optional[str] = None) -> dict:
+    data = player_summary(player, team_name)
+    data["stats"] = player_stats(player.stats)
+    data["achievements"] = [_player_achievement(achievement) for achievement in player.achievements]
+    return data
+
+
+def player_list_item(player, include=PLAYER_LIST_INCLUDES, fields: Optional[Fieldset] = None) -> dict:
+    """
+    Jogador da listagem; o time e as estatísticas só são acessados quando
+    algum campo deles foi pedido (a rota deixa de carregá-los nos demais casos).
+    """
+    data = _player(player)
+    if fields is None or "team_name" in fields:
+        data["team_name"] = player.team.name if player.team else None
+    if fields is None or fields.wants_any(STATS_SUMMARY_FIELDS + ("stats",)):
+        data["stats"] = _stats_summary(player.stats) if player.stats else dict.fromkeys(STATS_SUMMARY_FIELDS)
+    if "achievements" in include:
+        data["achievements"] = [_player_achievement(achievement) for achievement in player.achievements]
+    return fields.apply(data, keep=include, nested=("stats",)) if fields is not None else data
+
+
+def player_stats_item(stats, nickname: Optional[str]) -> dict:
+    """Estatísticas de um jogador com id e nickname no topo"""
+    data = {"player_id": stats.player_id, "player_nickname": nickname}
+    data.update(player_stats(stats))
+    return data
+
+
+def team_achievement_item(achievement, team_name: Optional[str]) -> dict:
+    data = _team_achievement(achievement)
+    data["team_id"] = achievement.team_id
+    data["team_name"] = team_name
+    return data
+
+
+def player_achievement_item(achievement, player_nickname: Optional[str]) -> dict:
+    data = _player_achievement(achievement)
+    data["player_id"] = achievement.player_id
+    data["player_nickname"] = player_nickname
+    return data
+
+
+def feed_item(row) -> dict:
+    """Linha do feed unificado de achievements, no formato do tipo correspondente"""
+    data = {"id": row.id, "type": row.type}
+    if row.type == "team":
+        data.update(_team_achievement(row))
+        data["team_id"] = row.owner_id
+        data["team_name"] = row.owner_name
+    else:
+        data.update(_player_achievement(row))
+        data["player_id"] = row.owner_id
+        data["player_nickname"] = row.owner_name
+    return data
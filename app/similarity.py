@@ -0,0 +1,98 @@
+"""
+Busca de jogadores parecidos (k vizinhos mais próximos) pelas estatísticas
+
+Usa o snapshot de `app.analytics`: as métricas de estilo de jogo viram uma
+matriz normalizada (z-scores, ausentes = média) montada uma vez por versão dos
+dados, e cada consulta calcula a distância para todos os jogadores de uma vez
+com NumPy e separa os k menores com `argpartition`.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from app.analytics import StatsSnapshot
+
+# Métricas que descrevem o estilo de jogo
+SIMILARITY_FEATURES = (
+    "kills_per_round", "deaths_per_round", "assists_per_round", "damage_per_round", "headshot_percentage",
+    "rating", "saved_by_teammate_per_round", "saved_teammates_per_round",
+)
+
+SIMILARITY_METRICS = ("euclidean", "cosine", "manhattan")
+
+
+class FeatureMatrix:
+    """Matriz normalizada das métricas de estilo de jogo de um snapshot"""
+
+    def __init__(self, snapshot: StatsSnapshot, features=SIMILARITY_FEATURES):
+        columns = [snapshot.metrics.index(feature) for feature in features]
+        self.features = tuple(features)
+        # Jogadores sem nenhuma das métricas (ex: coaches) ficam fora das respostas
+        self.available = ~np.isnan(snapshot.matrix[:, columns]).all(axis=1)
+        # z-score ausente = média da métrica
+        self.matrix = np.nan_to_num(snapshot.zscores[:, columns], nan=0.0)
+        self.norms = np.linalg.norm(self.matrix, axis=1)
+
+    @classmethod
+    def of(cls, snapshot: StatsSnapshot) -> "FeatureMatrix":
+        """Matriz do snapshot, montada só na primeira consulta de cada versão dos dados"""
+        if "similarity" not in snapshot.derived:
+            snapshot.derived["similarity"] = cls(snapshot)
+        return snapshot.derived["similarity"]
+
+    def distances(self, row: int, metric: str) -> np.ndarray:
+        target = self.matrix[row]
+        if metric == "cosine":
+            norms = self.norms * self.norms[row]
+            similarity = np.divide(self.matrix @ target, norms, out=np.zeros(len(self.matrix)), where=norms > 0)
+            return 1.0 - similarity
+        difference = self.matrix - target
+        if metric == "manhattan":
+            return np.abs(difference).sum(axis=1)
+        return np.sqrt(np.einsum("ij,ij->i", difference, difference))
+
+
+def filter_mask(snapshot: StatsSnapshot, role=None, country=None, team_id=None,
+                min_maps_played=None) -> np.ndarray:
+    """Máscara booleana dos jogadores que passam pelos filtros"""
+    mask = np.ones(len(snapshot), dtype=bool)
+    if role:
+        mask &= snapshot.players["role"] == role
+    if country:
+        mask &= snapshot.players["country"] == country
+    if team_id:
+        mask &= snapshot.players["team_id"] == team_id
+    if min_maps_played:
+        maps_played = snapshot.matrix[:, snapshot.metrics.index("maps_played")]
+        mask &= np.nan_to_num(maps_played, nan=-1) >= min_maps_played
+    return mask
+
+
+def similar_players(snapshot: StatsSnapshot, player_id: int, k: int = 10, metric: str = "euclidean",
+                    **filters) -> Optional[List[dict]]:
+    """Os `k` jogadores mais parecidos com `player_id`; None se ele não tiver estatísticas"""
+    features = FeatureMatrix.of(snapshot)
+    row = snapshot.row_of(player_id)
+    if row is None or not features.available[row]:
+        return None
+
+    distances = features.distances(row, metric)
+    candidates = np.flatnonzero(filter_mask(snapshot, **filters) & features.available)
+    candidates = candidates[candidates != row]
+    if not len(candidates):
+        return []
+
+    k = min(k, len(candidates))
+    nearest = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+    nearest = nearest[np.lexsort((snapshot.player_ids[nearest], distances[nearest]))]
+
+    return [
+        {
+            "player_id": int(snapshot.player_ids[index]),
+            "nickname": snapshot.players["nickname"][index] if snapshot.players else None,
+            "team_id": snapshot.players["team_id"][index] if snapshot.players else None,
+            "distance": round(float(distances[index]), 4),
+        }
+        for index in nearest
+    ]
@@ -41,6 +41,13 @@ def custom_openapi(app: FastAPI):
         ### Paginação:
 
         A maioria dos endpoints suporta paginação através dos parâmetros `skip` e `limit`.
+        As listagens também aceitam `cursor`: o token da próxima página é retornado nos
+        headers `X-Next-Cursor` e `Link` (`rel="next"`), e páginas profundas custam o mesmo que a primeira.
+
+        ### Campos esparsos:
+
+        `/teams/` e `/players/` aceitam `fields[team]=`, `fields[player]=` (ex: `nickname,rating`) e
+        `include=` (ex: `players,achievements`) para retornar apenas os campos e relacionamentos necessários.
 
         ### Códigos de resposta:
 
@@ -85,6 +92,10 @@ def custom_openapi(app: FastAPI):
         {
             "name": "Stats",
             "description": "Estatísticas gerais do sistema"
+        },
+        {
+            "name": "Export",
+            "description": "Exportação completa das tabelas em NDJSON ou CSV"
         }
     ]
 
@@ -0,0 +1,323 @@
+"""
+Gerador de dados sintéticos para testes de escala
+
+Preenche todas as tabelas de `app.models` com times, jogadores, estatísticas,
+mapas e conquistas realistas e reproduzíveis (mesma `--seed` = mesmos dados),
+sem acessar a HLTV. No Postgres as linhas são gravadas com `COPY ... FROM
+STDIN` em lotes; nos demais bancos (ex: SQLite) com inserts em lote. Os
+geradores produzem as linhas sob demanda, então a memória não cresce com a
+escala.
+
+Uso:
+    python -m app.synthetic --teams 10000 --players-per-team 10 --achievements-per-player 20 --truncate
+"""
+
+import argparse
+import csv
+import io
+import math
+import os
+import random
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator
+
+from sqlalchemy import delete, func, insert, select
+
+from app import banco, models
+from app.data_version import bump_data_version
+from app.leaderboards import refresh_leaderboards
+from app.logger import logger
+from app.migrations import upgrade_database
+from app.team_aggregates import update_team_aggregates
+
+# Linhas enviadas ao banco por lote
+SYNTHETIC_BATCH_SIZE = int(os.getenv("SYNTHETIC_BATCH_SIZE", "10000"))
+
+REGIONS = ("Europe", "CIS", "North America", "South America", "Asia", "Oceania")
+COUNTRIES = (
+    "Brazil", "Denmark", "France", "Russia", "Ukraine", "Sweden", "Finland", "Poland", "United States", "Canada",
+    "Germany", "Spain", "Portugal", "Argentina", "Australia", "Mongolia", "China", "Kazakhstan", "Estonia", "Norway",
+)
+MAPS = ("Mirage", "Inferno", "Nuke", "Ancient", "Anubis", "Vertigo", "Dust2", "Train", "Overpass")
+EVENT_TIERS = ("S-Tier", "A-Tier", "B-Tier", "C-Tier")
+EVENTS = ("Major", "IEM", "BLAST Premier", "ESL Pro League", "PGL", "Thunderpick World Championship", "CCT")
+PLACEMENTS = ("1st", "2nd", "3rd-4th", "5th-8th", "9th-16th")
+PLAYER_AWARDS = ("MVP", "EVP", "Top 20")
+NAME_PARTS = (
+    "Astral", "Black", "Crimson", "Dark", "Eternal", "Falcon", "Golden", "Iron", "Neon", "Nova", "Royal",
+    "Shadow", "Silver", "Storm", "Titan", "Venom", "Wild", "Zero",
+)
+NAME_SUFFIXES = ("Esports", "Gaming", "Club", "Academy", "Squad", "Five", "Unit", "Legion")
+SYLLABLES = ("ka", "ze", "ro", "mi", "tu", "nex", "sy", "vo", "ly", "xa", "qi", "dro", "fe", "ba", "jin", "ko")
+
+
+class SyntheticDataset:
+    """
+    Dados sintéticos em uma escala configurável.
+
+    Cada tabela tem seu próprio gerador aleatório derivado da semente, então
+    as linhas de uma tabela não dependem da ordem em que as outras são geradas.
+    O time de id N tem ranking N, e o nível dos jogadores cai com o ranking.
+    """
+
+    def __init__(self, teams: int, players_per_team: int = 6, achievements_per_player: int = 5,
+                 achievements_per_team: int = 10, seed: int = 42):
+        self.team_count = teams
+        self.players_per_team = players_per_team
+        self.achievements_per_player = achievements_per_player
+        self.achievements_per_team = achievements_per_team
+        self.seed = seed
+        self.now = datetime(2025, 1, 1)
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def _strength(self, team_id: int) -> float:
+        """Nível do time entre 0 (último) e 1 (primeiro do ranking)"""
+        return 1.0 - (team_id - 1) / max(self.team_count, 1)
+
+    def _team_of(self, player_id: int) -> int:
+        return (player_id - 1) // self.players_per_team + 1
+
+    def _is_coach(self, player_id: int) -> bool:
+        return (player_id - 1) % self.players_per_team == self.players_per_team - 1
+
+    def _word(self, rng: random.Random) -> str:
+        return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 3)))
+
+    @property
+    def player_count(self) -> int:
+        return self.team_count * self.players_per_team
+
+    def teams(self) -> Iterator[Dict]:
+        rng = self._random("teams")
+        for team_id in range(1, self.team_count + 1):
+            strength = self._strength(team_id)
+            yield {
+                "id": team_id,
+                "name": f"{rng.choice(NAME_PARTS)} {rng.choice(NAME_SUFFIXES)} {team_id}",
+                "url": f"https://www.hltv.org/team/{team_id}/synthetic",
+                "ranking": team_id,
+                "points": max(1, int(1000 * strength ** 3)),
+                "logo_url": f"https://img-cdn.hltv.org/teamlogo/{team_id}.svg",
+                "region": rng.choice(REGIONS),
+                "win_rate": round(min(85.0, max(15.0, rng.gauss(35 + 30 * strength, 6))), 1),
+                "weeks_in_top30": int(rng.expovariate(1 / (60 * strength + 1))),
+                "coach_name": self._word(rng),
+                "peak_ranking": max(1, team_id - rng.randint(0, 20)),
+                "time_at_peak": f"{rng.randint(1, 52)} weeks",
+            }
+
+    def players(self) -> Iterator[Dict]:
+        rng = self._random("players")
+        for player_id in range(1, self.player_count + 1):
+            nickname = self._word(rng)
+            yield {
+                "id": player_id,
+                "nickname": nickname,
+                "real_name": f"{self._word(rng).title()} {self._word(rng).title()}",
+                "url": f"https://www.hltv.org/player/{player_id}/{nickname}",
+                "team_id": self._team_of(player_id),
+                "role": "coach" if self._is_coach(player_id) else "player",
+            }
+
+    def player_stats(self) -> Iterator[Dict]:
+        rng = self._random("player_stats")
+        for player_id in range(1, self.player_count + 1):
+            if self._is_coach(player_id):
+                continue
+            rating = max(0.5, rng.gauss(0.92 + 0.2 * self._strength(self._team_of(player_id)), 0.08))
+            maps_played = int(rng.lognormvariate(5, 0.8)) + 1
+            rounds_played = maps_played * rng.randint(20, 26)
+            kills_per_round = max(0.3, rng.gauss(0.68 * rating, 0.04))
+            deaths_per_round = max(0.3, rng.gauss(0.68 / rating ** 0.5, 0.03))
+            yield {
+                "id": player_id,
+                "player_id": player_id,
+                "picture": f"https://img-cdn.hltv.org/playerbodyshot/{player_id}.png",
+                "country": rng.choice(COUNTRIES),
+                "age": rng.randint(17, 34),
+                "total_kills": int(kills_per_round * rounds_played),
+                "total_deaths": int(deaths_per_round * rounds_played),
+                "headshot_percentage": round(rng.uniform(30, 65), 1),
+                "kd_ratio": round(kills_per_round / deaths_per_round, 2),
+                "damage_per_round": round(max(40.0, rng.gauss(58 + 20 * rating, 4)), 1),
+                "grenade_damage_per_round": round(rng.uniform(2, 8), 1),
+                "maps_played": maps_played,
+                "rounds_played": rounds_played,
+                "kills_per_round": round(kills_per_round, 2),
+                "assists_per_round": round(rng.uniform(0.08, 0.18), 2),
+                "deaths_per_round": round(deaths_per_round, 2),
+                "saved_by_teammate_per_round": round(rng.uniform(0.05, 0.12), 2),
+                "saved_teammates_per_round": round(rng.uniform(0.05, 0.12), 2),
+                "rating": round(rating, 2),
+                "last_updated": self.now,
+            }
+
+    def team_map_stats(self) -> Iterator[Dict]:
+        rng = self._random("team_map_stats")
+        row_id = 0
+        for team_id in range(1, self.team_count + 1):
+            strength = self._strength(team_id)
+            for map_name in rng.sample(MAPS, k=rng.randint(5, 7)):
+                row_id += 1
+                matches_played = rng.randint(3, 120)
+                win_rate = min(100.0, max(0.0, rng.gauss(35 + 30 * strength, 12)))
+                rounds_played = matches_played * rng.randint(20, 26)
+                round_win_rate = min(100.0, max(0.0, 50 + (win_rate - 50) / 3))
+                rounds_won = int(rounds_played * round_win_rate / 100)
+                ct_rounds_won = int(rounds_won * rng.uniform(0.45, 0.6))
+                yield {
+                    "id": row_id,
+                    "team_id": team_id,
+                    "map_name": map_name,
+                    "matches_played": matches_played,
+                    "matches_won": round(matches_played * win_rate / 100),
+                    "win_rate": round(win_rate, 1),
+                    "rounds_played": rounds_played,
+                    "rounds_won": rounds_won,
+                    "round_win_rate": round(round_win_rate, 1),
+                    "ct_rounds_won": ct_rounds_won,
+                    "t_rounds_won": rounds_won - ct_rounds_won,
+                    "ct_win_rate": round(min(100.0, round_win_rate * rng.uniform(0.95, 1.1)), 1),
+                    "t_win_rate": round(min(100.0, round_win_rate * rng.uniform(0.9, 1.05)), 1),
+                }
+
+    def _achievement(self, rng: random.Random, row_id: int) -> Dict:
+        year = rng.randint(2012, 2025)
+        return {
+            "id": row_id,
+            "title": f"{rng.choice(EVENTS)} {year}",
+            "event_name": rng.choice(EVENTS),
+            "year": year,
+            "placement": rng.choice(PLACEMENTS),
+            "prize_money": f"${rng.randrange(1000, 1000000, 1000):,}",
+            "trophy_image_url": None,
+            "event_tier": rng.choices(EVENT_TIERS, weights=(1, 3, 4, 4))[0],
+        }
+
+    def team_achievements(self) -> Iterator[Dict]:
+        rng = self._random("team_achievements")
+        row_id = 0
+        for team_id in range(1, self.team_count + 1):
+            for _ in range(self.achievements_per_team):
+                row_id += 1
+                yield {**self._achievement(rng, row_id), "team_id": team_id}
+
+    def player_achievements(self) -> Iterator[Dict]:
+        rng = self._random("player_achievements")
+        row_id = 0
+        for player_id in range(1, self.player_count + 1):
+            for _ in range(self.achievements_per_player):
+                row_id += 1
+                award = rng.choice(PLAYER_AWARDS) if rng.random() < 0.2 else None
+                yield {**self._achievement(rng, row_id), "player_id": player_id, "mvp_award": award}
+
+    def tables(self) -> Iterator[tuple]:
+        """(tabela, linhas) na ordem exigida pelas chaves estrangeiras"""
+        yield models.Team.__table__, self.teams()
+        yield models.Player.__table__, self.players()
+        yield models.PlayerStats.__table__, self.player_stats()
+        yield models.TeamMapStats.__table__, self.team_map_stats()
+        yield models.TeamAchievement.__table__, self.team_achievements()
+        yield models.PlayerAchievement.__table__, self.player_achievements()
+
+
+def batches(rows: Iterable[Dict], size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_batch(connection, table, columns, batch):
+    """Grava o lote com COPY FROM STDIN (psycopg2); `None` vira NULL"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([row.get(column) for column in columns] for row in batch)
+    buffer.seek(0)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def write_table(connection, table, rows: Iterable[Dict], batch_size: int = SYNTHETIC_BATCH_SIZE) -> int:
+    columns = [column.name for column in table.columns]
+    use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+
+    total = 0
+    for batch in batches(rows, batch_size):
+        if use_copy:
+            _copy_batch(connection, table, columns, batch)
+        else:
+            connection.execute(insert(table), [{column: row.get(column) for column in columns} for row in batch])
+        total += len(batch)
+
+    if connection.dialect.name == "postgresql":
+        # Os ids foram informados explicitamente; a sequência precisa continuar depois deles
+        connection.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+        )
+    return total
+
+
+def generate(dataset: SyntheticDataset, truncate: bool = False, batch_size: int = SYNTHETIC_BATCH_SIZE) -> dict:
+    """Grava o dataset no banco de `DATABASE_URL` e atualiza os dados derivados"""
+    engine = banco.get_engine()
+    upgrade_database(engine)
+
+    counts = {}
+    with engine.begin() as connection:
+        existing = connection.scalar(select(func.count()).select_from(models.Team.__table__))
+        if existing and not truncate:
+            raise SystemExit("❌ O banco já tem times; use --truncate para substituir os dados")
+        if truncate:
+            for table in reversed(models.Base.metadata.sorted_tables):
+                if table.name != models.DataVersion.__tablename__:
+                    connection.execute(delete(table))
+
+        for table, rows in dataset.tables():
+            start = time.perf_counter()
+            counts[table.name] = write_table(connection, table, rows, batch_size)
+            elapsed = time.perf_counter() - start
+            rate = counts[table.name] / elapsed if elapsed else math.inf
+            logger.info(
+                "🧪 %s: %d linhas em %.1fs (%.0f linhas/s)", table.name, counts[table.name], elapsed, rate,
+                extra={"table": table.name, "rows": counts[table.name], "duration_ms": round(elapsed * 1000, 1)},
+            )
+
+    # Dados derivados que o scraper mantém ao fim de cada coleta
+    db = banco.SessionLocal()
+    try:
+        update_team_aggregates(db)
+        refresh_leaderboards(db)
+        bump_data_version(db)
+    finally:
+        db.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preenche o banco com dados sintéticos para testes de escala")
+    parser.add_argument("--teams", type=int, default=1000)
+    parser.add_argument("--players-per-team", type=int, default=6, help="Inclui o coach (último de cada time)")
+    parser.add_argument("--achievements-per-player", type=int, default=5)
+    parser.add_argument("--achievements-per-team", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=SYNTHETIC_BATCH_SIZE)
+    parser.add_argument("--truncate", action="store_true", help="Apaga os dados existentes antes de gerar")
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(
+        args.teams, args.players_per_team, args.achievements_per_player, args.achievements_per_team, args.seed
+    )
+    counts = generate(dataset, truncate=args.truncate, batch_size=args.batch_size)
+    logger.info("✅ %d linhas sintéticas geradas", sum(counts.values()))
@@ -0,0 +1,80 @@
+"""
+Agregados do elenco de cada time (rating, K/D, ADR, idade e experiência)
+
+Calculados em uma única consulta agrupada por time sobre os jogadores ativos
+(role == 'player') e gravados nas colunas de `Team`, para que a API sirva e
+ordene os times por força do elenco sem recalcular nada por requisição.
+"""
+
+from statistics import median
+
+from sqlalchemy import and_, func, select, update
+
+from app import models
+from app.logger import logger
+
+# Coluna de Team -> (função de agregação, coluna de PlayerStats)
+TEAM_AGGREGATES = {
+    "average_rating": (func.avg, models.PlayerStats.rating),
+    "average_kd_ratio": (func.avg, models.PlayerStats.kd_ratio),
+    "average_damage_per_round": (func.avg, models.PlayerStats.damage_per_round),
+    "average_player_age": (func.avg, models.PlayerStats.age),
+    "average_maps_played": (func.avg, models.PlayerStats.maps_played),
+}
+
+
+def team_aggregates_query(dialect_name: str):
+    """Uma linha por time com os agregados do elenco (nulos para times sem estatísticas)"""
+    columns = [
+        aggregate(column).label(name)
+        for name, (aggregate, column) in TEAM_AGGREGATES.items()
+    ]
+    if dialect_name == "postgresql":
+        columns.append(func.percentile_cont(0.5).within_group(models.PlayerStats.rating).label("median_rating"))
+
+    return (
+        select(models.Team.id, *columns)
+        .outerjoin(models.Player, and_(models.Player.team_id == models.Team.id, models.Player.role == "player"))
+        .outerjoin(models.PlayerStats, models.PlayerStats.player_id == models.Player.id)
+        .group_by(models.Team.id)
+    )
+
+
+def _median_ratings(session) -> dict:
+    """Mediana do rating por time para bancos sem `percentile_cont` (ex: SQLite)"""
+    ratings = {}
+    rows = session.execute(
+        select(models.Player.team_id, models.PlayerStats.rating)
+        .join(models.PlayerStats, models.PlayerStats.player_id == models.Player.id)
+        .filter(models.Player.role == "player", models.PlayerStats.rating.isnot(None))
+    )
+    for team_id, rating in rows:
+        ratings.setdefault(team_id, []).append(rating)
+    return {team_id: median(values) for team_id, values in ratings.items()}
+
+
+def update_team_aggregates(session) -> int:
+    """
+    Recalcula e grava os agregados de todos os times.
+    Deve ser chamada pelo scraper depois de salvar times ou estatísticas.
+    """
+    dialect_name = session.get_bind().dialect.name
+    rows = session.execute(team_aggregates_query(dialect_name)).mappings().all()
+
+    values = [dict(row) for row in rows]
+    if dialect_name != "postgresql":
+        medians = _median_ratings(session)
+        for row in values:
+            row["median_rating"] = medians.get(row["id"])
+
+    for row in values:
+        for name, value in row.items():
+            if name != "id" and value is not None:
+                row[name] = round(float(value), 4)
+
+    if values:
+        session.execute(update(models.Team), values)
+    session.commit()
+
+    logger.info("📊 Agregados de elenco atualizados para %d times", len(values))
+    return len(values)